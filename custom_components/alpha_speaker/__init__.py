@@ -12,6 +12,7 @@ from homeassistant.const import Platform, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv, entity_registry as er, device_registry as dr
 from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 import voluptuous as vol
 
 from .const import (
@@ -22,19 +23,29 @@ from .const import (
     CONF_MAX_SPEAKERS,
     CONF_HA_TOKEN,
     CONF_HA_URL,
+    CONF_COALESCE_WINDOW,
+    CONF_INACTIVE_TIMEOUT,
+    CONF_EVICT_TIMEOUT,
     SERVICE_SEND_TTS,
     SERVICE_RELOAD_SPEAKERS,
     SERVICE_TEST_CONNECTION,
+    SERVICE_SET_QUIET_HOURS,
+    SERVICE_CANCEL_SCHEDULED_TTS,
     PLATFORMS,
     STORAGE_VERSION,
     STORAGE_KEY,
     DEFAULT_EVENT_PREFIX,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DEFAULT_INACTIVE_TIMEOUT,
+    DEFAULT_EVICT_TIMEOUT,
+    DEFAULT_MAX_SPEAKERS,
     EVENT_SPEAKER_CONNECTED,
     EVENT_SPEAKER_DISCONNECTED
 )
 
 from .grpc_server import AlphaSpeakerServer
 from .speaker_manager import SpeakerManager
+from .tts_scheduler import TTSScheduler
 #from .lovelace_dashboard import LovelaceDashboard
 
 _LOGGER = logging.getLogger(__name__)
@@ -46,7 +57,19 @@ SEND_TTS_SCHEMA = vol.Schema({
     vol.Optional("language", default="ru"): cv.string,
     vol.Optional("voice", default="default"): cv.string,
     vol.Optional("volume", default=80): vol.All(int, vol.Range(min=0, max=100)),
-    vol.Optional("priority", default=False): cv.boolean
+    vol.Optional("priority", default=False): cv.boolean,
+    vol.Exclusive("at", "schedule"): cv.datetime,
+    vol.Exclusive("delay", "schedule"): cv.positive_time_period
+})
+
+SET_QUIET_HOURS_SCHEMA = vol.Schema({
+    vol.Required("speaker_id"): cv.string,
+    vol.Inclusive("start", "quiet_hours"): cv.time,
+    vol.Inclusive("end", "quiet_hours"): cv.time
+})
+
+CANCEL_SCHEDULED_TTS_SCHEMA = vol.Schema({
+    vol.Required("job_id"): cv.string
 })
 
 RELOAD_SPEAKERS_SCHEMA = vol.Schema({
@@ -90,7 +113,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         store = Store(hass, STORAGE_VERSION, f"{DOMAIN}_{entry.entry_id}")
         
         # Create speaker manager
-        speaker_manager = SpeakerManager(hass, entry.entry_id, store)
+        speaker_manager = SpeakerManager(
+            hass,
+            entry.entry_id,
+            store,
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}_{entry.entry_id}_activity"),
+            inactive_timeout=full_config.get(CONF_INACTIVE_TIMEOUT, DEFAULT_INACTIVE_TIMEOUT)
+        )
         await speaker_manager.load()
         
         _LOGGER.info(f"Speaker manager loaded with {len(speaker_manager.speakers)} speakers")
@@ -100,16 +129,40 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             hass=hass,
             port=full_config.get(CONF_GRPC_PORT, 50051),
             event_prefix=full_config.get(CONF_EVENT_PREFIX, DEFAULT_EVENT_PREFIX),
-            max_speakers=full_config.get(CONF_MAX_SPEAKERS, 10),
-            speaker_manager=speaker_manager
+            max_speakers=full_config.get(CONF_MAX_SPEAKERS, DEFAULT_MAX_SPEAKERS),
+            speaker_manager=speaker_manager,
+            coalesce_window_ms=full_config.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW_MS),
+            inactive_timeout=full_config.get(CONF_INACTIVE_TIMEOUT, DEFAULT_INACTIVE_TIMEOUT),
+            evict_timeout=full_config.get(CONF_EVICT_TIMEOUT, DEFAULT_EVICT_TIMEOUT)
         )
         
         await grpc_server.start()
         
+        # Create scheduler for deferred TTS
+        async def send_scheduled_tts(job):
+            """Deliver a scheduled TTS message."""
+            return await grpc_server.send_tts_to_speaker(
+                speaker_id=job["speaker_id"],
+                text=job["text"],
+                language=job.get("language", "ru"),
+                voice=job.get("voice", "default"),
+                volume=job.get("volume", 80),
+                priority=job.get("priority", False)
+            )
+        
+        tts_scheduler = TTSScheduler(
+            hass,
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}_{entry.entry_id}_scheduled_tts"),
+            send_scheduled_tts,
+            grpc_server.has_tts_stream
+        )
+        await tts_scheduler.start()
+        
         # Store components
         hass.data[DOMAIN][entry.entry_id] = {
             "grpc_server": grpc_server,
             "speaker_manager": speaker_manager,
+            "tts_scheduler": tts_scheduler,
             "config": full_config,
             "reload_task": None,
             "listeners": [],
@@ -143,6 +196,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             speaker_name = event.data.get("speaker_name")
             _LOGGER.info(f"[EVENT] Speaker connected: {speaker_name} ({speaker_id})")
             
+            # Same metadata fingerprint as before - the device is already up to date
+            if not event.data.get("metadata_changed", True):
+                return
+            
             # Create device for the speaker
             await _create_device_for_speaker(hass, entry, speaker_id)
             
@@ -152,7 +209,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             speaker_name = event.data.get("speaker_name")
             _LOGGER.info(f"[EVENT] Speaker disconnected: {speaker_name} ({speaker_id})")
             
-            # We don't update entity state here, let the platforms handle it via their async_update
+            # Entity state is pushed by the speaker manager via dispatcher signals
         
         # Register event listeners
         _LOGGER.info(f"Registering event listeners for prefix: {event_prefix}")
@@ -303,6 +360,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if "reload_task" in data and data["reload_task"]:
         data["reload_task"].cancel()
     
+    # Stop TTS scheduler and persist pending messages
+    if "tts_scheduler" in data:
+        await data["tts_scheduler"].stop()
+    
     # Stop gRPC server
     if "grpc_server" in data:
         grpc_server = data["grpc_server"]
@@ -311,7 +372,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Stop speaker manager and save data
     if "speaker_manager" in data:
         speaker_manager = data["speaker_manager"]
-        await speaker_manager.save()  # SpeakerManager сам сохраняет данные в свой store
+        await speaker_manager.save()  # Сбрасываем на диск отложенную запись SpeakerManager
     
     # Fire stopped event
     event_prefix = data.get("config", {}).get(CONF_EVENT_PREFIX, DEFAULT_EVENT_PREFIX)
@@ -406,6 +467,39 @@ async def _register_services(hass: HomeAssistant, entry: ConfigEntry):
             _LOGGER.error(f"❌ Error checking speaker {speaker_id}: {e}", exc_info=True)
             return
         
+        # Deferred delivery: explicit at/delay or speaker quiet hours
+        tts_scheduler = data.get("tts_scheduler")
+        if tts_scheduler:
+            now = time.time()
+            due = now
+            if call.data.get("at") is not None:
+                due = dt_util.as_utc(call.data["at"]).timestamp()
+            elif call.data.get("delay") is not None:
+                due = now + call.data["delay"].total_seconds()
+            
+            if tts_scheduler.apply_quiet_hours(speaker_id, due, priority) > now + 1:
+                job_id = tts_scheduler.schedule(
+                    speaker_id=speaker_id,
+                    text=text,
+                    due=due,
+                    language=language,
+                    voice=voice,
+                    volume=volume,
+                    priority=priority
+                )
+                event_prefix = data.get("config", {}).get(CONF_EVENT_PREFIX, DEFAULT_EVENT_PREFIX)
+                hass.bus.async_fire(
+                    f"{event_prefix}tts_scheduled",
+                    {
+                        "speaker_id": speaker_id,
+                        "job_id": job_id,
+                        "text": text,
+                        "due": dt_util.utc_from_timestamp(tts_scheduler.jobs[job_id]["due"]).isoformat(),
+                        "timestamp": int(now * 1000)
+                    }
+                )
+                return
+        
         grpc_server = data["grpc_server"]
         
         try:
@@ -443,7 +537,7 @@ async def _register_services(hass: HomeAssistant, entry: ConfigEntry):
                             servicer = grpc_server.servicer
                             
                             # Get detailed information
-                            connected_speakers = list(servicer.connected_speakers.keys())
+                            connected_speakers = servicer.speaker_manager.get_online_ids()
                             active_tts_streams = list(servicer.active_tts_streams.keys())
                             
                             _LOGGER.info(f"📊 gRPC Server Status:")
@@ -456,6 +550,41 @@ async def _register_services(hass: HomeAssistant, entry: ConfigEntry):
         except Exception as e:
             _LOGGER.error(f"❌ Error sending TTS to {speaker_id}: {e}", exc_info=True)
     
+    async def handle_set_quiet_hours(call: ServiceCall):
+        """Handle set_quiet_hours service call."""
+        speaker_id = call.data.get("speaker_id")
+        start = call.data.get("start")
+        end = call.data.get("end")
+        
+        if DOMAIN not in hass.data or entry.entry_id not in hass.data[DOMAIN]:
+            _LOGGER.error("❌ Alpha Speaker integration not initialized")
+            return
+        
+        tts_scheduler = hass.data[DOMAIN][entry.entry_id].get("tts_scheduler")
+        if not tts_scheduler:
+            _LOGGER.error("❌ TTS scheduler not found")
+            return
+        
+        tts_scheduler.set_quiet_hours(speaker_id, start, end)
+        if start is None:
+            _LOGGER.info(f"🔔 Quiet hours cleared for {speaker_id}")
+        else:
+            _LOGGER.info(f"🔕 Quiet hours for {speaker_id}: {start}-{end}")
+    
+    async def handle_cancel_scheduled_tts(call: ServiceCall):
+        """Handle cancel_scheduled_tts service call."""
+        job_id = call.data.get("job_id")
+        
+        if DOMAIN not in hass.data or entry.entry_id not in hass.data[DOMAIN]:
+            _LOGGER.error("❌ Alpha Speaker integration not initialized")
+            return
+        
+        tts_scheduler = hass.data[DOMAIN][entry.entry_id].get("tts_scheduler")
+        if tts_scheduler and tts_scheduler.cancel(job_id):
+            _LOGGER.info(f"Scheduled TTS {job_id} cancelled")
+        else:
+            _LOGGER.warning(f"Scheduled TTS {job_id} not found")
+    
     async def handle_reload_speakers(call: ServiceCall):
         """Handle reload_speakers service call."""
         force = call.data.get("force", False)
@@ -551,4 +680,18 @@ async def _register_services(hass: HomeAssistant, entry: ConfigEntry):
         schema=TEST_CONNECTION_SCHEMA
     )
     
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_QUIET_HOURS,
+        handle_set_quiet_hours,
+        schema=SET_QUIET_HOURS_SCHEMA
+    )
+    
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CANCEL_SCHEDULED_TTS,
+        handle_cancel_scheduled_tts,
+        schema=CANCEL_SCHEDULED_TTS_SCHEMA
+    )
+    
     _LOGGER.info("✅ Alpha Speaker services registered")
\ No newline at end of file
@@ -3,12 +3,13 @@ from __future__ import annotations
 
 import logging
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.util import dt as dt_util
@@ -18,11 +19,16 @@ from .const import (
     DOMAIN,
     NAME,
     ICON_SPEAKER,
-    ICON_SPEAKER_MULTIPLE
+    ICON_SPEAKER_MULTIPLE,
+    ENTITY_REFRESH_INTERVAL
 )
+from .speaker_manager import speaker_signal
 
 _LOGGER = logging.getLogger(__name__)
 
+# Переходы сессий приходят сигналами, опрос только освежает uptime и last_seen
+SCAN_INTERVAL = timedelta(seconds=ENTITY_REFRESH_INTERVAL)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -109,24 +115,8 @@ async def async_setup_entry(
         # Run in the background
         hass.async_create_task(async_create_entity())
     
-    @callback
-    def handle_speaker_disconnected(event):
-        """Handle speaker disconnected event."""
-        speaker_id = event.data.get("speaker_id")
-        
-        _LOGGER.debug(f"Received speaker disconnected event for speaker_id: {speaker_id}")
-        
-        # Find the entity for this speaker and update its state
-        for entity in entities:
-            # Проверяем только сущности, которые имеют атрибут speaker_id
-            if hasattr(entity, 'speaker_id') and entity.speaker_id == speaker_id:
-                if hasattr(entity, 'set_disconnected'):
-                    entity.set_disconnected()
-                break
-    
-    # Subscribe to events
+    # Subscribe to events (state changes of existing speakers arrive via dispatcher signals)
     hass.bus.async_listen(f"{event_prefix}connected", handle_speaker_connected)
-    hass.bus.async_listen(f"{event_prefix}disconnected", handle_speaker_disconnected)
 
 
 class AlphaSpeakerConnectorBinarySensor(BinarySensorEntity):
@@ -271,11 +261,18 @@ class AlphaSpeakerDeviceBinarySensor(BinarySensorEntity):
             self._attr_extra_state_attributes["uptime"] = "0:00:00"
     
     
-    def set_disconnected(self):
-        """Mark the sensor as disconnected."""
-        self._attr_is_on = False
-        self._attr_extra_state_attributes["status"] = "disconnected"
-        self.async_write_ha_state()
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to session transitions of the speaker."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, speaker_signal(self.entry.entry_id, self.speaker_id), self._handle_speaker_update
+            )
+        )
+    
+    @callback
+    def _handle_speaker_update(self) -> None:
+        """Refresh on connect, resume, idle, wake-up, disconnect or a new TTS latency sample."""
+        self.async_schedule_update_ha_state(True)
     
     def _format_uptime(self, connected_at_timestamp):
         """Format uptime from timestamp."""
@@ -302,9 +299,8 @@ class AlphaSpeakerDeviceBinarySensor(BinarySensorEntity):
                 self._attr_extra_state_attributes["status"] = "not_found"
                 return
             
-            # Update state based on last activity (5 minute timeout)
-            current_time = time.time()
-            is_active = (current_time - speaker.last_seen) < 300  # 5 minutes
+            # Update state from the session: online and not idle
+            is_active = speaker.online and not speaker.idle
             
             self._attr_is_on = is_active
             
@@ -328,7 +324,15 @@ class AlphaSpeakerDeviceBinarySensor(BinarySensorEntity):
                 if new_config_url:
                     self._attr_device_info["configuration_url"] = new_config_url
             
-            self._attr_extra_state_attributes["status"] = "active" if is_active else "inactive"
+            if is_active:
+                self._attr_extra_state_attributes["status"] = "active"
+            else:
+                self._attr_extra_state_attributes["status"] = "inactive" if speaker.online else "disconnected"
+            
+            # TTS latency percentiles (queue wait, delivery, playback)
+            grpc_server = self.data.get("grpc_server")
+            if grpc_server:
+                self._attr_extra_state_attributes["tts_latency"] = grpc_server.get_tts_latency_stats(speaker.speaker_id)
             
         except Exception as e:
             _LOGGER.error(f"Failed to update speaker binary sensor {self.speaker.speaker_id}: {e}")
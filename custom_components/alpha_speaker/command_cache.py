@@ -0,0 +1,63 @@
+"""
+Idempotency cache of command results for Alpha Private Speaker
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Tuple
+
+from .const import COMMAND_CACHE_SIZE, COMMAND_CACHE_TTL
+
+
+class CommandResultCache:
+    """Bounded, TTL-expiring cache of command results keyed by idempotency key.
+
+    A retry that arrives while the first attempt is still running waits for
+    the same result instead of executing the command again.
+    """
+
+    def __init__(self, max_size: int = COMMAND_CACHE_SIZE, ttl: float = COMMAND_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        # Порядок вставки совпадает с порядком истечения (TTL одинаковый)
+        self._entries: "OrderedDict[Hashable, Tuple[float, asyncio.Future]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return (result, cached) - run factory only for an unseen key"""
+        now = time.monotonic()
+        self._expire(now)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            return await asyncio.shield(entry[1]), True
+
+        # Выполнение не привязано к вызову: если клиент отвалился по таймауту
+        # и RPC отменен, команда доработает, а повтор получит ее результат
+        task = asyncio.ensure_future(factory())
+        self._entries[key] = (now + self.ttl, task)
+        task.add_done_callback(lambda done: self._on_done(key, done))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        return await asyncio.shield(task), False
+
+    def _on_done(self, key: Hashable, task: asyncio.Future):
+        """Failed attempts are not cached - a retry will execute the command again.
+
+        Service errors come back as a response with success=False rather
+        than an exception, so such results are dropped as well.
+        """
+        if task.cancelled() or task.exception() is not None or getattr(task.result(), "success", True) is False:
+            if self._entries.get(key, (None, None))[1] is task:
+                del self._entries[key]
+
+    def _expire(self, now: float):
+        """Drop expired entries from the head of the queue"""
+        while self._entries:
+            expires_at, _ = next(iter(self._entries.values()))
+            if expires_at > now:
+                break
+            self._entries.popitem(last=False)
@@ -0,0 +1,170 @@
+"""
+Command to Home Assistant service dispatch table for Alpha Private Speaker
+"""
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from homeassistant.const import EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .device_catalog import COMMAND_FEATURES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Команды колонки, которые не совпадают с именем сервиса HA:
+# (домен, команда) -> (сервис, переименование параметров)
+COMMAND_ALIASES: Dict[Tuple[str, str], Tuple[str, Dict[str, str]]] = {
+    ("light", "set_brightness"): ("turn_on", {"value": "brightness_pct"}),
+    ("climate", "set_temperature"): ("set_temperature", {"value": "temperature"}),
+    ("climate", "set_mode"): ("set_hvac_mode", {"value": "hvac_mode", "mode": "hvac_mode"}),
+    ("fan", "set_speed"): ("set_percentage", {"value": "percentage", "speed": "percentage"}),
+    ("media_player", "play"): ("media_play", {}),
+    ("media_player", "pause"): ("media_pause", {}),
+    ("media_player", "stop"): ("media_stop", {}),
+    ("media_player", "volume_set"): ("volume_set", {"value": "volume_level", "volume": "volume_level"}),
+    ("cover", "set_position"): ("set_cover_position", {"value": "position"}),
+    ("input_select", "set_value"): ("select_option", {"value": "option"}),
+    ("select", "set_value"): ("select_option", {"value": "option"}),
+}
+
+# Обратный индекс: (домен, сервис) -> команды-псевдонимы
+_ALIASES_BY_SERVICE: Dict[Tuple[str, str], List[str]] = {}
+for (_domain, _command), (_service, _) in COMMAND_ALIASES.items():
+    _ALIASES_BY_SERVICE.setdefault((_domain, _service), []).append(_command)
+
+# Команды, объявляемые колонке в списке устройств: только они вызывают сервисы,
+# остальное (unlock, alarm_disarm и т.п.) уходит событием
+ADVERTISED_COMMANDS: FrozenSet[Tuple[str, str]] = frozenset(COMMAND_ALIASES) | frozenset(
+    (_domain, _command) for _domain, _commands in COMMAND_FEATURES.items() for _command, _ in _commands
+)
+# Включение/выключение допускается для любого домена, как и раньше
+ON_OFF_COMMANDS = frozenset({"turn_on", "turn_off", "toggle"})
+
+# Параметры, которые всегда передаются строкой (режимы, коды, тексты)
+STRING_PARAMS = frozenset({
+    "option", "hvac_mode", "preset_mode", "fan_mode", "swing_mode", "source", "sound_mode",
+    "effect", "code", "message", "title", "media_content_id", "media_content_type",
+})
+
+# Домены, где "value" - произвольный текст
+TEXT_VALUE_DOMAINS = frozenset({"input_text", "text"})
+
+
+def coerce_value(value: str) -> Any:
+    """Convert a string parameter from the speaker into bool/int/float/JSON"""
+    text = value.strip()
+    lowered = text.lower()
+    if lowered in ("true", "on", "yes"):
+        return True
+    if lowered in ("false", "off", "no"):
+        return False
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if text[:1] in ("[", "{"):
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return value
+
+
+def _volume_level(value: Any) -> Any:
+    """Speakers always send volume in percent, HA expects 0..1"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return round(max(0.0, min(1.0, value / 100)), 2)
+    return value
+
+
+# Дополнительное преобразование значения после переименования параметра
+PARAM_COERCERS: Dict[str, Callable[[Any], Any]] = {
+    "volume_level": _volume_level,
+}
+
+
+@dataclass
+class ServiceRoute:
+    """Precomputed route from a speaker command to a HA service call"""
+    domain: str
+    service: str
+    param_map: Dict[str, str] = field(default_factory=dict)
+    string_params: FrozenSet[str] = STRING_PARAMS
+
+    def build_data(self, entity_id: Any, parameters: Dict[str, str]) -> Dict[str, Any]:
+        """Build service data with renamed and coerced parameters"""
+        data: Dict[str, Any] = {}
+        for key, value in parameters.items():
+            key = self.param_map.get(key, key)
+            if isinstance(value, str) and key not in self.string_params:
+                value = coerce_value(value)
+            coercer = PARAM_COERCERS.get(key)
+            data[key] = coercer(value) if coercer else value
+        data["entity_id"] = entity_id
+        return data
+
+
+class CommandDispatcher:
+    """Dispatch table (domain, command_type) -> ServiceRoute built from the HA service registry.
+
+    Only advertised commands get a route; any other service of the domain
+    stays reachable as an event for automations, never as a direct call.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.routes: Dict[Tuple[str, str], ServiceRoute] = {}
+        self._listeners: List[Callable[[], None]] = []
+
+    @callback
+    def start(self):
+        """Build the table and follow service registry changes"""
+        self.routes.clear()
+        for domain, services in self.hass.services.async_services_internal().items():
+            for service in services:
+                self._add_service(domain, service)
+
+        self._listeners = [
+            self.hass.bus.async_listen(EVENT_SERVICE_REGISTERED, self._handle_service_registered),
+            self.hass.bus.async_listen(EVENT_SERVICE_REMOVED, self._handle_service_removed),
+        ]
+        _LOGGER.debug(f"Command dispatch table built: {len(self.routes)} routes")
+
+    @callback
+    def stop(self):
+        """Stop following the service registry"""
+        for remove_listener in self._listeners:
+            remove_listener()
+        self._listeners = []
+
+    def resolve(self, domain: str, command_type: str) -> Optional[ServiceRoute]:
+        """Get the route for a command, None if it can only be fired as an event"""
+        return self.routes.get((domain, command_type))
+
+    def _add_service(self, domain: str, service: str):
+        """Add the direct route (if advertised) and all aliases that target this service"""
+        string_params = STRING_PARAMS | {"value"} if domain in TEXT_VALUE_DOMAINS else STRING_PARAMS
+        if service in ON_OFF_COMMANDS or (domain, service) in ADVERTISED_COMMANDS:
+            self.routes.setdefault((domain, service), ServiceRoute(domain, service, string_params=string_params))
+        for command in _ALIASES_BY_SERVICE.get((domain, service), []):
+            _, param_map = COMMAND_ALIASES[(domain, command)]
+            self.routes[(domain, command)] = ServiceRoute(domain, service, param_map, string_params)
+
+    def _remove_service(self, domain: str, service: str):
+        """Drop every route that calls this service"""
+        for key in [key for key, route in self.routes.items() if route.domain == domain and route.service == service]:
+            del self.routes[key]
+
+    @callback
+    def _handle_service_registered(self, event: Event):
+        self._add_service(event.data["domain"], event.data["service"])
+
+    @callback
+    def _handle_service_removed(self, event: Event):
+        self._remove_service(event.data["domain"], event.data["service"])
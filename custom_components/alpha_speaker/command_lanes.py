@@ -0,0 +1,58 @@
+"""
+Per-entity ordered command lanes for Alpha Private Speaker
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+
+class _Lane:
+    """FIFO lock of one entity with the number of commands using it"""
+
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class EntityLaneExecutor:
+    """Run commands for the same entity strictly in arrival order.
+
+    asyncio.Lock wakes waiters in FIFO order, so one lock per entity_id is
+    an ordered lane. Commands for several entities (group targets) take
+    their lanes in sorted order, which rules out deadlocks between them.
+    Different entities do not wait for each other; the global limit is
+    applied by the caller's scheduler.
+    """
+
+    def __init__(self):
+        self._lanes: Dict[str, _Lane] = {}
+
+    def __len__(self) -> int:
+        return len(self._lanes)
+
+    async def run(self, entity_ids: Iterable[str], factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await factory() while holding the lanes of all entity_ids"""
+        keys = sorted(set(entity_ids))
+        lanes: List[_Lane] = []
+        for key in keys:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = _Lane()
+            lane.users += 1
+            lanes.append(lane)
+
+        held: List[_Lane] = []
+        try:
+            for lane in lanes:
+                await lane.lock.acquire()
+                held.append(lane)
+            return await factory()
+        finally:
+            for lane in held:
+                lane.lock.release()
+            for key, lane in zip(keys, lanes):
+                lane.users -= 1
+                if not lane.users:
+                    # Полоса больше никому не нужна
+                    del self._lanes[key]
@@ -17,10 +17,16 @@ from .const import (
     CONF_MAX_SPEAKERS,
     CONF_HA_TOKEN,
     CONF_HA_URL,
+    CONF_COALESCE_WINDOW,
+    CONF_INACTIVE_TIMEOUT,
+    CONF_EVICT_TIMEOUT,
     DEFAULT_GRPC_PORT,
     DEFAULT_EVENT_PREFIX,
     DEFAULT_MAX_SPEAKERS,
-    DEFAULT_HA_URL
+    DEFAULT_HA_URL,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DEFAULT_INACTIVE_TIMEOUT,
+    DEFAULT_EVICT_TIMEOUT
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -105,6 +111,18 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_HA_URL,
                 default=self.config_entry.options.get(CONF_HA_URL, DEFAULT_HA_URL)
             ): str,
+            vol.Optional(
+                CONF_COALESCE_WINDOW,
+                default=self.config_entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW_MS)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=500)),
+            vol.Optional(
+                CONF_INACTIVE_TIMEOUT,
+                default=self.config_entry.options.get(CONF_INACTIVE_TIMEOUT, DEFAULT_INACTIVE_TIMEOUT)
+            ): vol.All(vol.Coerce(int), vol.Range(min=30)),
+            vol.Optional(
+                CONF_EVICT_TIMEOUT,
+                default=self.config_entry.options.get(CONF_EVICT_TIMEOUT, DEFAULT_EVICT_TIMEOUT)
+            ): vol.All(vol.Coerce(int), vol.Range(min=60)),
         })
         
         return self.async_show_form(
@@ -11,6 +11,9 @@ CONF_DEBUG = "debug"
 CONF_LOG_LEVEL = "log_level"
 CONF_HA_TOKEN = "ha_token"
 CONF_HA_URL = "ha_url"
+CONF_COALESCE_WINDOW = "coalesce_window_ms"
+CONF_INACTIVE_TIMEOUT = "inactive_timeout"
+CONF_EVICT_TIMEOUT = "evict_timeout"
 
 # Defaults
 DEFAULT_GRPC_PORT = 50051
@@ -20,15 +23,70 @@ DEFAULT_RECONNECT_TIMEOUT = 30
 DEFAULT_DEBUG = False
 DEFAULT_LOG_LEVEL = "INFO"
 DEFAULT_HA_URL = "http://localhost:8123"
+DEFAULT_INACTIVE_TIMEOUT = 300  # Seconds of silence before a speaker counts as inactive
+DEFAULT_EVICT_TIMEOUT = 3600  # Seconds of silence before a speaker session is dropped
+
+# TTS
+DEFAULT_TTS_CHUNK_MAX_CHARS = 200  # Long texts are streamed in chunks of at most this size
+TTS_RESPONSE_TIMEOUT = 30  # Seconds to wait for the speaker to acknowledge a chunk
+DEFAULT_LATENCY_WINDOW = 200  # Samples kept per speaker for latency percentiles
+
+# Commands
+DEFAULT_BATCH_PARALLELISM = 8  # Concurrent service calls per SendAlphaCommands batch
+MAX_BATCH_PARALLELISM = 32
+MAX_BATCH_COMMANDS = 20  # Commands per SendAlphaCommands batch, no more than the rate-limit burst
+COMMAND_RESULT_BUFFER_SIZE = 100  # Non-blocking results kept while the result stream is down
+COMMAND_CACHE_SIZE = 1000  # Idempotency keys remembered
+COMMAND_CACHE_TTL = 300  # Seconds a cached result answers retries
+DEFAULT_COALESCE_WINDOW_MS = 0  # Window for merging same-service calls, 0 (default) disables merging
+
+# Device list
+DEFAULT_DEVICE_PAGE_SIZE = 100  # Devices per StreamAvailableDevices message
+MAX_DEVICE_PAGE_SIZE = 500
+DEVICE_CHANGE_LOG_SIZE = 5000  # Catalog changes kept for GetAvailableDevicesSince
+DEVICE_LIST_CACHE_SIZE = 16  # Domain filters whose built DeviceList is kept (least recently used evicted)
+
+# Entity resolution
+DEFAULT_RESOLVE_LIMIT = 5  # Candidates returned by ResolveEntities
+MAX_RESOLVE_LIMIT = 50
+ENTITY_RESOLVER_MIN_SCORE = 0.5  # Minimum share of a name found in the utterance
+ENTITY_RESOLVER_AREA_WEIGHT = 0.3  # Bonus weight of the area name matching the utterance
+
+# Admission
+RPCS_PER_SPEAKER = 4  # State, TTS and result streams plus one unary call in flight
+RPC_HEADROOM = 16  # Extra RPC slots for registrations being rejected and pings
+ADMISSION_RETRY_MS = 10000  # Mean retry-after for registrations over max_speakers
+ADMISSION_RETRY_JITTER = 0.5  # Retry-after varies by this share either way
+
+# Rate limiting
+DEFAULT_RATE_LIMIT = 5  # Commands/TTS requests per second sustained by one speaker
+DEFAULT_RATE_BURST = 20  # Requests a speaker may send at once before being throttled
+DEFAULT_SERVICE_CONCURRENCY = 16  # Service calls and event fires running at once across all speakers
+
+# Persistence
+SPEAKER_SAVE_DELAY = 1  # Write-behind delay after a speaker is registered or removed
+SPEAKER_ACTIVITY_SAVE_DELAY = 30  # Longest time last_seen updates stay only in memory
+
+# Entities
+ENTITY_REFRESH_INTERVAL = 60  # Seconds between refreshes of time-based attributes (uptime, last_seen, latency)
+
+# Scheduled TTS
+SCHEDULED_TTS_RETRY_INTERVAL = 5  # Seconds between checks for a speaker that is not streaming yet
+SCHEDULED_TTS_MAX_LATENESS = 600  # Drop a due message if the speaker does not connect within this time
+SCHEDULED_TTS_SAVE_DELAY = 1  # Debounce for persisting the schedule
 
 # Services
 SERVICE_SEND_TTS = "send_tts"
 SERVICE_RELOAD_SPEAKERS = "reload_speakers"
 SERVICE_TEST_CONNECTION = "test_connection"
+SERVICE_SET_QUIET_HOURS = "set_quiet_hours"
+SERVICE_CANCEL_SCHEDULED_TTS = "cancel_scheduled_tts"
 
 # Events
 EVENT_SPEAKER_CONNECTED = f"{DEFAULT_EVENT_PREFIX}connected"
 EVENT_SPEAKER_DISCONNECTED = f"{DEFAULT_EVENT_PREFIX}disconnected"
+EVENT_SPEAKER_INACTIVE = f"{DEFAULT_EVENT_PREFIX}inactive"
+EVENT_SPEAKER_RESUMED = f"{DEFAULT_EVENT_PREFIX}resumed"
 EVENT_SPEAKER_COMMAND = f"{DEFAULT_EVENT_PREFIX}command"
 EVENT_SPEAKER_TTS_REQUEST = f"{DEFAULT_EVENT_PREFIX}tts_request"
 EVENT_SPEAKER_TTS_RESPONSE = f"{DEFAULT_EVENT_PREFIX}tts_response"
@@ -0,0 +1,264 @@
+"""
+Cached, versioned device catalog for Alpha Private Speaker
+"""
+import heapq
+import logging
+import time
+from bisect import bisect_right, insort
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from homeassistant.components.climate import ClimateEntityFeature
+from homeassistant.components.cover import CoverEntityFeature
+from homeassistant.components.fan import FanEntityFeature
+from homeassistant.components.light import ATTR_SUPPORTED_COLOR_MODES, brightness_supported
+from homeassistant.components.media_player import MediaPlayerEntityFeature
+from homeassistant.const import ATTR_SUPPORTED_FEATURES, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State, callback
+
+from .const import DEVICE_CHANGE_LOG_SIZE, DEVICE_LIST_CACHE_SIZE
+from .proto import alpha_speaker_pb2 as pb
+
+_LOGGER = logging.getLogger(__name__)
+
+# Виды записей журнала изменений
+CHANGE_ADDED = "added"
+CHANGE_UPDATED = "changed"
+CHANGE_REMOVED = "removed"
+
+# Синтетический бит для света: яркость определяется по supported_color_modes
+BRIGHTNESS_FEATURE = 1 << 31
+# Устаревший SUPPORT_BRIGHTNESS старых интеграций света
+LEGACY_LIGHT_BRIGHTNESS = 1
+
+# Команды домена и биты supported_features, любой из которых нужен (0 - всегда доступна)
+COMMAND_FEATURES: Dict[str, List[Tuple[str, int]]] = {
+    "light": [
+        ("turn_on", 0),
+        ("turn_off", 0),
+        ("toggle", 0),
+        ("set_brightness", BRIGHTNESS_FEATURE | LEGACY_LIGHT_BRIGHTNESS),
+    ],
+    "switch": [("turn_on", 0), ("turn_off", 0), ("toggle", 0)],
+    "climate": [
+        ("set_temperature", ClimateEntityFeature.TARGET_TEMPERATURE),
+        ("set_mode", 0),
+    ],
+    "media_player": [
+        ("play", MediaPlayerEntityFeature.PLAY),
+        ("pause", MediaPlayerEntityFeature.PAUSE),
+        ("stop", MediaPlayerEntityFeature.STOP),
+        ("volume_set", MediaPlayerEntityFeature.VOLUME_SET),
+        ("volume_up", MediaPlayerEntityFeature.VOLUME_SET | MediaPlayerEntityFeature.VOLUME_STEP),
+        ("volume_down", MediaPlayerEntityFeature.VOLUME_SET | MediaPlayerEntityFeature.VOLUME_STEP),
+    ],
+    "cover": [
+        ("open_cover", CoverEntityFeature.OPEN),
+        ("close_cover", CoverEntityFeature.CLOSE),
+        ("stop_cover", CoverEntityFeature.STOP),
+        ("set_position", CoverEntityFeature.SET_POSITION),
+    ],
+    "fan": [("turn_on", 0), ("turn_off", 0), ("set_speed", FanEntityFeature.SET_SPEED)],
+    "scene": [("turn_on", 0)],
+    "script": [("turn_on", 0)],
+}
+
+
+def feature_mask(state: State) -> int:
+    """supported_features of the entity plus synthetic bits"""
+    try:
+        features = int(state.attributes.get(ATTR_SUPPORTED_FEATURES) or 0)
+    except (TypeError, ValueError):
+        features = 0
+    if state.domain == "light" and brightness_supported(state.attributes.get(ATTR_SUPPORTED_COLOR_MODES)):
+        features |= BRIGHTNESS_FEATURE
+    return features
+
+
+@lru_cache(maxsize=512)
+def supported_commands(domain: str, features: int) -> Tuple[str, ...]:
+    """Commands an entity of the domain with this feature bitmask can execute"""
+    return tuple(
+        command for command, required in COMMAND_FEATURES.get(domain, ())
+        if not required or features & required
+    )
+
+
+class DeviceCatalog:
+    """DeviceInfo per entity, updated from state changes and versioned per domain.
+
+    Versions start at the startup time in milliseconds, so a version a
+    speaker kept from before a restart never matches the new catalog.
+    A filtered list's version is the newest version of its domains, so a
+    speaker that only lists lights is not invalidated by sensor updates.
+    Sorted entity_id lists per domain give keyset pages: a page starts
+    right after the last entity_id of the previous one. A bounded change
+    log answers "what changed since version N" while N is still covered.
+    Built lists are kept for the most recently used domain filters only,
+    since speakers choose their filters freely.
+    """
+
+    def __init__(self, hass: HomeAssistant, change_log_size: int = DEVICE_CHANGE_LOG_SIZE,
+                 list_cache_size: int = DEVICE_LIST_CACHE_SIZE):
+        self.hass = hass
+        self.devices: Dict[str, pb.DeviceInfo] = {}
+        self.version = int(time.time() * 1000)
+        self.domain_versions: Dict[str, int] = {}
+        self.domain_ids: Dict[str, List[str]] = {}
+        # Собранные списки: фильтр доменов -> (версия, DeviceList), от давно запрошенных к недавним
+        self._lists: "OrderedDict[FrozenSet[str], Tuple[int, pb.DeviceList]]" = OrderedDict()
+        self._list_cache_size = max(1, list_cache_size)
+        self._remove_listener: Optional[Callable[[], None]] = None
+        # Журнал (версия, entity_id, вид изменения); старые записи вытесняются
+        self.change_log: Deque[Tuple[int, str, str]] = deque(maxlen=change_log_size)
+        self._log_floor = self.version
+
+    @callback
+    def start(self):
+        """Build the catalog and follow state changes"""
+        self.devices.clear()
+        self.domain_ids.clear()
+        self._lists.clear()
+        self.change_log.clear()
+        self.version += 1
+        self._log_floor = self.version
+        for state in self.hass.states.async_all():
+            self.devices[state.entity_id] = self._build_device(state)
+            self.domain_ids.setdefault(state.domain, []).append(state.entity_id)
+            self.domain_versions[state.domain] = self.version
+        for entity_ids in self.domain_ids.values():
+            entity_ids.sort()
+        self._remove_listener = self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._handle_state_changed)
+        _LOGGER.debug(f"Device catalog built: {len(self.devices)} devices, version {self.version}")
+
+    @callback
+    def stop(self):
+        """Stop following state changes"""
+        if self._remove_listener:
+            self._remove_listener()
+            self._remove_listener = None
+
+    def get_version(self, domains: Iterable[str] = ()) -> int:
+        """Version of the list filtered by domains (whole catalog if empty)"""
+        domains = frozenset(domains)
+        if not domains:
+            return self.version
+        # Для доменов без устройств - общая версия каталога
+        return max(self.domain_versions.get(domain, 0) for domain in domains) or self.version
+
+    def get_list(self, domains: Iterable[str] = ()) -> pb.DeviceList:
+        """DeviceList for the domain filter, rebuilt only after a change"""
+        domains = frozenset(domains)
+        version = self.get_version(domains)
+        cached = self._lists.get(domains)
+        if cached is not None and cached[0] == version:
+            self._lists.move_to_end(domains)
+            return cached[1]
+
+        devices = [
+            device for device in self.devices.values()
+            if not domains or device.domain in domains
+        ]
+        device_list = pb.DeviceList(devices=devices, total_count=len(devices), version=version)
+        self._lists[domains] = (version, device_list)
+        self._lists.move_to_end(domains)
+        if len(self._lists) > self._list_cache_size:
+            # Вытесняем фильтр, который дольше всех не запрашивали
+            self._lists.popitem(last=False)
+        return device_list
+
+    def count(self, domains: Iterable[str] = ()) -> int:
+        """Number of devices matching the domain filter"""
+        domains = frozenset(domains)
+        return sum(
+            len(entity_ids) for domain, entity_ids in self.domain_ids.items()
+            if not domains or domain in domains
+        )
+
+    def get_page(self, domains: Iterable[str] = (), after: str = "",
+                 limit: int = 100) -> Tuple[List[pb.DeviceInfo], str]:
+        """Up to `limit` devices ordered by entity_id after the cursor, and the next cursor ("" at the end)"""
+        domains = frozenset(domains)
+        # Индексный доступ с позиции курсора: страница стоит O(limit), а не O(позиции курсора)
+        sources = [
+            map(entity_ids.__getitem__, range(bisect_right(entity_ids, after), len(entity_ids)))
+            for domain, entity_ids in self.domain_ids.items()
+            if not domains or domain in domains
+        ]
+        # Берем на одну запись больше, чтобы знать, есть ли следующая страница
+        page = list(islice(heapq.merge(*sources), limit + 1))
+        next_cursor = page[limit - 1] if len(page) > limit else ""
+        return [self.devices[entity_id] for entity_id in page[:limit]], next_cursor
+
+    def get_changes(self, since: int, domains: Iterable[str] = ()
+                    ) -> Optional[Tuple[List[pb.DeviceInfo], List[pb.DeviceInfo], List[str]]]:
+        """(added, changed, removed) since a version, None if the log no longer covers it"""
+        if self.change_log.maxlen and len(self.change_log) == self.change_log.maxlen:
+            # Журнал полон: все, что старше первой записи, уже вытеснено
+            self._log_floor = max(self._log_floor, self.change_log[0][0] - 1)
+        if since < self._log_floor or since > self.version:
+            return None
+
+        domains = frozenset(domains)
+        # Первый вид изменения каждой сущности после since (обход с конца журнала)
+        first_change: Dict[str, str] = {}
+        for version, entity_id, kind in reversed(self.change_log):
+            if version <= since:
+                break
+            first_change[entity_id] = kind
+
+        added, changed, removed = [], [], []
+        for entity_id, kind in first_change.items():
+            if domains and entity_id.split('.')[0] not in domains:
+                continue
+            device = self.devices.get(entity_id)
+            if device is not None:
+                (added if kind == CHANGE_ADDED else changed).append(device)
+            elif kind != CHANGE_ADDED:
+                # Появилась и исчезла после since - клиенту о ней знать не нужно
+                removed.append(entity_id)
+        return added, changed, removed
+
+    @staticmethod
+    def _build_device(state: State) -> pb.DeviceInfo:
+        return pb.DeviceInfo(
+            entity_id=state.entity_id,
+            friendly_name=state.attributes.get('friendly_name', state.entity_id),
+            domain=state.domain,
+            current_state=state.state,
+            supported_commands=supported_commands(state.domain, feature_mask(state))
+        )
+
+    def _bump(self, domain: str, entity_id: str, kind: str):
+        self.version += 1
+        self.domain_versions[domain] = self.version
+        self.change_log.append((self.version, entity_id, kind))
+
+    @callback
+    def _handle_state_changed(self, event: Event):
+        entity_id = event.data["entity_id"]
+        new_state: Optional[State] = event.data.get("new_state")
+
+        if new_state is None:
+            if self.devices.pop(entity_id, None) is not None:
+                domain = entity_id.split('.')[0]
+                entity_ids = self.domain_ids[domain]
+                entity_ids.pop(bisect_right(entity_ids, entity_id) - 1)
+                if not entity_ids:
+                    del self.domain_ids[domain]
+                self._bump(domain, entity_id, CHANGE_REMOVED)
+            return
+
+        device = self.devices.get(entity_id)
+        # Прочие изменения атрибутов в каталог не попадают
+        if (device is not None and device.current_state == new_state.state
+                and device.friendly_name == new_state.attributes.get('friendly_name', entity_id)
+                and tuple(device.supported_commands) == supported_commands(new_state.domain, feature_mask(new_state))):
+            return
+
+        if device is None:
+            insort(self.domain_ids.setdefault(new_state.domain, []), entity_id)
+        self.devices[entity_id] = self._build_device(new_state)
+        self._bump(new_state.domain, entity_id, CHANGE_ADDED if device is None else CHANGE_UPDATED)
@@ -0,0 +1,44 @@
+"""Diagnostics support for Alpha Private Speaker."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_HA_TOKEN
+
+TO_REDACT = {CONF_HA_TOKEN, "resume_token"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+
+    diagnostics: dict[str, Any] = {
+        "config": async_redact_data(data.get("config", {}), TO_REDACT),
+        "speakers": [],
+        "tts_latency": {},
+    }
+
+    speaker_manager = data.get("speaker_manager")
+    if speaker_manager:
+        speakers = await speaker_manager.get_all_speakers()
+        diagnostics["speakers"] = [
+            async_redact_data(
+                {**speaker.as_dict(), "online": speaker.online, "streams": sorted(speaker.streams)}, TO_REDACT
+            )
+            for speaker in speakers
+        ]
+        diagnostics["connected_speakers"] = speaker_manager.get_online_ids()
+
+    grpc_server = data.get("grpc_server")
+    if grpc_server and grpc_server.servicer:
+        servicer = grpc_server.servicer
+        diagnostics["active_tts_streams"] = list(servicer.active_tts_streams.keys())
+        diagnostics["tts_latency"] = servicer.tts_latency.as_dict()
+
+    return diagnostics
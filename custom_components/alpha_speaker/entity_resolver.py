@@ -0,0 +1,189 @@
+"""
+Fuzzy entity name resolution for voice commands of Alpha Private Speaker
+"""
+import logging
+import re
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar, device_registry as dr, entity_registry as er
+
+from .const import ENTITY_RESOLVER_AREA_WEIGHT, ENTITY_RESOLVER_MIN_SCORE
+from .registry_index import RegistryIndex, normalize_name
+
+_LOGGER = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+# Вид имени: отображаемое имя, псевдоним из реестра, название зоны
+KIND_NAME = "name"
+KIND_ALIAS = "alias"
+KIND_AREA = "area"
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Word trigrams padded like pg_trgm: "лампа" -> "  л", " ла", "лам", ..."""
+    result = set()
+    for word in normalize_name(_NON_WORD.sub(" ", text)).split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(result)
+
+
+class EntityResolver:
+    """Trigram index over friendly names, aliases and area names.
+
+    A candidate scores by the share of its best name found in the utterance
+    (so "включи свет на кухне" fully covers "свет"), plus a smaller bonus
+    for its area name. Only entities sharing trigrams with the utterance
+    are scored, which keeps lookups well under a millisecond.
+    """
+
+    def __init__(self, hass: HomeAssistant, registry_index: RegistryIndex):
+        self.hass = hass
+        self.registry_index = registry_index
+        # entity_id -> [(вид, исходный текст, триграммы)]
+        self.names: Dict[str, List[Tuple[str, str, FrozenSet[str]]]] = {}
+        self.friendly_names: Dict[str, str] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        self._listeners: List[Callable[[], None]] = []
+
+    @callback
+    def start(self):
+        """Build the index and follow state and registry changes"""
+        self.rebuild()
+        self._listeners = [
+            self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._handle_state_changed),
+            self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_entity_registry_updated),
+            self.hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._handle_device_registry_updated),
+            self.hass.bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, self._handle_area_registry_updated),
+        ]
+
+    @callback
+    def stop(self):
+        """Stop following changes"""
+        for remove_listener in self._listeners:
+            remove_listener()
+        self._listeners = []
+
+    def rebuild(self):
+        """Index every entity that has a state"""
+        self.names.clear()
+        self.friendly_names.clear()
+        self.postings.clear()
+        for state in self.hass.states.async_all():
+            self.friendly_names[state.entity_id] = state.attributes.get("friendly_name") or state.entity_id
+            self._index_entity(state.entity_id)
+        _LOGGER.debug(f"Entity resolver built: {len(self.names)} entities, {len(self.postings)} trigrams")
+
+    def resolve(self, utterance: str, limit: int = 5,
+                domains: Iterable[str] = ()) -> List[Tuple[str, str, Optional[str], float]]:
+        """Ranked candidates (entity_id, matched name, area name, score) for an utterance"""
+        query = trigrams(utterance)
+        if not query:
+            return []
+
+        domains = set(domains)
+        candidates: Set[str] = set()
+        for trigram in query:
+            candidates.update(self.postings.get(trigram, ()))
+
+        ranked = []
+        for entity_id in candidates:
+            if domains and entity_id.split('.')[0] not in domains:
+                continue
+
+            best_name, name_score, area_name, area_score = "", 0.0, None, 0.0
+            for kind, text, grams in self.names[entity_id]:
+                score = len(query & grams) / len(grams)
+                if kind == KIND_AREA:
+                    area_name = text
+                    area_score = score
+                elif score > name_score:
+                    best_name, name_score = text, score
+
+            if name_score < ENTITY_RESOLVER_MIN_SCORE:
+                continue
+            ranked.append((entity_id, best_name, area_name,
+                           round(name_score + ENTITY_RESOLVER_AREA_WEIGHT * area_score, 4)))
+
+        ranked.sort(key=lambda item: (-item[3], item[0]))
+        return ranked[:limit]
+
+    def _index_entity(self, entity_id: str):
+        """(Re)index names of one entity"""
+        self._unindex_entity(entity_id)
+        friendly_name = self.friendly_names.get(entity_id)
+        if friendly_name is None:
+            return
+
+        names: List[Tuple[str, str, FrozenSet[str]]] = [(KIND_NAME, friendly_name, trigrams(friendly_name))]
+
+        entry = er.async_get(self.hass).async_get(entity_id)
+        if entry is not None:
+            for alias in getattr(entry, "aliases", None) or ():
+                names.append((KIND_ALIAS, alias, trigrams(alias)))
+
+        area_id = self.registry_index.get_entity_area(entity_id)
+        if area_id:
+            area = ar.async_get(self.hass).async_get_area(area_id)
+            if area is not None:
+                names.append((KIND_AREA, area.name, trigrams(area.name)))
+
+        names = [name for name in names if name[2]]
+        if not names:
+            return
+
+        self.names[entity_id] = names
+        for _, _, grams in names:
+            for trigram in grams:
+                self.postings.setdefault(trigram, set()).add(entity_id)
+
+    def _unindex_entity(self, entity_id: str):
+        names = self.names.pop(entity_id, None)
+        if not names:
+            return
+        for _, _, grams in names:
+            for trigram in grams:
+                bucket = self.postings.get(trigram)
+                if bucket is not None:
+                    bucket.discard(entity_id)
+                    if not bucket:
+                        del self.postings[trigram]
+
+    @callback
+    def _handle_state_changed(self, event: Event):
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            self.friendly_names.pop(entity_id, None)
+            self._unindex_entity(entity_id)
+            return
+
+        friendly_name = new_state.attributes.get("friendly_name") or entity_id
+        # Большинство изменений состояния имя не трогают
+        if self.friendly_names.get(entity_id) != friendly_name:
+            self.friendly_names[entity_id] = friendly_name
+            self._index_entity(entity_id)
+
+    @callback
+    def _handle_entity_registry_updated(self, event: Event):
+        # Псевдонимы и зона меняются через реестр сущностей
+        if event.data.get("old_entity_id"):
+            self._unindex_entity(event.data["old_entity_id"])
+        if event.data["action"] != "remove":
+            self._index_entity(event.data["entity_id"])
+
+    @callback
+    def _handle_device_registry_updated(self, event: Event):
+        # Устройство перенесли в другую зону
+        if event.data["action"] != "update":
+            return
+        for entity_id in list(self.registry_index.device_entities.get(event.data["device_id"], ())):
+            self._index_entity(entity_id)
+
+    @callback
+    def _handle_area_registry_updated(self, event: Event):
+        # Переименование зоны затрагивает все ее устройства - пересобираем целиком
+        self.rebuild()
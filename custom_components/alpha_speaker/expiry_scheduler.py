@@ -0,0 +1,107 @@
+"""
+Inactivity expiry of speaker sessions for Alpha Private Speaker
+"""
+import asyncio
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .const import DEFAULT_EVICT_TIMEOUT, DEFAULT_INACTIVE_TIMEOUT
+
+
+class ExpiryScheduler:
+    """Min-heap of activity deadlines with an inactive and an evict threshold.
+
+    Each key has one live heap entry for its next threshold. Activity only
+    updates the timestamp; when an entry comes due it is re-armed to the
+    new deadline if the key was active meanwhile, so a busy speaker costs
+    nothing per message. A single loop timer fires at the earliest deadline.
+    """
+
+    def __init__(self, on_inactive: Callable[[str], None], on_evict: Callable[[str], None],
+                 inactive_after: float = DEFAULT_INACTIVE_TIMEOUT, evict_after: float = DEFAULT_EVICT_TIMEOUT):
+        self.on_inactive = on_inactive
+        self.on_evict = on_evict
+        self.inactive_after = inactive_after
+        self.evict_after = max(evict_after, inactive_after)
+        self.last_activity: Dict[str, float] = {}
+        self.inactive: Set[str] = set()
+        # (срок, поколение, ключ): записи устаревших поколений пропускаются
+        self._heap: List[Tuple[float, int, str]] = []
+        self._generation: Dict[str, int] = {}
+        self._seq = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def touch(self, key: str, now: Optional[float] = None):
+        """Record activity of a key"""
+        now = now or time.time()
+        known = key in self.last_activity
+        self.last_activity[key] = now
+        if not known or key in self.inactive:
+            # Новая или вернувшаяся колонка - следующий порог снова "неактивна"
+            self.inactive.discard(key)
+            self._push(now + self.inactive_after, key)
+
+    def remove(self, key: str):
+        """Stop tracking a key (its heap entry is dropped lazily)"""
+        self.last_activity.pop(key, None)
+        self.inactive.discard(key)
+        self._generation.pop(key, None)
+
+    def is_inactive(self, key: str) -> bool:
+        return key in self.inactive
+
+    def stop(self):
+        """Cancel the timer"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def _push(self, deadline: float, key: str):
+        self._seq += 1
+        self._generation[key] = self._seq
+        heapq.heappush(self._heap, (deadline, self._seq, key))
+        if self._heap[0][1] == self._seq:
+            self._arm()
+
+    def _arm(self):
+        """Set the timer to the earliest deadline"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._heap:
+            delay = max(0.0, self._heap[0][0] - time.time())
+            self._timer = asyncio.get_running_loop().call_later(delay, self._fire)
+
+    def _fire(self):
+        self._timer = None
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, generation, key = heapq.heappop(self._heap)
+            if self._generation.get(key) != generation:
+                continue
+
+            last_activity = self.last_activity[key]
+            if key in self.inactive:
+                deadline = last_activity + self.evict_after
+            else:
+                deadline = last_activity + self.inactive_after
+            if deadline > now:
+                # Была активность - переставляем на новый срок
+                self._push_silent(deadline, key)
+                continue
+
+            if key in self.inactive:
+                self.remove(key)
+                self.on_evict(key)
+            else:
+                self.inactive.add(key)
+                self._push_silent(last_activity + self.evict_after, key)
+                self.on_inactive(key)
+        self._arm()
+
+    def _push_silent(self, deadline: float, key: str):
+        """Push without re-arming (the caller re-arms once)"""
+        self._seq += 1
+        self._generation[key] = self._seq
+        heapq.heappush(self._heap, (deadline, self._seq, key))
@@ -3,32 +3,93 @@ gRPC сервер для Альфы - версия для интеграции H
 """
 import asyncio
 import logging
+import math
+import random
 import uuid
 import time
-from typing import AsyncIterator, Dict, List, Optional, Any
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Any
 import grpc
 from grpc import aio
 
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 
+from .const import (
+    ADMISSION_RETRY_JITTER,
+    ADMISSION_RETRY_MS,
+    COMMAND_RESULT_BUFFER_SIZE,
+    DEFAULT_BATCH_PARALLELISM,
+    DEFAULT_COALESCE_WINDOW_MS,
+    DEFAULT_DEVICE_PAGE_SIZE,
+    DEFAULT_EVICT_TIMEOUT,
+    DEFAULT_INACTIVE_TIMEOUT,
+    DEFAULT_RESOLVE_LIMIT,
+    DEFAULT_TTS_CHUNK_MAX_CHARS,
+    MAX_BATCH_COMMANDS,
+    MAX_BATCH_PARALLELISM,
+    MAX_DEVICE_PAGE_SIZE,
+    DEFAULT_MAX_SPEAKERS,
+    MAX_RESOLVE_LIMIT,
+    RPC_HEADROOM,
+    RPCS_PER_SPEAKER,
+    TTS_RESPONSE_TIMEOUT,
+)
+from .command_cache import CommandResultCache
+from .command_dispatch import CommandDispatcher
+from .command_lanes import EntityLaneExecutor
+from .device_catalog import DeviceCatalog
+from .entity_resolver import EntityResolver
+from .expiry_scheduler import ExpiryScheduler
+from .latency import STAGE_DEQUEUED, STAGE_ENQUEUED, STAGE_SENT, TTSLatencyTracker
 from .proto import alpha_speaker_pb2 as pb
 from .proto import alpha_speaker_pb2_grpc as pb_grpc
+from .rate_limiter import FairScheduler, SpeakerRateLimiter
+from .registry_index import RegistryIndex
+from .service_coalescer import ServiceCallCoalescer
+from .tts_chunker import split_tts_text
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _page_size(requested: int) -> int:
+    """Devices per page: the default when not set, clamped to 1..MAX_DEVICE_PAGE_SIZE"""
+    return max(1, min(requested or DEFAULT_DEVICE_PAGE_SIZE, MAX_DEVICE_PAGE_SIZE))
+
+
 class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
     """Реализация gRPC сервиса для интеграции Home Assistant"""
     
-    def __init__(self, hass: HomeAssistant, speaker_manager, event_prefix: str = "alpha_speaker_"):
+    def __init__(self, hass: HomeAssistant, speaker_manager, event_prefix: str = "alpha_speaker_",
+                 coalesce_window_ms: int = DEFAULT_COALESCE_WINDOW_MS,
+                 inactive_timeout: int = DEFAULT_INACTIVE_TIMEOUT, evict_timeout: int = DEFAULT_EVICT_TIMEOUT,
+                 max_speakers: int = DEFAULT_MAX_SPEAKERS):
         self.hass = hass
         self.speaker_manager = speaker_manager
         self.event_prefix = event_prefix
-        self.connected_speakers: Dict[str, Dict] = {}
+        self.max_speakers = max_speakers
         self.active_state_streams: Dict[str, asyncio.Queue] = {}
         self.active_tts_streams: Dict[str, asyncio.Queue] = {}
-        self.tts_responses: Dict[str, asyncio.Future] = {}
+        # Ожидающие подтверждения фрагменты: (message_id, chunk_index) -> Future
+        self.tts_responses: Dict[Tuple[str, int], asyncio.Future] = {}
+        self.tts_locks: Dict[str, asyncio.Lock] = {}
+        self.tts_chunk_max_chars = DEFAULT_TTS_CHUNK_MAX_CHARS
+        self.tts_latency = TTSLatencyTracker()
+        self.command_dispatcher = CommandDispatcher(hass)
+        self.registry_index = RegistryIndex(hass)
+        self.entity_resolver = EntityResolver(hass, self.registry_index)
+        self.device_catalog = DeviceCatalog(hass)
+        self.service_coalescer = ServiceCallCoalescer(hass, coalesce_window_ms)
+        self.active_result_streams: Dict[str, asyncio.Queue] = {}
+        self.pending_results: Dict[str, deque] = {}
+        self.command_tasks: set = set()
+        self.command_cache = CommandResultCache()
+        self.rate_limiter = SpeakerRateLimiter()
+        self.call_scheduler = FairScheduler()
+        self.command_lanes = EntityLaneExecutor()
+        self.expiry = ExpiryScheduler(
+            self._on_speaker_inactive, self._on_speaker_evicted, inactive_timeout, evict_timeout
+        )
         self.state_listeners: Dict[str, callable] = {}
         self.running = True
         
@@ -36,12 +97,13 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         """Регистрация Альфы в интеграции"""
         speaker_id = request.speaker_id
         
+        # Новая колонка сверх лимита не допускается, повторная регистрация - да
+        await self._enforce_admission(speaker_id, context)
+        
         # Получаем адрес клиента
         peer_address = context.peer()
         
-        # Регистрируем колонку в менеджере
-        session_id = await self.speaker_manager.register_speaker(
-            speaker_id=speaker_id,
+        metadata = dict(
             name=request.speaker_name,
             speaker_type=request.speaker_type,
             version=request.firmware_version,
@@ -50,48 +112,66 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
             settings=dict(request.settings)
         )
         
-        speaker_info = {
-            'id': speaker_id,
-            'name': request.speaker_name,
-            'type': request.speaker_type,
-            'firmware': request.firmware_version,
-            'capabilities': list(request.capabilities),
-            'settings': dict(request.settings),
-            'session_id': session_id,
-            'address': peer_address,
-            'connected_at': time.time(),
-            'context': context,
-            'last_activity': time.time()
-        }
-        
-        self.connected_speakers[speaker_id] = speaker_info
-        
-        _LOGGER.info(f"✅ Альфа зарегистрирована: {request.speaker_name} ({peer_address})")
+        # Возобновление прошлой сессии (в том числе после перезапуска HA)
+        resumed = await self.speaker_manager.resume_speaker(
+            speaker_id, request.resume_session_id, request.resume_token, **metadata
+        )
+        if resumed is not None:
+            speaker, metadata_changed = resumed
+            session_id = speaker.session_id
+            _LOGGER.info(f"🔄 Сессия Альфы возобновлена: {request.speaker_name} ({peer_address})")
+        else:
+            # Регистрируем колонку в менеджере
+            session_id, metadata_changed = await self.speaker_manager.register_speaker(
+                speaker_id=speaker_id, **metadata
+            )
+            speaker = await self.speaker_manager.get_speaker(speaker_id)
+            _LOGGER.info(f"✅ Альфа зарегистрирована: {request.speaker_name} ({peer_address})")
         
-        # Обновляем активность в менеджере
-        await self.speaker_manager.update_speaker_activity(speaker_id)
+        # Обновляем активность в менеджере и запускаем таймеры неактивности
+        await self._touch_speaker(speaker_id)
         
-        # Создаем событие подключения в HA через интеграцию
-        self.hass.bus.async_fire(
-            f"{self.event_prefix}connected",
-            {
-                "speaker_id": speaker_id,
-                "speaker_name": request.speaker_name,
-                "speaker_type": request.speaker_type,
-                "firmware_version": request.firmware_version,
-                "capabilities": list(request.capabilities),
-                "session_id": session_id,
-                "address": peer_address,
-                "timestamp": int(time.time() * 1000),
-                "integration_event": True
-            }
-        )
+        if resumed is not None and not metadata_changed:
+            # Метаданные прежние - реестр устройств и хранилище не трогаем
+            self.hass.bus.async_fire(
+                f"{self.event_prefix}resumed",
+                {
+                    "speaker_id": speaker_id,
+                    "speaker_name": request.speaker_name,
+                    "session_id": session_id,
+                    "address": peer_address,
+                    "timestamp": int(time.time() * 1000),
+                    "integration_event": True
+                }
+            )
+        else:
+            # Создаем событие подключения в HA через интеграцию
+            # (при неизменном отпечатке метаданных реестр устройств не обновляется)
+            self.hass.bus.async_fire(
+                f"{self.event_prefix}connected",
+                {
+                    "speaker_id": speaker_id,
+                    "speaker_name": request.speaker_name,
+                    "speaker_type": request.speaker_type,
+                    "firmware_version": request.firmware_version,
+                    "capabilities": list(request.capabilities),
+                    "session_id": session_id,
+                    "address": peer_address,
+                    "resumed": resumed is not None,
+                    "metadata_changed": metadata_changed,
+                    "timestamp": int(time.time() * 1000),
+                    "integration_event": True
+                }
+            )
         
         return pb.RegistrationResponse(
             success=True,
-            message=f"Альфа '{request.speaker_name}' успешно зарегистрирована",
+            message=(f"Сессия Альфы '{request.speaker_name}' возобновлена" if resumed is not None
+                     else f"Альфа '{request.speaker_name}' успешно зарегистрирована"),
             server_version="2.1.0",
             session_id=session_id,
+            resumed=resumed is not None,
+            resume_token=speaker.resume_token,
             server_settings={
                 "grpc_port": "50051",
                 "event_prefix": self.event_prefix,
@@ -103,14 +183,12 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         """Потоковая передача состояний устройств через интеграцию"""
         speaker_id = request.speaker_id
         
-        if speaker_id not in self.connected_speakers:
-            context.abort(grpc.StatusCode.UNAUTHENTICATED, "Альфа не зарегистрирована")
+        if not self.speaker_manager.is_online(speaker_id):
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Альфа не зарегистрирована")
             return
         
         # Обновляем активность колонки
-        await self.speaker_manager.update_speaker_activity(speaker_id)
-        if speaker_id in self.connected_speakers:
-            self.connected_speakers[speaker_id]['last_activity'] = time.time()
+        await self._touch_speaker(speaker_id)
         
         _LOGGER.info(f"▶ Начало потока состояний для Альфы {speaker_id}")
         
@@ -118,6 +196,7 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         queue = asyncio.Queue()
         stream_id = f"states_{speaker_id}_{int(time.time())}"
         self.active_state_streams[stream_id] = queue
+        self.speaker_manager.open_stream(speaker_id, stream_id, context)
         
         try:
             # Отправляем начальное состояние если запрошено
@@ -209,9 +288,7 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
                         yield state_update
                         
                         # Обновляем активность колонки при получении обновлений
-                        await self.speaker_manager.update_speaker_activity(speaker_id)
-                        if speaker_id in self.connected_speakers:
-                            self.connected_speakers[speaker_id]['last_activity'] = time.time()
+                        await self._touch_speaker(speaker_id)
                         
                     except asyncio.TimeoutError:
                         pass
@@ -224,9 +301,7 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
                         last_keepalive = current_time
                         
                         # Обновляем активность при отправке keep-alive
-                        await self.speaker_manager.update_speaker_activity(speaker_id)
-                        if speaker_id in self.connected_speakers:
-                            self.connected_speakers[speaker_id]['last_activity'] = current_time
+                        await self._touch_speaker(speaker_id)
                         
                 except asyncio.CancelledError:
                     _LOGGER.info(f"Поток состояний для {speaker_id} отменен")
@@ -243,6 +318,7 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
                 remove_listener = self.state_listeners[stream_id]
                 remove_listener()
                 del self.state_listeners[stream_id]
+            self._close_stream(speaker_id, stream_id, context)
             
             _LOGGER.info(f"⏹ Поток состояний для {speaker_id} завершен")
     
@@ -250,8 +326,8 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         """Потоковая передача TTS команд для колонки (от HA к колонке)"""
         speaker_id = request.speaker_id
         
-        if speaker_id not in self.connected_speakers:
-            context.abort(grpc.StatusCode.UNAUTHENTICATED, "Альфа не зарегистрирована")
+        if not self.speaker_manager.is_online(speaker_id):
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Альфа не зарегистрирована")
             return
         
         _LOGGER.info(f"▶ Начало потока TTS команд для Альфы {speaker_id}")
@@ -262,14 +338,14 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         
         # Сохраняем ссылку на очередь
         self.active_tts_streams[speaker_id] = queue
+        self.speaker_manager.open_stream(speaker_id, "tts", context)
         _LOGGER.info(f"Создана очередь TTS для {speaker_id}. Всего активных TTS потоков: {len(self.active_tts_streams)}")
         
         try:
             # Проверяем, поддерживает ли колонка TTS
-            speaker_info = self.connected_speakers.get(speaker_id, {})
-            capabilities = speaker_info.get('capabilities', [])
+            speaker = await self.speaker_manager.get_speaker(speaker_id)
             
-            if "tts" not in capabilities:
+            if speaker is None or "tts" not in speaker.capabilities:
                 _LOGGER.warning(f"⚠ Колонка {speaker_id} не поддерживает TTS")
             
             # Основной цикл потока
@@ -284,12 +360,12 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
                         
                         if tts_command and tts_command.text:  # Не отправляем пустые команды
                             _LOGGER.info(f"📢 Отправка TTS на колонку {speaker_id}: '{tts_command.text[:100]}...'")
+                            self.tts_latency.mark(tts_command.message_id, STAGE_DEQUEUED)
                             yield tts_command
+                            self.tts_latency.mark(tts_command.message_id, STAGE_SENT)
                             
                             # Обновляем активность
-                            await self.speaker_manager.update_speaker_activity(speaker_id)
-                            if speaker_id in self.connected_speakers:
-                                self.connected_speakers[speaker_id]['last_activity'] = time.time()
+                            await self._touch_speaker(speaker_id)
                             
                     except asyncio.TimeoutError:
                         # Проверяем, нужно ли отправить keep-alive
@@ -317,20 +393,70 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
                 _LOGGER.info(f"Удалена очередь TTS для {speaker_id}. Осталось активных TTS потоков: {len(self.active_tts_streams)}")
             else:
                 _LOGGER.warning(f"Очередь TTS для {speaker_id} уже была удалена или заменена")
+            self._close_stream(speaker_id, "tts", context)
             
             _LOGGER.info(f"⏹ Поток TTS для {speaker_id} завершен")
     
+    async def StreamCommandResults(self, request: pb.StateStreamRequest, context) -> AsyncIterator[pb.CommandResponse]:
+        """Потоковая передача итогов команд, отправленных с non_blocking"""
+        speaker_id = request.speaker_id
+        
+        if not self.speaker_manager.is_online(speaker_id):
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Альфа не зарегистрирована")
+            return
+        
+        _LOGGER.info(f"▶ Начало потока результатов команд для Альфы {speaker_id}")
+        
+        queue = asyncio.Queue()
+        self.active_result_streams[speaker_id] = queue
+        self.speaker_manager.open_stream(speaker_id, "results", context)
+        
+        # Результаты, завершившиеся пока поток не был подключен
+        for result in self.pending_results.pop(speaker_id, ()):
+            queue.put_nowait(result)
+        
+        try:
+            last_keepalive = time.time()
+            
+            while not context.done() and self.running:
+                try:
+                    try:
+                        result = await asyncio.wait_for(queue.get(), timeout=1.0)
+                        yield result
+                        last_keepalive = time.time()
+                    except asyncio.TimeoutError:
+                        current_time = time.time()
+                        if current_time - last_keepalive > 30:
+                            yield pb.CommandResponse(event_id=f"keepalive_{int(current_time)}")
+                            last_keepalive = current_time
+                            
+                except asyncio.CancelledError:
+                    _LOGGER.info(f"Поток результатов для {speaker_id} отменен")
+                    break
+                    
+        except Exception as e:
+            _LOGGER.error(f"❌ Ошибка в потоке результатов команд: {e}", exc_info=True)
+        finally:
+            if self.active_result_streams.get(speaker_id) is queue:
+                del self.active_result_streams[speaker_id]
+                # Недоставленные результаты вернутся при следующем подключении
+                while not queue.empty():
+                    self.pending_results.setdefault(
+                        speaker_id, deque(maxlen=COMMAND_RESULT_BUFFER_SIZE)
+                    ).append(queue.get_nowait())
+            self._close_stream(speaker_id, "results", context)
+            
+            _LOGGER.info(f"⏹ Поток результатов для {speaker_id} завершен")
+    
     async def SendTTSResponse(self, request: pb.SpeakTextResponse, context):
         """Обработка TTS ответа от колонки через интеграцию"""
         speaker_id = request.speaker_id
         message_id = request.message_id
         
-        _LOGGER.info(f"📢 TTS ответ от колонки {speaker_id}: success={request.success}")
+        _LOGGER.info(f"📢 TTS ответ от колонки {speaker_id}: success={request.success}, фрагмент={request.chunk_index}")
         
         # Обновляем активность колонки
-        if speaker_id in self.connected_speakers:
-            await self.speaker_manager.update_speaker_activity(speaker_id)
-            self.connected_speakers[speaker_id]['last_activity'] = time.time()
+        await self._touch_speaker(speaker_id)
         
         # Создаем событие ответа TTS в HA через интеграцию
         self.hass.bus.async_fire(
@@ -338,6 +464,7 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
             {
                 "speaker_id": speaker_id,
                 "message_id": message_id,
+                "chunk_index": request.chunk_index,
                 "success": request.success,
                 "message": request.message,
                 "timestamp": request.timestamp,
@@ -346,16 +473,22 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
             }
         )
         
-        # Если есть ожидающий Future для этого message_id, завершаем его
-        if message_id in self.tts_responses:
-            future = self.tts_responses[message_id]
+        # Завершаем Future только ожидаемого фрагмента: запоздалый или повторный
+        # ответ на предыдущий фрагмент не должен подтвердить следующий
+        future = self.tts_responses.pop((message_id, request.chunk_index), None)
+        if future is not None:
+            # Фиксируем задержки доставки и воспроизведения
+            self.tts_latency.finish(message_id, request.success)
+            self.speaker_manager.notify_speaker(speaker_id)
             if not future.done():
                 future.set_result({
                     "success": request.success,
                     "message": request.message,
-                    "speaker_id": speaker_id
+                    "speaker_id": speaker_id,
+                    "chunk_index": request.chunk_index
                 })
-            del self.tts_responses[message_id]
+        else:
+            _LOGGER.debug(f"Ответ на неожидаемый фрагмент {request.chunk_index} сообщения {message_id} пропущен")
         
         return pb.TTSResponse(
             success=True,
@@ -368,10 +501,10 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         speaker_id = request.speaker_id
         _LOGGER.info(f"🎤 TTS запрос ОТ колонки {speaker_id}: '{request.text[:100]}...'")
         
+        await self._enforce_rate_limit(speaker_id, context)
+        
         # Обновляем активность колонки
-        if speaker_id in self.connected_speakers:
-            await self.speaker_manager.update_speaker_activity(speaker_id)
-            self.connected_speakers[speaker_id]['last_activity'] = time.time()
+        await self._touch_speaker(speaker_id)
         
         # Создаем событие TTS в HA через интеграцию
         event_data = {
@@ -387,10 +520,13 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
             "integration_event": True
         }
         
-        self.hass.bus.async_fire(
-            f"{self.event_prefix}tts_request",
-            event_data
-        )
+        async def fire_tts_request():
+            self.hass.bus.async_fire(
+                f"{self.event_prefix}tts_request",
+                event_data
+            )
+        
+        await self.call_scheduler.submit(speaker_id, fire_tts_request)
         
         return pb.TTSResponse(
             success=True,
@@ -403,10 +539,226 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         speaker_id = request.speaker_id
         _LOGGER.info(f"🎯 Команда от Альфы {speaker_id}: {request.command_type} -> {request.entity_id}")
         
+        await self._enforce_rate_limit(speaker_id, context)
+        
         # Обновляем активность колонки
-        if speaker_id in self.connected_speakers:
-            await self.speaker_manager.update_speaker_activity(speaker_id)
-            self.connected_speakers[speaker_id]['last_activity'] = time.time()
+        await self._touch_speaker(speaker_id)
+        
+        return await self._handle_command(request)
+    
+    async def SendAlphaCommands(self, request: pb.AlphaCommandBatch, context):
+        """Пакетная обработка команд от Альфы
+
+        Команды для разных устройств выполняются параллельно (не более
+        max_parallel одновременно), команды для одного устройства - строго
+        по порядку. Время ответа - время самой медленной цепочки, а не сумма.
+        """
+        speaker_id = request.speaker_id
+        commands = list(request.commands)
+        _LOGGER.info(f"🎯 Пакет из {len(commands)} команд от Альфы {speaker_id}")
+        
+        if len(commands) > MAX_BATCH_COMMANDS:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"Слишком большой пакет: {len(commands)} команд, допускается не более {MAX_BATCH_COMMANDS}"
+            )
+        
+        await self._enforce_rate_limit(speaker_id, context, cost=max(1, len(commands)))
+        
+        # Обновляем активность колонки
+        await self._touch_speaker(speaker_id)
+        
+        max_parallel = request.max_parallel or DEFAULT_BATCH_PARALLELISM
+        semaphore = asyncio.Semaphore(max(1, min(max_parallel, MAX_BATCH_PARALLELISM)))
+        results: List[Optional[pb.CommandResponse]] = [None] * len(commands)
+        
+        # Группируем по устройству, сохраняя порядок внутри группы
+        chains: Dict[str, List[int]] = {}
+        for index, command in enumerate(commands):
+            if not command.speaker_id:
+                command.speaker_id = speaker_id
+            chains.setdefault(command.entity_id or f"__event_{index}", []).append(index)
+        
+        async def run_chain(indexes: List[int]):
+            for index in indexes:
+                async with semaphore:
+                    try:
+                        results[index] = await self._handle_command(commands[index])
+                    except Exception as e:
+                        _LOGGER.error(f"Ошибка выполнения команды из пакета: {e}")
+                        results[index] = pb.CommandResponse(
+                            success=False,
+                            entity_id=commands[index].entity_id,
+                            message=str(e)
+                        )
+        
+        await asyncio.gather(*(run_chain(indexes) for indexes in chains.values()))
+        
+        return pb.CommandBatchResponse(
+            success=all(result.success for result in results),
+            results=results
+        )
+    
+    async def _enforce_rate_limit(self, speaker_id: str, context, cost: int = 1):
+        """Отказ RESOURCE_EXHAUSTED с подсказкой повтора, если колонка превысила лимит"""
+        # Корзины заводятся только для зарегистрированных колонок: смена speaker_id не дает нового запаса
+        if not self.speaker_manager.is_online(speaker_id):
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Альфа не зарегистрирована")
+        
+        retry_after = self.rate_limiter.try_acquire(speaker_id, cost)
+        if not retry_after:
+            return
+        
+        if math.isinf(retry_after):
+            _LOGGER.warning(f"🚦 Запрос колонки {speaker_id} стоимостью {cost} превышает емкость лимита")
+            await context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+                f"Запрос превышает лимит ({cost} > {self.rate_limiter.burst}), разбейте его на части"
+            )
+        
+        retry_after_ms = int(retry_after * 1000) + 1
+        _LOGGER.warning(f"🚦 Колонка {speaker_id} превысила лимит запросов, повтор через {retry_after_ms} мс")
+        await context.abort(
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+            f"Слишком много запросов, повторите через {retry_after_ms} мс",
+            trailing_metadata=(("retry-after-ms", str(retry_after_ms)),)
+        )
+    
+    async def _enforce_admission(self, speaker_id: str, context):
+        """Отказ RESOURCE_EXHAUSTED, если все места для колонок заняты"""
+        if self.speaker_manager.is_online(speaker_id):
+            return
+        online = self.speaker_manager.online_count()
+        if online < self.max_speakers:
+            return
+        
+        # Разброс срока повтора, чтобы отвергнутые колонки не вернулись одновременно
+        retry_after_ms = int(ADMISSION_RETRY_MS * random.uniform(1 - ADMISSION_RETRY_JITTER, 1 + ADMISSION_RETRY_JITTER))
+        _LOGGER.warning(f"🚫 Отказ в регистрации {speaker_id}: подключено {online} из {self.max_speakers} колонок, "
+                        f"повтор через {retry_after_ms} мс")
+        await context.abort(
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+            f"Достигнут лимит колонок ({self.max_speakers}), повторите через {retry_after_ms} мс",
+            trailing_metadata=(("retry-after-ms", str(retry_after_ms)),)
+        )
+    
+    async def _handle_command(self, request: pb.AlphaCommand) -> pb.CommandResponse:
+        """Выполнение команды с учетом ключа идемпотентности"""
+        if not request.idempotency_key:
+            return await self._dispatch_command(request)
+        
+        # Повтор после таймаута на клиенте получает сохраненный ответ
+        response, cached = await self.command_cache.get_or_run(
+            (request.speaker_id, request.idempotency_key),
+            lambda: self._dispatch_command(request)
+        )
+        if cached:
+            _LOGGER.info(f"♻ Повтор команды {request.idempotency_key} от {request.speaker_id}: возвращен сохраненный ответ")
+        return response
+    
+    async def _dispatch_command(self, request: pb.AlphaCommand) -> pb.CommandResponse:
+        """Выполнение команды сразу или в фоне (non_blocking) с ответом-квитанцией"""
+        event_id = f"cmd_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+        
+        if not request.entity_id and not request.HasField("target") and request.voice_command:
+            self._resolve_voice_command(request)
+        
+        if not request.non_blocking:
+            return await self._run_scheduled_command(request, event_id)
+        
+        task = asyncio.create_task(self._execute_command_in_background(request, event_id))
+        self.command_tasks.add(task)
+        task.add_done_callback(self.command_tasks.discard)
+        
+        return pb.CommandResponse(
+            success=True,
+            event_id=event_id,
+            message=f"Команда '{request.command_type}' принята",
+            entity_id=request.entity_id,
+            pending=True
+        )
+    
+    async def _execute_command_in_background(self, request: pb.AlphaCommand, event_id: str):
+        """Фоновое выполнение команды с публикацией результата в поток колонки"""
+        try:
+            result = await self._run_scheduled_command(request, event_id)
+        except Exception as e:
+            _LOGGER.error(f"Ошибка фонового выполнения команды {event_id}: {e}")
+            result = pb.CommandResponse(
+                success=False,
+                event_id=event_id,
+                message=str(e),
+                entity_id=request.entity_id
+            )
+        
+        self._publish_command_result(request.speaker_id, result)
+    
+    async def _run_scheduled_command(self, request: pb.AlphaCommand, event_id: str) -> pb.CommandResponse:
+        """Выполнение команды в полосе устройства и в очереди колонки
+
+        Команды для одного устройства выполняются строго в порядке поступления,
+        для разных устройств - параллельно; слоты делятся между колонками по кругу.
+        """
+        return await self.command_lanes.run(
+            self._command_entities(request),
+            lambda: self.call_scheduler.submit(
+                request.speaker_id,
+                lambda: self._execute_command(request, event_id)
+            )
+        )
+    
+    def _resolve_voice_command(self, request: pb.AlphaCommand):
+        """Подбор устройства по фразе, если колонка не указала entity_id"""
+        for entity_id, name, area, score in self.entity_resolver.resolve(request.voice_command, MAX_RESOLVE_LIMIT):
+            # Берем лучшего кандидата, который умеет выполнять эту команду
+            if self.command_dispatcher.resolve(entity_id.split('.')[0], request.command_type):
+                request.entity_id = entity_id
+                _LOGGER.info(f"🔎 '{request.voice_command}' -> {entity_id} ({name}, {area or 'без зоны'}, {score})")
+                return
+        _LOGGER.info(f"🔎 Не найдено устройство для '{request.voice_command}'")
+    
+    def _command_entities(self, request: pb.AlphaCommand) -> List[str]:
+        """Устройства, которые затрагивает команда (для групповой - раскрытая цель)"""
+        if request.entity_id:
+            return [request.entity_id]
+        if request.HasField("target"):
+            target = request.target
+            return list(self.registry_index.expand(
+                areas=target.areas,
+                floors=target.floors,
+                labels=target.labels,
+                device_classes=target.device_classes,
+                domains=target.domains
+            ))
+        return []
+    
+    def _publish_command_result(self, speaker_id: str, result: pb.CommandResponse):
+        """Отправка итога команды в поток результатов (или в буфер до подключения)"""
+        self.hass.bus.async_fire(
+            f"{self.event_prefix}command_result",
+            {
+                "speaker_id": speaker_id,
+                "event_id": result.event_id,
+                "entity_id": result.entity_id,
+                "success": result.success,
+                "result_state": result.result_state,
+                "message": result.message,
+                "timestamp": int(time.time() * 1000),
+                "integration_event": True
+            }
+        )
+        
+        queue = self.active_result_streams.get(speaker_id)
+        if queue is not None:
+            queue.put_nowait(result)
+        else:
+            self.pending_results.setdefault(
+                speaker_id, deque(maxlen=COMMAND_RESULT_BUFFER_SIZE)
+            ).append(result)
+    
+    async def _execute_command(self, request: pb.AlphaCommand, event_id: str) -> pb.CommandResponse:
+        """Выполнение одной команды: событие в HA и прямой вызов сервиса"""
+        speaker_id = request.speaker_id
         
         # Создаем событие команды в HA через интеграцию
         event_data = {
@@ -416,27 +768,44 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
             "parameters": dict(request.parameters),
             "voice_command": request.voice_command if request.voice_command else "",
             "timestamp": request.timestamp if request.timestamp else int(time.time() * 1000),
+            "event_id": event_id,
             "event_source": "alpha_private_speaker",
             "integration_event": True
         }
         
+        has_target = not request.entity_id and request.HasField("target")
+        if has_target:
+            event_data["target"] = {
+                "areas": list(request.target.areas),
+                "floors": list(request.target.floors),
+                "labels": list(request.target.labels),
+                "device_classes": list(request.target.device_classes),
+                "domains": list(request.target.domains)
+            }
+        
         self.hass.bus.async_fire(
             f"{self.event_prefix}command",
             event_data
         )
         
+        if has_target:
+            return await self._execute_group_command(request, event_id)
+        
         # Пытаемся выполнить команду напрямую через интеграцию
         result_state = None
         success = False
+        route = None
         
-        if request.command_type in ["turn_on", "turn_off", "toggle"]:
+        if request.entity_id:
             domain = request.entity_id.split('.')[0]
+            route = self.command_dispatcher.resolve(domain, request.command_type)
+        
+        if route:
             try:
-                await self.hass.services.async_call(
-                    domain,
-                    request.command_type,
-                    {"entity_id": request.entity_id, **dict(request.parameters)},
-                    blocking=True
+                await self.service_coalescer.async_call(
+                    route.domain,
+                    route.service,
+                    route.build_data(request.entity_id, dict(request.parameters))
                 )
                 success = True
                 
@@ -453,9 +822,68 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         
         return pb.CommandResponse(
             success=success,
-            event_id=f"cmd_{int(time.time())}",
+            event_id=event_id,
             result_state=result_state if result_state else "",
-            message=f"Команда '{request.command_type}' обработана"
+            message=f"Команда '{request.command_type}' обработана",
+            entity_id=request.entity_id
+        )
+    
+    async def _execute_group_command(self, request: pb.AlphaCommand, event_id: str) -> pb.CommandResponse:
+        """Групповая команда: раскрытие цели по индексу реестров и один вызов на домен"""
+        target = request.target
+        entity_ids = self.registry_index.expand(
+            areas=target.areas,
+            floors=target.floors,
+            labels=target.labels,
+            device_classes=target.device_classes,
+            domains=target.domains
+        )
+        
+        # Группируем по сервису: сущности доменов без такой команды пропускаются
+        calls: Dict[tuple, list] = {}
+        for entity_id in sorted(entity_ids):
+            route = self.command_dispatcher.resolve(entity_id.split('.')[0], request.command_type)
+            if route:
+                calls.setdefault((route.domain, route.service), [route, []])[1].append(entity_id)
+        
+        if not calls:
+            return pb.CommandResponse(
+                success=False,
+                event_id=event_id,
+                message=f"Нет устройств для команды '{request.command_type}' в указанной цели"
+            )
+        
+        parameters = dict(request.parameters)
+        
+        async def call_service(route, targets):
+            await self.service_coalescer.async_call(
+                route.domain,
+                route.service,
+                route.build_data(targets, parameters)
+            )
+        
+        outcomes = await asyncio.gather(
+            *(call_service(route, targets) for route, targets in calls.values()),
+            return_exceptions=True
+        )
+        
+        executed = []
+        errors = []
+        for (route, targets), outcome in zip(calls.values(), outcomes):
+            if isinstance(outcome, Exception):
+                _LOGGER.error(f"Ошибка вызова сервиса {route.domain}.{route.service}: {outcome}")
+                errors.append(f"{route.domain}: {outcome}")
+            else:
+                executed.extend(targets)
+        
+        _LOGGER.info(f"🎯 Групповая команда '{request.command_type}' выполнена для {len(executed)} устройств")
+        
+        return pb.CommandResponse(
+            success=not errors,
+            event_id=event_id,
+            message=f"Команда '{request.command_type}' обработана для {len(executed)} устройств"
+                    + (f"; ошибки: {'; '.join(errors)}" if errors else ""),
+            entity_ids=executed
         )
     
     async def GetAvailableDevices(self, request: pb.DeviceListRequest, context):
@@ -464,88 +892,112 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
         _LOGGER.info(f"📋 Запрос списка устройств от Альфы {speaker_id}")
         
         # Обновляем активность колонки
-        if speaker_id in self.connected_speakers:
-            await self.speaker_manager.update_speaker_activity(speaker_id)
-            self.connected_speakers[speaker_id]['last_activity'] = time.time()
+        await self._touch_speaker(speaker_id)
         
-        # Получаем все состояния через интеграцию
-        all_states = self.hass.states.async_all()
+        version = self.device_catalog.get_version(request.domains)
+        if request.if_none_match == version and not request.page_token:
+            return pb.DeviceList(version=version, not_modified=True)
         
-        devices = []
-        for state in all_states:
-            entity_id = state.entity_id
-            domain = entity_id.split('.')[0]
-            
-            # Фильтруем по доменам если указаны
-            if request.domains and domain not in request.domains:
-                continue
-            
-            # Определяем поддерживаемые команды на основе домена
-            supported_commands = []
-            if domain == "light":
-                supported_commands = ["turn_on", "turn_off", "toggle", "set_brightness"]
-            elif domain == "switch":
-                supported_commands = ["turn_on", "turn_off", "toggle"]
-            elif domain == "climate":
-                supported_commands = ["set_temperature", "set_mode"]
-            elif domain == "media_player":
-                supported_commands = ["play", "pause", "stop", "volume_set", "volume_up", "volume_down"]
-            elif domain == "cover":
-                supported_commands = ["open_cover", "close_cover", "stop_cover"]
-            elif domain == "fan":
-                supported_commands = ["turn_on", "turn_off", "set_speed"]
-            elif domain == "scene":
-                supported_commands = ["turn_on"]
-            elif domain == "script":
-                supported_commands = ["turn_on"]
-            
-            # Convert attributes to dict
-            attrs = {}
-            for key, value in state.attributes.items():
-                if isinstance(value, (str, int, float, bool, list, dict)):
-                    attrs[key] = value
-                else:
-                    attrs[key] = str(value)
-            
-            devices.append(pb.DeviceInfo(
-                entity_id=entity_id,
-                friendly_name=state.attributes.get('friendly_name', entity_id),
-                domain=domain,
-                current_state=state.state,
-                supported_commands=supported_commands
-            ))
+        # Без page_size - весь список одним сообщением
+        if not request.page_size:
+            return self.device_catalog.get_list(request.domains)
         
+        # Постраничная выдача: курсор - последний entity_id предыдущей страницы
+        devices, next_page_token = self.device_catalog.get_page(
+            request.domains, request.page_token, _page_size(request.page_size)
+        )
         return pb.DeviceList(
             devices=devices,
-            total_count=len(devices)
+            total_count=self.device_catalog.count(request.domains),
+            version=version,
+            next_page_token=next_page_token
+        )
+    
+    async def StreamAvailableDevices(self, request: pb.DeviceListRequest, context) -> AsyncIterator[pb.DeviceList]:
+        """Потоковая выдача списка устройств частями по page_size"""
+        speaker_id = request.speaker_id
+        _LOGGER.info(f"📋 Потоковый запрос списка устройств от Альфы {speaker_id}")
+        
+        # Обновляем активность колонки
+        await self._touch_speaker(speaker_id)
+        
+        version = self.device_catalog.get_version(request.domains)
+        if request.if_none_match == version and not request.page_token:
+            yield pb.DeviceList(version=version, not_modified=True)
+            return
+        
+        page_size = _page_size(request.page_size)
+        cursor = request.page_token
+        while True:
+            # Каждая часть собирается только перед отправкой - память не зависит от числа устройств
+            devices, cursor = self.device_catalog.get_page(request.domains, cursor, page_size)
+            yield pb.DeviceList(
+                devices=devices,
+                total_count=self.device_catalog.count(request.domains),
+                version=self.device_catalog.get_version(request.domains),
+                next_page_token=cursor
+            )
+            if not cursor:
+                break
+    
+    async def GetAvailableDevicesSince(self, request: pb.DeviceDeltaRequest, context):
+        """Изменения списка устройств с версии, которая уже есть у колонки"""
+        speaker_id = request.speaker_id
+        
+        # Обновляем активность колонки
+        await self._touch_speaker(speaker_id)
+        
+        # Общая версия каталога: с ней следующий запрос не упрется в устаревшую версию домена
+        version = self.device_catalog.version
+        changes = self.device_catalog.get_changes(request.since_version, request.domains)
+        
+        if changes is None:
+            # Журнал уже не покрывает эту версию (или она из прошлого запуска)
+            _LOGGER.info(f"📋 Полная синхронизация списка устройств для Альфы {speaker_id}")
+            return pb.DeviceDelta(
+                version=version,
+                full_sync=True,
+                added=self.device_catalog.get_list(request.domains).devices
+            )
+        
+        added, changed, removed = changes
+        _LOGGER.debug(f"📋 Изменения для Альфы {speaker_id}: +{len(added)} ~{len(changed)} -{len(removed)}")
+        return pb.DeviceDelta(version=version, added=added, changed=changed, removed=removed)
+    
+    async def ResolveEntities(self, request: pb.EntityResolveRequest, context):
+        """Поиск устройств по фразе пользователя"""
+        limit = max(1, min(request.limit or DEFAULT_RESOLVE_LIMIT, MAX_RESOLVE_LIMIT))
+        candidates = self.entity_resolver.resolve(request.utterance, limit, request.domains)
+        
+        return pb.EntityResolveResponse(
+            candidates=[
+                pb.EntityCandidate(entity_id=entity_id, name=name, area=area or "", score=score)
+                for entity_id, name, area, score in candidates
+            ]
         )
     
     async def KeepAlive(self, request: pb.PingRequest, context):
         """Проверка связи с Альфой через интеграцию"""
         speaker_id = request.speaker_id
-        is_alive = speaker_id in self.connected_speakers
+        speaker = await self.speaker_manager.get_speaker(speaker_id)
+        is_alive = speaker is not None and speaker.online
         
         if is_alive:
+            # Время прошлой активности - до отметки текущего пинга
+            last_seen = speaker.last_seen
+            
             # Обновляем активность колонки
-            await self.speaker_manager.update_speaker_activity(speaker_id)
-            self.connected_speakers[speaker_id]['last_activity'] = time.time()
+            await self._touch_speaker(speaker_id)
             
-            # Получаем информацию о колонке
-            speaker = await self.speaker_manager.get_speaker(speaker_id)
-            if speaker:
-                connected_time = int(time.time() - speaker.connected_at)
-                uptime_str = f"{connected_time // 3600}ч {(connected_time % 3600) // 60}м {connected_time % 60}с"
-                
-                # Проверяем активность
-                last_seen = self.connected_speakers[speaker_id]['last_activity']
-                current_time = time.time()
-                
-                if current_time - last_seen > 300:  # 5 минут
-                    status_msg = f"Колонка активна (uptime: {uptime_str}), но давно не проявляла активность"
-                else:
-                    status_msg = f"Колонка активна и работает нормально (uptime: {uptime_str})"
+            current_time = time.time()
+            connected_time = int(current_time - speaker.connected_at)
+            uptime_str = f"{connected_time // 3600}ч {(connected_time % 3600) // 60}м {connected_time % 60}с"
+            
+            # Проверяем активность
+            if current_time - last_seen > self.expiry.inactive_after:
+                status_msg = f"Колонка активна (uptime: {uptime_str}), но давно не проявляла активность"
             else:
-                status_msg = "Колонка активна"
+                status_msg = f"Колонка активна и работает нормально (uptime: {uptime_str})"
         else:
             status_msg = "Колонка не зарегистрирована"
         
@@ -557,39 +1009,77 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
     
     async def send_tts_to_speaker(self, speaker_id: str, text: str, language: str = "ru", 
                                  voice: str = "default", volume: int = 80, priority: bool = False) -> bool:
-        """Публичный метод для отправки TTS на колонку из HA через интеграцию"""
+        """Публичный метод для отправки TTS на колонку из HA через интеграцию
+
+        Длинный текст режется на предложения и отправляется фрагментами с общим
+        message_id: следующий фрагмент уходит только после подтверждения
+        предыдущего, поэтому колонка начинает говорить сразу, а приоритетное
+        сообщение (без блокировки) может вклиниться между фрагментами.
+        """
         if speaker_id not in self.active_tts_streams:
             _LOGGER.error(f"❌ Колонка {speaker_id} не подключена к потоку TTS. Активные потоки: {list(self.active_tts_streams.keys())}")
             return False
         
+        requested_at = time.monotonic()
+        
         try:
             message_id = f"tts_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+            chunks = split_tts_text(text, self.tts_chunk_max_chars)
+            if not chunks:
+                _LOGGER.warning(f"⚠ Пустой текст TTS для колонки {speaker_id}")
+                return False
+            
+            # Обычные сообщения идут по очереди, приоритетные - без ожидания
+            lock = self.tts_locks.setdefault(speaker_id, asyncio.Lock())
+            if priority:
+                return await self._send_tts_chunks(speaker_id, message_id, chunks, language, voice, volume,
+                                                   priority, requested_at)
+            async with lock:
+                return await self._send_tts_chunks(speaker_id, message_id, chunks, language, voice, volume,
+                                                   priority, requested_at)
+                
+        except Exception as e:
+            _LOGGER.error(f"❌ Ошибка отправки TTS на колонку {speaker_id}: {e}", exc_info=True)
+            return False
+    
+    async def _send_tts_chunks(self, speaker_id: str, message_id: str, chunks: List[str], language: str,
+                               voice: str, volume: int, priority: bool, requested_at: float) -> bool:
+        """Последовательная отправка фрагментов одного сообщения с подтверждением каждого"""
+        chunk_count = len(chunks)
+        
+        for chunk_index, chunk in enumerate(chunks):
+            # Получаем очередь для этого динамика (поток мог переподключиться)
+            queue = self.active_tts_streams.get(speaker_id)
+            if not queue:
+                _LOGGER.error(f"❌ Очередь для колонки {speaker_id} не найдена")
+                return False
             
             # Создаем TTS команду
             tts_request = pb.SpeakTextRequest(
                 speaker_id=speaker_id,
-                text=text,
+                text=chunk,
                 language=language,
                 voice=voice,
                 volume=volume,
                 priority=priority,
                 message_id=message_id,
-                timestamp=int(time.time() * 1000)
+                timestamp=int(time.time() * 1000),
+                chunk_index=chunk_index,
+                chunk_count=chunk_count
             )
             
-            # Создаем Future для ожидания ответа
+            # Создаем Future для ожидания ответа на этот фрагмент
             future = asyncio.Future()
-            self.tts_responses[message_id] = future
+            response_key = (message_id, chunk_index)
+            self.tts_responses[response_key] = future
             
-            # Получаем очередь для этого динамика
-            queue = self.active_tts_streams.get(speaker_id)
-            if not queue:
-                _LOGGER.error(f"❌ Очередь для колонки {speaker_id} не найдена")
-                return False
+            # Первый фрагмент учитывает ожидание с момента вызова сервиса
+            self.tts_latency.start(speaker_id, message_id, requested_at if chunk_index == 0 else None, chunk_index)
             
             # Отправляем команду в очередь
-            _LOGGER.debug(f"Отправка TTS в очередь для колонки {speaker_id}")
+            _LOGGER.debug(f"Отправка TTS в очередь для колонки {speaker_id} (фрагмент {chunk_index + 1}/{chunk_count})")
             try:
+                self.tts_latency.mark(message_id, STAGE_ENQUEUED)
                 await queue.put(tts_request)
             except Exception as e:
                 _LOGGER.error(f"❌ Ошибка при отправке в очередь для колонки {speaker_id}: {e}")
@@ -597,88 +1087,116 @@ class AlphaSpeakerService(pb_grpc.AlphaSpeakerServiceServicer):
                 if speaker_id in self.active_tts_streams and self.active_tts_streams[speaker_id] is queue:
                     del self.active_tts_streams[speaker_id]
                 # Удаляем future из ожидающих
-                if message_id in self.tts_responses:
-                    del self.tts_responses[message_id]
+                self.tts_responses.pop(response_key, None)
+                self.tts_latency.discard(message_id)
                 return False
             
-            # Создаем событие в HA об отправке TTS через интеграцию
-            self.hass.bus.async_fire(
-                f"{self.event_prefix}tts_command_sent",
-                {
-                    "speaker_id": speaker_id,
-                    "text": text,
-                    "language": language,
-                    "volume": volume,
-                    "message_id": message_id,
-                    "timestamp": tts_request.timestamp,
-                    "integration_event": True
-                }
-            )
-            
-            _LOGGER.info(f"✅ TTS команда отправлена колонке {speaker_id}: '{text[:50]}...'")
+            if chunk_index == 0:
+                # Создаем событие в HA об отправке TTS через интеграцию
+                self.hass.bus.async_fire(
+                    f"{self.event_prefix}tts_command_sent",
+                    {
+                        "speaker_id": speaker_id,
+                        "text": " ".join(chunks),
+                        "language": language,
+                        "volume": volume,
+                        "message_id": message_id,
+                        "chunk_count": chunk_count,
+                        "timestamp": tts_request.timestamp,
+                        "integration_event": True
+                    }
+                )
+                
+                _LOGGER.info(f"✅ TTS команда отправлена колонке {speaker_id}: '{chunks[0][:50]}...' (фрагментов: {chunk_count})")
             
-            # Ждем ответа (таймаут 30 секунд)
+            # Ждем ответа на фрагмент
             try:
-                response = await asyncio.wait_for(future, timeout=30.0)
-                success = response.get('success', False)
-                if success:
-                    _LOGGER.info(f"✅ TTS выполнен колонкой {speaker_id}: успешно")
-                    return True
-                else:
-                    _LOGGER.warning(f"⚠ Колонка {speaker_id} сообщила об ошибке выполнения TTS: {response.get('message', 'No message')}")
-                    return False
+                response = await asyncio.wait_for(future, timeout=TTS_RESPONSE_TIMEOUT)
             except asyncio.TimeoutError:
-                _LOGGER.warning(f"⚠ Таймаут ожидания TTS ответа от колонки {speaker_id}")
-                if message_id in self.tts_responses:
-                    del self.tts_responses[message_id]
+                _LOGGER.warning(f"⚠ Таймаут ожидания TTS ответа от колонки {speaker_id} (фрагмент {chunk_index + 1}/{chunk_count})")
+                self.tts_responses.pop(response_key, None)
+                self.tts_latency.discard(message_id)
                 return False
-                
-        except Exception as e:
-            _LOGGER.error(f"❌ Ошибка отправки TTS на колонку {speaker_id}: {e}", exc_info=True)
-            return False
+            
+            if not response.get('success', False):
+                _LOGGER.warning(f"⚠ Колонка {speaker_id} сообщила об ошибке выполнения TTS: {response.get('message', 'No message')}")
+                return False
+        
+        _LOGGER.info(f"✅ TTS выполнен колонкой {speaker_id}: успешно")
+        return True
     
-    async def _cleanup_inactive_speakers(self):
-        """Очистка неактивных колонок через интеграцию"""
-        while self.running:
-            try:
-                await asyncio.sleep(60)  # Проверяем каждую минуту
-                
-                current_time = time.time()
-                to_remove = []
-                
-                for speaker_id, speaker_info in self.connected_speakers.items():
-                    # Удаляем колонки неактивные более 1 часа
-                    if current_time - speaker_info['last_activity'] > 3600:
-                        to_remove.append(speaker_id)
-                        
-                        # Закрываем активные потоки
-                        if speaker_id in self.active_tts_streams:
-                            del self.active_tts_streams[speaker_id]
-                        
-                        # Отправляем событие отключения через интеграцию
-                        self.hass.bus.async_fire(
-                            f"{self.event_prefix}disconnected",
-                            {
-                                "speaker_id": speaker_id,
-                                "speaker_name": speaker_info['name'],
-                                "reason": "inactivity_timeout",
-                                "timestamp": int(current_time * 1000),
-                                "integration_event": True
-                            }
-                        )
-                
-                for speaker_id in to_remove:
-                    if speaker_id in self.connected_speakers:
-                        del self.connected_speakers[speaker_id]
-                        _LOGGER.info(f"🗑️ Удалена неактивная колонка: {speaker_id}")
-                        
-            except Exception as e:
-                _LOGGER.error(f"❌ Ошибка в cleanup task: {e}")
-                await asyncio.sleep(10)
+    async def _touch_speaker(self, speaker_id: str):
+        """Отметка активности колонки: одна запись в реестре сессий и таймеры неактивности"""
+        speaker = self.speaker_manager.touch(speaker_id, online_only=True)
+        if speaker is not None:
+            self.expiry.touch(speaker_id, speaker.last_seen)
+    
+    def _on_speaker_inactive(self, speaker_id: str):
+        """Колонка молчит дольше порога неактивности"""
+        speaker = self.speaker_manager.speakers.get(speaker_id)
+        if speaker is None or not speaker.online:
+            return
+        self.speaker_manager.mark_idle(speaker_id)
+        
+        _LOGGER.info(f"💤 Колонка {speaker_id} неактивна более {int(self.expiry.inactive_after)} с")
+        self.hass.bus.async_fire(
+            f"{self.event_prefix}inactive",
+            {
+                "speaker_id": speaker_id,
+                "speaker_name": speaker.name,
+                "last_activity": int(speaker.last_seen * 1000),
+                "timestamp": int(time.time() * 1000),
+                "integration_event": True
+            }
+        )
+    
+    def _on_speaker_evicted(self, speaker_id: str):
+        """Колонка молчит дольше порога удаления - закрываем сессию"""
+        if self._end_session(speaker_id, "inactivity_timeout"):
+            _LOGGER.info(f"🗑️ Удалена неактивная колонка: {speaker_id}")
+    
+    def _close_stream(self, speaker_id: str, stream_id: str, context):
+        """Отсоединение потока; с последним потоком сессии колонка освобождает место"""
+        if self.speaker_manager.close_stream(speaker_id, stream_id, context):
+            if self._end_session(speaker_id, "streams_closed"):
+                _LOGGER.info(f"🔌 Все потоки колонки {speaker_id} закрыты, сессия завершена")
+    
+    def _end_session(self, speaker_id: str, reason: str) -> bool:
+        """Закрытие сессии: освобождаем место, лимиты и таймеры, сообщаем об отключении"""
+        speaker = self.speaker_manager.end_session(speaker_id)
+        self.rate_limiter.remove(speaker_id)
+        self.expiry.remove(speaker_id)
+        if speaker is None:
+            return False
+        
+        # Закрываем активные потоки
+        if speaker_id in self.active_tts_streams:
+            del self.active_tts_streams[speaker_id]
+        # Блокировку очереди TTS убираем, если ее никто не держит
+        lock = self.tts_locks.get(speaker_id)
+        if lock is not None and not lock.locked():
+            del self.tts_locks[speaker_id]
+        
+        # Отправляем событие отключения через интеграцию
+        self.hass.bus.async_fire(
+            f"{self.event_prefix}disconnected",
+            {
+                "speaker_id": speaker_id,
+                "speaker_name": speaker.name,
+                "reason": reason,
+                "timestamp": int(time.time() * 1000),
+                "integration_event": True
+            }
+        )
+        return True
     
     async def stop(self):
         """Остановка сервиса."""
         self.running = False
+        self.expiry.stop()
+        self.call_scheduler.stop()
+        for task in list(self.command_tasks):
+            task.cancel()
         _LOGGER.info("Остановка AlphaSpeakerService...")
 
 
@@ -686,15 +1204,19 @@ class AlphaSpeakerServer:
     """Управление gRPC сервером для интеграции Home Assistant"""
     
     def __init__(self, hass: HomeAssistant, port: int, event_prefix: str = "alpha_speaker_", 
-                 max_speakers: int = 10, speaker_manager=None):
+                 max_speakers: int = DEFAULT_MAX_SPEAKERS, speaker_manager=None,
+                 coalesce_window_ms: int = DEFAULT_COALESCE_WINDOW_MS,
+                 inactive_timeout: int = DEFAULT_INACTIVE_TIMEOUT, evict_timeout: int = DEFAULT_EVICT_TIMEOUT):
         self.hass = hass
         self.port = port
         self.event_prefix = event_prefix
         self.max_speakers = max_speakers
+        self.coalesce_window_ms = coalesce_window_ms
+        self.inactive_timeout = inactive_timeout
+        self.evict_timeout = evict_timeout
         
         self.speaker_manager = speaker_manager
         self.server = None
-        self.cleanup_task = None
         self.servicer = None
     
     async def start(self):
@@ -712,18 +1234,23 @@ class AlphaSpeakerServer:
                 ('grpc.keepalive_timeout_ms', 5000),
                 ('grpc.http2.max_ping_strikes', 0),
             ],
-            maximum_concurrent_rpcs=100
+            # Каждая колонка держит несколько долгих потоков; запас - для отказов и пингов
+            maximum_concurrent_rpcs=self.max_speakers * RPCS_PER_SPEAKER + RPC_HEADROOM
         )
         
-        self.servicer = AlphaSpeakerService(self.hass, self.speaker_manager, self.event_prefix)
+        self.servicer = AlphaSpeakerService(
+            self.hass, self.speaker_manager, self.event_prefix, self.coalesce_window_ms,
+            self.inactive_timeout, self.evict_timeout, self.max_speakers
+        )
+        self.servicer.command_dispatcher.start()
+        self.servicer.registry_index.start()
+        self.servicer.entity_resolver.start()
+        self.servicer.device_catalog.start()
         pb_grpc.add_AlphaSpeakerServiceServicer_to_server(self.servicer, self.server)
         
         self.server.add_insecure_port(f'[::]:{self.port}')
         await self.server.start()
         
-        # Запускаем задачу очистки неактивных колонок
-        self.cleanup_task = asyncio.create_task(self.servicer._cleanup_inactive_speakers())
-        
         _LOGGER.info(f"✅ Сервер Альфы запущен (интеграция)")
         _LOGGER.info(f"📍 Порт: {self.port}")
         _LOGGER.info(f"📍 Префикс событий: {self.event_prefix}")
@@ -735,14 +1262,11 @@ class AlphaSpeakerServer:
         """Остановка сервера для интеграции"""
         _LOGGER.info("🛑 Остановка Alpha Speaker Server (интеграция)...")
         
-        if self.cleanup_task:
-            self.cleanup_task.cancel()
-            try:
-                await self.cleanup_task
-            except asyncio.CancelledError:
-                pass
-        
         if self.servicer:
+            self.servicer.command_dispatcher.stop()
+            self.servicer.registry_index.stop()
+            self.servicer.entity_resolver.stop()
+            self.servicer.device_catalog.stop()
             await self.servicer.stop()
         
         if self.server:
@@ -750,6 +1274,16 @@ class AlphaSpeakerServer:
         
         _LOGGER.info("✅ Alpha Speaker Server остановлен")
     
+    def has_tts_stream(self, speaker_id: str) -> bool:
+        """Подключен ли поток TTS команд колонки"""
+        return bool(self.servicer) and speaker_id in self.servicer.active_tts_streams
+    
+    def get_tts_latency_stats(self, speaker_id: str) -> Dict[str, Any]:
+        """Статистика задержек TTS (p50/p95/p99) для колонки"""
+        if not self.servicer:
+            return {}
+        return self.servicer.tts_latency.get_speaker_stats(speaker_id)
+    
     async def send_tts_to_speaker(self, speaker_id: str, text: str, language: str = "ru", 
                                  voice: str = "default", volume: int = 80, priority: bool = False) -> bool:
         """Публичный метод для отправки TTS на колонку"""
@@ -0,0 +1,150 @@
+"""
+TTS latency instrumentation for Alpha Private Speaker
+"""
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+
+from .const import DEFAULT_LATENCY_WINDOW
+
+# Этапы доставки TTS сообщения (фрагмента) в порядке прохождения
+STAGE_REQUESTED = "requested"  # Вызов сервиса / send_tts_to_speaker
+STAGE_ENQUEUED = "enqueued"    # Помещено в очередь active_tts_streams
+STAGE_DEQUEUED = "dequeued"    # Извлечено из очереди в StreamTTSCommands
+STAGE_SENT = "sent"            # yield вернул управление - сообщение отдано gRPC
+STAGE_ACKED = "acked"          # Получен SendTTSResponse от колонки
+
+# Метрики: имя -> (начальный этап, конечный этап)
+METRICS = {
+    "queue_wait": (STAGE_ENQUEUED, STAGE_DEQUEUED),
+    "delivery": (STAGE_DEQUEUED, STAGE_SENT),
+    "playback": (STAGE_SENT, STAGE_ACKED),
+    "total": (STAGE_REQUESTED, STAGE_ACKED),
+}
+
+MAX_PENDING = 1000
+RECENT_SIZE = 50
+
+
+class LatencyWindow:
+    """Rolling window of latency samples in milliseconds"""
+
+    def __init__(self, size: int = DEFAULT_LATENCY_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, value_ms: float):
+        """Add a sample, dropping the oldest one when the window is full"""
+        self.samples.append(value_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get p50/p95/p99 over the window"""
+        if not self.samples:
+            return {"count": 0, "p50": None, "p95": None, "p99": None, "max": None}
+
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(last, int(round(p * last)))], 1)
+
+        return {
+            "count": len(ordered),
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(ordered[-1], 1),
+        }
+
+
+class TTSLatencyTracker:
+    """Per message_id stage timestamps and per speaker latency histograms"""
+
+    def __init__(self, window_size: int = DEFAULT_LATENCY_WINDOW):
+        self.window_size = window_size
+        self.pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.windows: Dict[str, Dict[str, LatencyWindow]] = {}
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=RECENT_SIZE)
+
+    def start(self, speaker_id: str, message_id: str, requested_at: Optional[float] = None,
+              chunk_index: int = 0):
+        """Start tracking a message (or the next chunk of it)"""
+        self.pending[message_id] = {
+            "speaker_id": speaker_id,
+            "message_id": message_id,
+            "chunk_index": chunk_index,
+            "started_at": time.time(),
+            STAGE_REQUESTED: requested_at if requested_at is not None else time.monotonic(),
+        }
+        self.pending.move_to_end(message_id)
+
+        # Сообщения без ответа не должны копиться бесконечно
+        while len(self.pending) > MAX_PENDING:
+            self.pending.popitem(last=False)
+
+    def mark(self, message_id: str, stage: str):
+        """Record a stage timestamp, ignoring untracked messages (keep-alive)"""
+        record = self.pending.get(message_id)
+        if record is not None and stage not in record:
+            record[stage] = time.monotonic()
+
+    def finish(self, message_id: str, success: bool = True) -> Optional[Dict[str, Any]]:
+        """Close the record on acknowledgement and feed the histograms"""
+        record = self.pending.pop(message_id, None)
+        if record is None:
+            return None
+
+        record.setdefault(STAGE_ACKED, time.monotonic())
+        speaker_windows = self.windows.setdefault(record["speaker_id"], {})
+
+        durations = {}
+        for metric, (begin, end) in METRICS.items():
+            if begin in record and end in record:
+                value_ms = (record[end] - record[begin]) * 1000
+                durations[metric] = round(value_ms, 1)
+                if success:
+                    speaker_windows.setdefault(metric, LatencyWindow(self.window_size)).add(value_ms)
+
+        self.recent.append({
+            "speaker_id": record["speaker_id"],
+            "message_id": message_id,
+            "chunk_index": record["chunk_index"],
+            "started_at": record["started_at"],
+            "success": success,
+            **durations,
+        })
+        return durations
+
+    def discard(self, message_id: str):
+        """Forget a message that will never be acknowledged"""
+        self.pending.pop(message_id, None)
+
+    def get_speaker_stats(self, speaker_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get latency summary for one speaker"""
+        speaker_windows = self.windows.get(speaker_id, {})
+        return {
+            metric: speaker_windows[metric].summary() if metric in speaker_windows else LatencyWindow(1).summary()
+            for metric in METRICS
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Full dump for diagnostics"""
+        now = time.monotonic()
+        return {
+            "window_size": self.window_size,
+            "speakers": {
+                speaker_id: self.get_speaker_stats(speaker_id)
+                for speaker_id in self.windows
+            },
+            "pending": [
+                {
+                    "speaker_id": record["speaker_id"],
+                    "message_id": record["message_id"],
+                    "chunk_index": record["chunk_index"],
+                    "stages": [stage for stage in (STAGE_REQUESTED, STAGE_ENQUEUED, STAGE_DEQUEUED, STAGE_SENT)
+                               if stage in record],
+                    "age_ms": round((now - record[STAGE_REQUESTED]) * 1000, 1),
+                }
+                for record in self.pending.values()
+            ],
+            "recent": list(self.recent),
+        }
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 from typing import Any
 
 from homeassistant.components.media_player import (
@@ -20,11 +21,16 @@ from .const import (
     DOMAIN,
     ICON_SPEAKER,
     EVENT_SPEAKER_CONNECTED,
-    EVENT_SPEAKER_DISCONNECTED
+    EVENT_SPEAKER_DISCONNECTED,
+    ENTITY_REFRESH_INTERVAL
 )
+from .speaker_manager import speaker_signal
 
 _LOGGER = logging.getLogger(__name__)
 
+# Переходы сессий приходят сигналами, опрос только освежает last_seen
+SCAN_INTERVAL = timedelta(seconds=ENTITY_REFRESH_INTERVAL)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -70,7 +76,7 @@ async def async_setup_entry(
         
         # Check if we already have an entity for this speaker
         for entity in media_players:
-            if entity.speaker_id == speaker_id:
+            if entity._speaker_id == speaker_id:
                 _LOGGER.debug(f"Media player for speaker {speaker_id} already exists")
                 return
         
@@ -88,21 +94,9 @@ async def async_setup_entry(
         # Run in the background
         hass.async_create_task(async_create_entity())
     
-    @callback
-    def handle_speaker_disconnected(event):
-        """Handle speaker disconnected event."""
-        speaker_id = event.data.get("speaker_id")
-        
-        # Find the entity for this speaker and mark it as unavailable
-        for entity in media_players:
-            if entity.speaker_id == speaker_id:
-                entity.set_unavailable()
-                break
-    
-    # Listen for speaker connected/disconnected events
+    # Listen for new speakers (existing ones are updated via dispatcher signals)
     event_prefix = data.get("config", {}).get("event_prefix", "alpha_speaker_")
     hass.bus.async_listen(f"{event_prefix}connected", handle_speaker_connected)
-    hass.bus.async_listen(f"{event_prefix}disconnected", handle_speaker_disconnected)
 
 
 class AlphaSpeakerMediaPlayer(MediaPlayerEntity):
@@ -164,21 +158,24 @@ class AlphaSpeakerMediaPlayer(MediaPlayerEntity):
         # Update state based on speaker activity
         self._update_state()
     
-    def set_unavailable(self):
-        """Mark the media player as unavailable."""
-        self._attr_state = MediaPlayerState.OFF
-        self._attr_extra_state_attributes["available"] = False
-        self.async_write_ha_state()
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to session transitions of the speaker."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, speaker_signal(self.entry.entry_id, self._speaker_id), self._handle_speaker_update
+            )
+        )
+    
+    @callback
+    def _handle_speaker_update(self) -> None:
+        """Refresh on connect, resume, idle, wake-up or disconnect."""
+        self.async_schedule_update_ha_state(True)
     
     def _update_state(self):
-        """Update state based on speaker activity."""
-        import time
-        current_time = time.time()
-        
+        """Update state based on the speaker session."""
         if self.speaker_manager:
-            # Check if speaker is active (last seen within 5 minutes)
-            last_seen = getattr(self.speaker, 'last_seen', 0)
-            is_active = (current_time - last_seen) < 300
+            # Active while the session is open and the speaker is not idle
+            is_active = self.speaker.online and not self.speaker.idle
             
             if is_active:
                 if self._attr_state == MediaPlayerState.OFF:
@@ -202,8 +199,7 @@ class AlphaSpeakerMediaPlayer(MediaPlayerEntity):
                     self._attr_extra_state_attributes.update({
                         "last_seen": speaker.last_seen,
                         "connected_at": speaker.connected_at,
-                        "address": speaker.address,
-                        "available": True
+                        "address": speaker.address
                     })
                 else:
                     self._attr_state = MediaPlayerState.OFF
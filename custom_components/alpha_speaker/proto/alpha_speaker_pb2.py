@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x61lpha_speaker.proto\x12\ralpha_speaker\"\xfa\x01\n\x13SpeakerRegistration\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x14\n\x0cspeaker_name\x18\x02 \x01(\t\x12\x14\n\x0cspeaker_type\x18\x03 \x01(\t\x12\x18\n\x10\x66irmware_version\x18\x04 \x01(\t\x12\x14\n\x0c\x63\x61pabilities\x18\x05 \x03(\t\x12\x42\n\x08settings\x18\x06 \x03(\x0b\x32\x30.alpha_speaker.SpeakerRegistration.SettingsEntry\x1a/\n\rSettingsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xed\x01\n\x14RegistrationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0eserver_version\x18\x03 \x01(\t\x12\x12\n\nsession_id\x18\x04 \x01(\t\x12P\n\x0fserver_settings\x18\x05 \x03(\x0b\x32\x37.alpha_speaker.RegistrationResponse.ServerSettingsEntry\x1a\x35\n\x13ServerSettingsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\\\n\x12StateStreamRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x16\n\x0e\x65ntity_filters\x18\x02 \x03(\t\x12\x1a\n\x12send_initial_state\x18\x03 \x01(\x08\"\xf5\x01\n\x0b\x44\x65viceState\x12\x11\n\tentity_id\x18\x01 \x01(\t\x12\r\n\x05state\x18\x02 \x01(\t\x12>\n\nattributes\x18\x03 \x03(\x0b\x32*.alpha_speaker.DeviceState.AttributesEntry\x12\x15\n\rfriendly_name\x18\x04 \x01(\t\x12\x0e\n\x06\x64omain\x18\x05 \x01(\t\x12\x14\n\x0clast_changed\x18\x06 \x01(\x03\x12\x14\n\x0clast_updated\x18\x07 \x01(\x03\x1a\x31\n\x0f\x41ttributesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"q\n\nTTSRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\r\n\x05voice\x18\x04 \x01(\t\x12\x0e\n\x06volume\x18\x05 \x01(\x05\x12\x10\n\x08priority\x18\x06 \x01(\x08\"E\n\x0bTTSResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nmessage_id\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\x03\"\x9e\x01\n\x10SpeakTextRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\r\n\x05voice\x18\x04 \x01(\t\x12\x0e\n\x06volume\x18\x05 \x01(\x05\x12\x10\n\x08priority\x18\x06 \x01(\x08\x12\x12\n\nmessage_id\x18\x07 \x01(\t\x12\x11\n\ttimestamp\x18\x08 \x01(\x03\"p\n\x11SpeakTextResponse\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x12\n\nmessage_id\x18\x04 \x01(\t\x12\x11\n\ttimestamp\x18\x05 \x01(\x03\"\xe9\x01\n\x0c\x41lphaCommand\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x14\n\x0c\x63ommand_type\x18\x02 \x01(\t\x12\x11\n\tentity_id\x18\x03 \x01(\t\x12?\n\nparameters\x18\x04 \x03(\x0b\x32+.alpha_speaker.AlphaCommand.ParametersEntry\x12\x15\n\rvoice_command\x18\x05 \x01(\t\x12\x11\n\ttimestamp\x18\x06 \x01(\x03\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"[\n\x0f\x43ommandResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\t\x12\x14\n\x0cresult_state\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\"8\n\x11\x44\x65viceListRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0f\n\x07\x64omains\x18\x02 \x03(\t\"M\n\nDeviceList\x12*\n\x07\x64\x65vices\x18\x01 \x03(\x0b\x32\x19.alpha_speaker.DeviceInfo\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\"y\n\nDeviceInfo\x12\x11\n\tentity_id\x18\x01 \x01(\t\x12\x15\n\rfriendly_name\x18\x02 \x01(\t\x12\x0e\n\x06\x64omain\x18\x03 \x01(\t\x12\x15\n\rcurrent_state\x18\x04 \x01(\t\x12\x1a\n\x12supported_commands\x18\x05 \x03(\t\"!\n\x0bPingRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\"J\n\x0cPingResponse\x12\r\n\x05\x61live\x18\x01 \x01(\x08\x12\x13\n\x0bserver_time\x18\x02 \x01(\x03\x12\x16\n\x0estatus_message\x18\x03 \x01(\t*\x8a\x01\n\x0e\x41lphaEventType\x12\x15\n\x11SPEAKER_CONNECTED\x10\x00\x12\x18\n\x14SPEAKER_DISCONNECTED\x10\x01\x12\x1a\n\x16VOICE_COMMAND_RECEIVED\x10\x02\x12\x11\n\rTTS_REQUESTED\x10\x03\x12\x18\n\x14\x44\x45VICE_STATE_CHANGED\x10\x04\x32\xb0\x05\n\x13\x41lphaSpeakerService\x12_\n\x14RegisterAlphaSpeaker\x12\".alpha_speaker.SpeakerRegistration\x1a#.alpha_speaker.RegistrationResponse\x12U\n\x12StreamDeviceStates\x12!.alpha_speaker.StateStreamRequest\x1a\x1a.alpha_speaker.DeviceState0\x01\x12J\n\x11SendTextForSpeech\x12\x19.alpha_speaker.TTSRequest\x1a\x1a.alpha_speaker.TTSResponse\x12Y\n\x11StreamTTSCommands\x12!.alpha_speaker.StateStreamRequest\x1a\x1f.alpha_speaker.SpeakTextRequest0\x01\x12O\n\x0fSendTTSResponse\x12 .alpha_speaker.SpeakTextResponse\x1a\x1a.alpha_speaker.TTSResponse\x12O\n\x10SendAlphaCommand\x12\x1b.alpha_speaker.AlphaCommand\x1a\x1e.alpha_speaker.CommandResponse\x12\x44\n\tKeepAlive\x12\x1a.alpha_speaker.PingRequest\x1a\x1b.alpha_speaker.PingResponse\x12R\n\x13GetAvailableDevices\x12 .alpha_speaker.DeviceListRequest\x1a\x19.alpha_speaker.DeviceListb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x13\x61lpha_speaker.proto\x12\ralpha_speaker\"\xab\x02\n\x13SpeakerRegistration\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x14\n\x0cspeaker_name\x18\x02 \x01(\t\x12\x14\n\x0cspeaker_type\x18\x03 \x01(\t\x12\x18\n\x10\x66irmware_version\x18\x04 \x01(\t\x12\x14\n\x0c\x63\x61pabilities\x18\x05 \x03(\t\x12\x42\n\x08settings\x18\x06 \x03(\x0b\x32\x30.alpha_speaker.SpeakerRegistration.SettingsEntry\x12\x19\n\x11resume_session_id\x18\x07 \x01(\t\x12\x14\n\x0cresume_token\x18\x08 \x01(\t\x1a/\n\rSettingsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x94\x02\n\x14RegistrationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0eserver_version\x18\x03 \x01(\t\x12\x12\n\nsession_id\x18\x04 \x01(\t\x12P\n\x0fserver_settings\x18\x05 \x03(\x0b\x32\x37.alpha_speaker.RegistrationResponse.ServerSettingsEntry\x12\x0f\n\x07resumed\x18\x06 \x01(\x08\x12\x14\n\x0cresume_token\x18\x07 \x01(\t\x1a\x35\n\x13ServerSettingsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\\\n\x12StateStreamRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x16\n\x0e\x65ntity_filters\x18\x02 \x03(\t\x12\x1a\n\x12send_initial_state\x18\x03 \x01(\x08\"\xf5\x01\n\x0b\x44\x65viceState\x12\x11\n\tentity_id\x18\x01 \x01(\t\x12\r\n\x05state\x18\x02 \x01(\t\x12>\n\nattributes\x18\x03 \x03(\x0b\x32*.alpha_speaker.DeviceState.AttributesEntry\x12\x15\n\rfriendly_name\x18\x04 \x01(\t\x12\x0e\n\x06\x64omain\x18\x05 \x01(\t\x12\x14\n\x0clast_changed\x18\x06 \x01(\x03\x12\x14\n\x0clast_updated\x18\x07 \x01(\x03\x1a\x31\n\x0f\x41ttributesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"q\n\nTTSRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\r\n\x05voice\x18\x04 \x01(\t\x12\x0e\n\x06volume\x18\x05 \x01(\x05\x12\x10\n\x08priority\x18\x06 \x01(\x08\"E\n\x0bTTSResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\nmessage_id\x18\x02 \x01(\t\x12\x11\n\ttimestamp\x18\x03 \x01(\x03\"\xc8\x01\n\x10SpeakTextRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0c\n\x04text\x18\x02 \x01(\t\x12\x10\n\x08language\x18\x03 \x01(\t\x12\r\n\x05voice\x18\x04 \x01(\t\x12\x0e\n\x06volume\x18\x05 \x01(\x05\x12\x10\n\x08priority\x18\x06 \x01(\x08\x12\x12\n\nmessage_id\x18\x07 \x01(\t\x12\x11\n\ttimestamp\x18\x08 \x01(\x03\x12\x13\n\x0b\x63hunk_index\x18\t \x01(\x05\x12\x13\n\x0b\x63hunk_count\x18\n \x01(\x05\"\x85\x01\n\x11SpeakTextResponse\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x12\n\nmessage_id\x18\x04 \x01(\t\x12\x11\n\ttimestamp\x18\x05 \x01(\x03\x12\x13\n\x0b\x63hunk_index\x18\x06 \x01(\x05\"\xc6\x02\n\x0c\x41lphaCommand\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x14\n\x0c\x63ommand_type\x18\x02 \x01(\t\x12\x11\n\tentity_id\x18\x03 \x01(\t\x12?\n\nparameters\x18\x04 \x03(\x0b\x32+.alpha_speaker.AlphaCommand.ParametersEntry\x12\x15\n\rvoice_command\x18\x05 \x01(\t\x12\x11\n\ttimestamp\x18\x06 \x01(\x03\x12\x14\n\x0cnon_blocking\x18\x07 \x01(\x08\x12\x17\n\x0fidempotency_key\x18\x08 \x01(\t\x12,\n\x06target\x18\t \x01(\x0b\x32\x1c.alpha_speaker.CommandTarget\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"g\n\rCommandTarget\x12\r\n\x05\x61reas\x18\x01 \x03(\t\x12\x0e\n\x06\x66loors\x18\x02 \x03(\t\x12\x0e\n\x06labels\x18\x03 \x03(\t\x12\x16\n\x0e\x64\x65vice_classes\x18\x04 \x03(\t\x12\x0f\n\x07\x64omains\x18\x05 \x03(\t\"\x93\x01\n\x0f\x43ommandResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\t\x12\x14\n\x0cresult_state\x18\x03 \x01(\t\x12\x0f\n\x07message\x18\x04 \x01(\t\x12\x11\n\tentity_id\x18\x05 \x01(\t\x12\x0f\n\x07pending\x18\x06 \x01(\x08\x12\x12\n\nentity_ids\x18\x07 \x03(\t\"l\n\x11\x41lphaCommandBatch\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12-\n\x08\x63ommands\x18\x02 \x03(\x0b\x32\x1b.alpha_speaker.AlphaCommand\x12\x14\n\x0cmax_parallel\x18\x03 \x01(\x05\"X\n\x14\x43ommandBatchResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12/\n\x07results\x18\x02 \x03(\x0b\x32\x1e.alpha_speaker.CommandResponse\"v\n\x11\x44\x65viceListRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0f\n\x07\x64omains\x18\x02 \x03(\t\x12\x15\n\rif_none_match\x18\x03 \x01(\x03\x12\x11\n\tpage_size\x18\x04 \x01(\x05\x12\x12\n\npage_token\x18\x05 \x01(\t\"\x8d\x01\n\nDeviceList\x12*\n\x07\x64\x65vices\x18\x01 \x03(\x0b\x32\x19.alpha_speaker.DeviceInfo\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x0f\n\x07version\x18\x03 \x01(\x03\x12\x14\n\x0cnot_modified\x18\x04 \x01(\x08\x12\x17\n\x0fnext_page_token\x18\x05 \x01(\t\"P\n\x12\x44\x65viceDeltaRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x0f\n\x07\x64omains\x18\x02 \x03(\t\x12\x15\n\rsince_version\x18\x03 \x01(\x03\"\x98\x01\n\x0b\x44\x65viceDelta\x12\x0f\n\x07version\x18\x01 \x01(\x03\x12\x11\n\tfull_sync\x18\x02 \x01(\x08\x12(\n\x05\x61\x64\x64\x65\x64\x18\x03 \x03(\x0b\x32\x19.alpha_speaker.DeviceInfo\x12*\n\x07\x63hanged\x18\x04 \x03(\x0b\x32\x19.alpha_speaker.DeviceInfo\x12\x0f\n\x07removed\x18\x05 \x03(\t\"y\n\nDeviceInfo\x12\x11\n\tentity_id\x18\x01 \x01(\t\x12\x15\n\rfriendly_name\x18\x02 \x01(\t\x12\x0e\n\x06\x64omain\x18\x03 \x01(\t\x12\x15\n\rcurrent_state\x18\x04 \x01(\t\x12\x1a\n\x12supported_commands\x18\x05 \x03(\t\"]\n\x14\x45ntityResolveRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\x12\x11\n\tutterance\x18\x02 \x01(\t\x12\r\n\x05limit\x18\x03 \x01(\x05\x12\x0f\n\x07\x64omains\x18\x04 \x03(\t\"O\n\x0f\x45ntityCandidate\x12\x11\n\tentity_id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0c\n\x04\x61rea\x18\x03 \x01(\t\x12\r\n\x05score\x18\x04 \x01(\x02\"K\n\x15\x45ntityResolveResponse\x12\x32\n\ncandidates\x18\x01 \x03(\x0b\x32\x1e.alpha_speaker.EntityCandidate\"!\n\x0bPingRequest\x12\x12\n\nspeaker_id\x18\x01 \x01(\t\"J\n\x0cPingResponse\x12\r\n\x05\x61live\x18\x01 \x01(\x08\x12\x13\n\x0bserver_time\x18\x02 \x01(\x03\x12\x16\n\x0estatus_message\x18\x03 \x01(\t*\x8a\x01\n\x0e\x41lphaEventType\x12\x15\n\x11SPEAKER_CONNECTED\x10\x00\x12\x18\n\x14SPEAKER_DISCONNECTED\x10\x01\x12\x1a\n\x16VOICE_COMMAND_RECEIVED\x10\x02\x12\x11\n\rTTS_REQUESTED\x10\x03\x12\x18\n\x14\x44\x45VICE_STATE_CHANGED\x10\x04\x32\xfb\x08\n\x13\x41lphaSpeakerService\x12_\n\x14RegisterAlphaSpeaker\x12\".alpha_speaker.SpeakerRegistration\x1a#.alpha_speaker.RegistrationResponse\x12U\n\x12StreamDeviceStates\x12!.alpha_speaker.StateStreamRequest\x1a\x1a.alpha_speaker.DeviceState0\x01\x12J\n\x11SendTextForSpeech\x12\x19.alpha_speaker.TTSRequest\x1a\x1a.alpha_speaker.TTSResponse\x12Y\n\x11StreamTTSCommands\x12!.alpha_speaker.StateStreamRequest\x1a\x1f.alpha_speaker.SpeakTextRequest0\x01\x12O\n\x0fSendTTSResponse\x12 .alpha_speaker.SpeakTextResponse\x1a\x1a.alpha_speaker.TTSResponse\x12O\n\x10SendAlphaCommand\x12\x1b.alpha_speaker.AlphaCommand\x1a\x1e.alpha_speaker.CommandResponse\x12Z\n\x11SendAlphaCommands\x12 .alpha_speaker.AlphaCommandBatch\x1a#.alpha_speaker.CommandBatchResponse\x12[\n\x14StreamCommandResults\x12!.alpha_speaker.StateStreamRequest\x1a\x1e.alpha_speaker.CommandResponse0\x01\x12\x44\n\tKeepAlive\x12\x1a.alpha_speaker.PingRequest\x1a\x1b.alpha_speaker.PingResponse\x12R\n\x13GetAvailableDevices\x12 .alpha_speaker.DeviceListRequest\x1a\x19.alpha_speaker.DeviceList\x12W\n\x16StreamAvailableDevices\x12 .alpha_speaker.DeviceListRequest\x1a\x19.alpha_speaker.DeviceList0\x01\x12Y\n\x18GetAvailableDevicesSince\x12!.alpha_speaker.DeviceDeltaRequest\x1a\x1a.alpha_speaker.DeviceDelta\x12\\\n\x0fResolveEntities\x12#.alpha_speaker.EntityResolveRequest\x1a$.alpha_speaker.EntityResolveResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -39,46 +39,62 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_DEVICESTATE_ATTRIBUTESENTRY']._serialized_options = b'8\001'
   _globals['_ALPHACOMMAND_PARAMETERSENTRY']._loaded_options = None
   _globals['_ALPHACOMMAND_PARAMETERSENTRY']._serialized_options = b'8\001'
-  _globals['_ALPHAEVENTTYPE']._serialized_start=2035
-  _globals['_ALPHAEVENTTYPE']._serialized_end=2173
+  _globals['_ALPHAEVENTTYPE']._serialized_start=3259
+  _globals['_ALPHAEVENTTYPE']._serialized_end=3397
   _globals['_SPEAKERREGISTRATION']._serialized_start=39
-  _globals['_SPEAKERREGISTRATION']._serialized_end=289
-  _globals['_SPEAKERREGISTRATION_SETTINGSENTRY']._serialized_start=242
-  _globals['_SPEAKERREGISTRATION_SETTINGSENTRY']._serialized_end=289
-  _globals['_REGISTRATIONRESPONSE']._serialized_start=292
-  _globals['_REGISTRATIONRESPONSE']._serialized_end=529
-  _globals['_REGISTRATIONRESPONSE_SERVERSETTINGSENTRY']._serialized_start=476
-  _globals['_REGISTRATIONRESPONSE_SERVERSETTINGSENTRY']._serialized_end=529
-  _globals['_STATESTREAMREQUEST']._serialized_start=531
-  _globals['_STATESTREAMREQUEST']._serialized_end=623
-  _globals['_DEVICESTATE']._serialized_start=626
-  _globals['_DEVICESTATE']._serialized_end=871
-  _globals['_DEVICESTATE_ATTRIBUTESENTRY']._serialized_start=822
-  _globals['_DEVICESTATE_ATTRIBUTESENTRY']._serialized_end=871
-  _globals['_TTSREQUEST']._serialized_start=873
-  _globals['_TTSREQUEST']._serialized_end=986
-  _globals['_TTSRESPONSE']._serialized_start=988
-  _globals['_TTSRESPONSE']._serialized_end=1057
-  _globals['_SPEAKTEXTREQUEST']._serialized_start=1060
-  _globals['_SPEAKTEXTREQUEST']._serialized_end=1218
-  _globals['_SPEAKTEXTRESPONSE']._serialized_start=1220
-  _globals['_SPEAKTEXTRESPONSE']._serialized_end=1332
-  _globals['_ALPHACOMMAND']._serialized_start=1335
-  _globals['_ALPHACOMMAND']._serialized_end=1568
-  _globals['_ALPHACOMMAND_PARAMETERSENTRY']._serialized_start=1519
-  _globals['_ALPHACOMMAND_PARAMETERSENTRY']._serialized_end=1568
-  _globals['_COMMANDRESPONSE']._serialized_start=1570
-  _globals['_COMMANDRESPONSE']._serialized_end=1661
-  _globals['_DEVICELISTREQUEST']._serialized_start=1663
-  _globals['_DEVICELISTREQUEST']._serialized_end=1719
-  _globals['_DEVICELIST']._serialized_start=1721
-  _globals['_DEVICELIST']._serialized_end=1798
-  _globals['_DEVICEINFO']._serialized_start=1800
-  _globals['_DEVICEINFO']._serialized_end=1921
-  _globals['_PINGREQUEST']._serialized_start=1923
-  _globals['_PINGREQUEST']._serialized_end=1956
-  _globals['_PINGRESPONSE']._serialized_start=1958
-  _globals['_PINGRESPONSE']._serialized_end=2032
-  _globals['_ALPHASPEAKERSERVICE']._serialized_start=2176
-  _globals['_ALPHASPEAKERSERVICE']._serialized_end=2864
+  _globals['_SPEAKERREGISTRATION']._serialized_end=338
+  _globals['_SPEAKERREGISTRATION_SETTINGSENTRY']._serialized_start=291
+  _globals['_SPEAKERREGISTRATION_SETTINGSENTRY']._serialized_end=338
+  _globals['_REGISTRATIONRESPONSE']._serialized_start=341
+  _globals['_REGISTRATIONRESPONSE']._serialized_end=617
+  _globals['_REGISTRATIONRESPONSE_SERVERSETTINGSENTRY']._serialized_start=564
+  _globals['_REGISTRATIONRESPONSE_SERVERSETTINGSENTRY']._serialized_end=617
+  _globals['_STATESTREAMREQUEST']._serialized_start=619
+  _globals['_STATESTREAMREQUEST']._serialized_end=711
+  _globals['_DEVICESTATE']._serialized_start=714
+  _globals['_DEVICESTATE']._serialized_end=959
+  _globals['_DEVICESTATE_ATTRIBUTESENTRY']._serialized_start=910
+  _globals['_DEVICESTATE_ATTRIBUTESENTRY']._serialized_end=959
+  _globals['_TTSREQUEST']._serialized_start=961
+  _globals['_TTSREQUEST']._serialized_end=1074
+  _globals['_TTSRESPONSE']._serialized_start=1076
+  _globals['_TTSRESPONSE']._serialized_end=1145
+  _globals['_SPEAKTEXTREQUEST']._serialized_start=1148
+  _globals['_SPEAKTEXTREQUEST']._serialized_end=1348
+  _globals['_SPEAKTEXTRESPONSE']._serialized_start=1351
+  _globals['_SPEAKTEXTRESPONSE']._serialized_end=1484
+  _globals['_ALPHACOMMAND']._serialized_start=1487
+  _globals['_ALPHACOMMAND']._serialized_end=1813
+  _globals['_ALPHACOMMAND_PARAMETERSENTRY']._serialized_start=1764
+  _globals['_ALPHACOMMAND_PARAMETERSENTRY']._serialized_end=1813
+  _globals['_COMMANDTARGET']._serialized_start=1815
+  _globals['_COMMANDTARGET']._serialized_end=1918
+  _globals['_COMMANDRESPONSE']._serialized_start=1921
+  _globals['_COMMANDRESPONSE']._serialized_end=2068
+  _globals['_ALPHACOMMANDBATCH']._serialized_start=2070
+  _globals['_ALPHACOMMANDBATCH']._serialized_end=2178
+  _globals['_COMMANDBATCHRESPONSE']._serialized_start=2180
+  _globals['_COMMANDBATCHRESPONSE']._serialized_end=2268
+  _globals['_DEVICELISTREQUEST']._serialized_start=2270
+  _globals['_DEVICELISTREQUEST']._serialized_end=2388
+  _globals['_DEVICELIST']._serialized_start=2391
+  _globals['_DEVICELIST']._serialized_end=2532
+  _globals['_DEVICEDELTAREQUEST']._serialized_start=2534
+  _globals['_DEVICEDELTAREQUEST']._serialized_end=2614
+  _globals['_DEVICEDELTA']._serialized_start=2617
+  _globals['_DEVICEDELTA']._serialized_end=2769
+  _globals['_DEVICEINFO']._serialized_start=2771
+  _globals['_DEVICEINFO']._serialized_end=2892
+  _globals['_ENTITYRESOLVEREQUEST']._serialized_start=2894
+  _globals['_ENTITYRESOLVEREQUEST']._serialized_end=2987
+  _globals['_ENTITYCANDIDATE']._serialized_start=2989
+  _globals['_ENTITYCANDIDATE']._serialized_end=3068
+  _globals['_ENTITYRESOLVERESPONSE']._serialized_start=3070
+  _globals['_ENTITYRESOLVERESPONSE']._serialized_end=3145
+  _globals['_PINGREQUEST']._serialized_start=3147
+  _globals['_PINGREQUEST']._serialized_end=3180
+  _globals['_PINGRESPONSE']._serialized_start=3182
+  _globals['_PINGRESPONSE']._serialized_end=3256
+  _globals['_ALPHASPEAKERSERVICE']._serialized_start=3400
+  _globals['_ALPHASPEAKERSERVICE']._serialized_end=4547
 # @@protoc_insertion_point(module_scope)
@@ -20,7 +20,7 @@ TTS_REQUESTED: AlphaEventType
 DEVICE_STATE_CHANGED: AlphaEventType
 
 class SpeakerRegistration(_message.Message):
-    __slots__ = ("speaker_id", "speaker_name", "speaker_type", "firmware_version", "capabilities", "settings")
+    __slots__ = ("speaker_id", "speaker_name", "speaker_type", "firmware_version", "capabilities", "settings", "resume_session_id", "resume_token")
     class SettingsEntry(_message.Message):
         __slots__ = ("key", "value")
         KEY_FIELD_NUMBER: _ClassVar[int]
@@ -34,16 +34,20 @@ class SpeakerRegistration(_message.Message):
     FIRMWARE_VERSION_FIELD_NUMBER: _ClassVar[int]
     CAPABILITIES_FIELD_NUMBER: _ClassVar[int]
     SETTINGS_FIELD_NUMBER: _ClassVar[int]
+    RESUME_SESSION_ID_FIELD_NUMBER: _ClassVar[int]
+    RESUME_TOKEN_FIELD_NUMBER: _ClassVar[int]
     speaker_id: str
     speaker_name: str
     speaker_type: str
     firmware_version: str
     capabilities: _containers.RepeatedScalarFieldContainer[str]
     settings: _containers.ScalarMap[str, str]
-    def __init__(self, speaker_id: _Optional[str] = ..., speaker_name: _Optional[str] = ..., speaker_type: _Optional[str] = ..., firmware_version: _Optional[str] = ..., capabilities: _Optional[_Iterable[str]] = ..., settings: _Optional[_Mapping[str, str]] = ...) -> None: ...
+    resume_session_id: str
+    resume_token: str
+    def __init__(self, speaker_id: _Optional[str] = ..., speaker_name: _Optional[str] = ..., speaker_type: _Optional[str] = ..., firmware_version: _Optional[str] = ..., capabilities: _Optional[_Iterable[str]] = ..., settings: _Optional[_Mapping[str, str]] = ..., resume_session_id: _Optional[str] = ..., resume_token: _Optional[str] = ...) -> None: ...
 
 class RegistrationResponse(_message.Message):
-    __slots__ = ("success", "message", "server_version", "session_id", "server_settings")
+    __slots__ = ("success", "message", "server_version", "session_id", "server_settings", "resumed", "resume_token")
     class ServerSettingsEntry(_message.Message):
         __slots__ = ("key", "value")
         KEY_FIELD_NUMBER: _ClassVar[int]
@@ -56,12 +60,16 @@ class RegistrationResponse(_message.Message):
     SERVER_VERSION_FIELD_NUMBER: _ClassVar[int]
     SESSION_ID_FIELD_NUMBER: _ClassVar[int]
     SERVER_SETTINGS_FIELD_NUMBER: _ClassVar[int]
+    RESUMED_FIELD_NUMBER: _ClassVar[int]
+    RESUME_TOKEN_FIELD_NUMBER: _ClassVar[int]
     success: bool
     message: str
     server_version: str
     session_id: str
     server_settings: _containers.ScalarMap[str, str]
-    def __init__(self, success: bool = ..., message: _Optional[str] = ..., server_version: _Optional[str] = ..., session_id: _Optional[str] = ..., server_settings: _Optional[_Mapping[str, str]] = ...) -> None: ...
+    resumed: bool
+    resume_token: str
+    def __init__(self, success: bool = ..., message: _Optional[str] = ..., server_version: _Optional[str] = ..., session_id: _Optional[str] = ..., server_settings: _Optional[_Mapping[str, str]] = ..., resumed: bool = ..., resume_token: _Optional[str] = ...) -> None: ...
 
 class StateStreamRequest(_message.Message):
     __slots__ = ("speaker_id", "entity_filters", "send_initial_state")
@@ -125,7 +133,7 @@ class TTSResponse(_message.Message):
     def __init__(self, success: bool = ..., message_id: _Optional[str] = ..., timestamp: _Optional[int] = ...) -> None: ...
 
 class SpeakTextRequest(_message.Message):
-    __slots__ = ("speaker_id", "text", "language", "voice", "volume", "priority", "message_id", "timestamp")
+    __slots__ = ("speaker_id", "text", "language", "voice", "volume", "priority", "message_id", "timestamp", "chunk_index", "chunk_count")
     SPEAKER_ID_FIELD_NUMBER: _ClassVar[int]
     TEXT_FIELD_NUMBER: _ClassVar[int]
     LANGUAGE_FIELD_NUMBER: _ClassVar[int]
@@ -134,6 +142,8 @@ class SpeakTextRequest(_message.Message):
     PRIORITY_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_ID_FIELD_NUMBER: _ClassVar[int]
     TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_INDEX_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_COUNT_FIELD_NUMBER: _ClassVar[int]
     speaker_id: str
     text: str
     language: str
@@ -142,24 +152,28 @@ class SpeakTextRequest(_message.Message):
     priority: bool
     message_id: str
     timestamp: int
-    def __init__(self, speaker_id: _Optional[str] = ..., text: _Optional[str] = ..., language: _Optional[str] = ..., voice: _Optional[str] = ..., volume: _Optional[int] = ..., priority: bool = ..., message_id: _Optional[str] = ..., timestamp: _Optional[int] = ...) -> None: ...
+    chunk_index: int
+    chunk_count: int
+    def __init__(self, speaker_id: _Optional[str] = ..., text: _Optional[str] = ..., language: _Optional[str] = ..., voice: _Optional[str] = ..., volume: _Optional[int] = ..., priority: bool = ..., message_id: _Optional[str] = ..., timestamp: _Optional[int] = ..., chunk_index: _Optional[int] = ..., chunk_count: _Optional[int] = ...) -> None: ...
 
 class SpeakTextResponse(_message.Message):
-    __slots__ = ("speaker_id", "success", "message", "message_id", "timestamp")
+    __slots__ = ("speaker_id", "success", "message", "message_id", "timestamp", "chunk_index")
     SPEAKER_ID_FIELD_NUMBER: _ClassVar[int]
     SUCCESS_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_ID_FIELD_NUMBER: _ClassVar[int]
     TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_INDEX_FIELD_NUMBER: _ClassVar[int]
     speaker_id: str
     success: bool
     message: str
     message_id: str
     timestamp: int
-    def __init__(self, speaker_id: _Optional[str] = ..., success: bool = ..., message: _Optional[str] = ..., message_id: _Optional[str] = ..., timestamp: _Optional[int] = ...) -> None: ...
+    chunk_index: int
+    def __init__(self, speaker_id: _Optional[str] = ..., success: bool = ..., message: _Optional[str] = ..., message_id: _Optional[str] = ..., timestamp: _Optional[int] = ..., chunk_index: _Optional[int] = ...) -> None: ...
 
 class AlphaCommand(_message.Message):
-    __slots__ = ("speaker_id", "command_type", "entity_id", "parameters", "voice_command", "timestamp")
+    __slots__ = ("speaker_id", "command_type", "entity_id", "parameters", "voice_command", "timestamp", "non_blocking", "idempotency_key", "target")
     class ParametersEntry(_message.Message):
         __slots__ = ("key", "value")
         KEY_FIELD_NUMBER: _ClassVar[int]
@@ -173,41 +187,121 @@ class AlphaCommand(_message.Message):
     PARAMETERS_FIELD_NUMBER: _ClassVar[int]
     VOICE_COMMAND_FIELD_NUMBER: _ClassVar[int]
     TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
+    NON_BLOCKING_FIELD_NUMBER: _ClassVar[int]
+    IDEMPOTENCY_KEY_FIELD_NUMBER: _ClassVar[int]
+    TARGET_FIELD_NUMBER: _ClassVar[int]
     speaker_id: str
     command_type: str
     entity_id: str
     parameters: _containers.ScalarMap[str, str]
     voice_command: str
     timestamp: int
-    def __init__(self, speaker_id: _Optional[str] = ..., command_type: _Optional[str] = ..., entity_id: _Optional[str] = ..., parameters: _Optional[_Mapping[str, str]] = ..., voice_command: _Optional[str] = ..., timestamp: _Optional[int] = ...) -> None: ...
+    non_blocking: bool
+    idempotency_key: str
+    target: CommandTarget
+    def __init__(self, speaker_id: _Optional[str] = ..., command_type: _Optional[str] = ..., entity_id: _Optional[str] = ..., parameters: _Optional[_Mapping[str, str]] = ..., voice_command: _Optional[str] = ..., timestamp: _Optional[int] = ..., non_blocking: bool = ..., idempotency_key: _Optional[str] = ..., target: _Optional[_Union[CommandTarget, _Mapping]] = ...) -> None: ...
+
+class CommandTarget(_message.Message):
+    __slots__ = ("areas", "floors", "labels", "device_classes", "domains")
+    AREAS_FIELD_NUMBER: _ClassVar[int]
+    FLOORS_FIELD_NUMBER: _ClassVar[int]
+    LABELS_FIELD_NUMBER: _ClassVar[int]
+    DEVICE_CLASSES_FIELD_NUMBER: _ClassVar[int]
+    DOMAINS_FIELD_NUMBER: _ClassVar[int]
+    areas: _containers.RepeatedScalarFieldContainer[str]
+    floors: _containers.RepeatedScalarFieldContainer[str]
+    labels: _containers.RepeatedScalarFieldContainer[str]
+    device_classes: _containers.RepeatedScalarFieldContainer[str]
+    domains: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, areas: _Optional[_Iterable[str]] = ..., floors: _Optional[_Iterable[str]] = ..., labels: _Optional[_Iterable[str]] = ..., device_classes: _Optional[_Iterable[str]] = ..., domains: _Optional[_Iterable[str]] = ...) -> None: ...
 
 class CommandResponse(_message.Message):
-    __slots__ = ("success", "event_id", "result_state", "message")
+    __slots__ = ("success", "event_id", "result_state", "message", "entity_id", "pending", "entity_ids")
     SUCCESS_FIELD_NUMBER: _ClassVar[int]
     EVENT_ID_FIELD_NUMBER: _ClassVar[int]
     RESULT_STATE_FIELD_NUMBER: _ClassVar[int]
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    ENTITY_ID_FIELD_NUMBER: _ClassVar[int]
+    PENDING_FIELD_NUMBER: _ClassVar[int]
+    ENTITY_IDS_FIELD_NUMBER: _ClassVar[int]
     success: bool
     event_id: str
     result_state: str
     message: str
-    def __init__(self, success: bool = ..., event_id: _Optional[str] = ..., result_state: _Optional[str] = ..., message: _Optional[str] = ...) -> None: ...
+    entity_id: str
+    pending: bool
+    entity_ids: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, success: bool = ..., event_id: _Optional[str] = ..., result_state: _Optional[str] = ..., message: _Optional[str] = ..., entity_id: _Optional[str] = ..., pending: bool = ..., entity_ids: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class AlphaCommandBatch(_message.Message):
+    __slots__ = ("speaker_id", "commands", "max_parallel")
+    SPEAKER_ID_FIELD_NUMBER: _ClassVar[int]
+    COMMANDS_FIELD_NUMBER: _ClassVar[int]
+    MAX_PARALLEL_FIELD_NUMBER: _ClassVar[int]
+    speaker_id: str
+    commands: _containers.RepeatedCompositeFieldContainer[AlphaCommand]
+    max_parallel: int
+    def __init__(self, speaker_id: _Optional[str] = ..., commands: _Optional[_Iterable[_Union[AlphaCommand, _Mapping]]] = ..., max_parallel: _Optional[int] = ...) -> None: ...
+
+class CommandBatchResponse(_message.Message):
+    __slots__ = ("success", "results")
+    SUCCESS_FIELD_NUMBER: _ClassVar[int]
+    RESULTS_FIELD_NUMBER: _ClassVar[int]
+    success: bool
+    results: _containers.RepeatedCompositeFieldContainer[CommandResponse]
+    def __init__(self, success: bool = ..., results: _Optional[_Iterable[_Union[CommandResponse, _Mapping]]] = ...) -> None: ...
 
 class DeviceListRequest(_message.Message):
-    __slots__ = ("speaker_id", "domains")
+    __slots__ = ("speaker_id", "domains", "if_none_match", "page_size", "page_token")
     SPEAKER_ID_FIELD_NUMBER: _ClassVar[int]
     DOMAINS_FIELD_NUMBER: _ClassVar[int]
+    IF_NONE_MATCH_FIELD_NUMBER: _ClassVar[int]
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
     speaker_id: str
     domains: _containers.RepeatedScalarFieldContainer[str]
-    def __init__(self, speaker_id: _Optional[str] = ..., domains: _Optional[_Iterable[str]] = ...) -> None: ...
+    if_none_match: int
+    page_size: int
+    page_token: str
+    def __init__(self, speaker_id: _Optional[str] = ..., domains: _Optional[_Iterable[str]] = ..., if_none_match: _Optional[int] = ..., page_size: _Optional[int] = ..., page_token: _Optional[str] = ...) -> None: ...
 
 class DeviceList(_message.Message):
-    __slots__ = ("devices", "total_count")
+    __slots__ = ("devices", "total_count", "version", "not_modified", "next_page_token")
     DEVICES_FIELD_NUMBER: _ClassVar[int]
     TOTAL_COUNT_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    NOT_MODIFIED_FIELD_NUMBER: _ClassVar[int]
+    NEXT_PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
     devices: _containers.RepeatedCompositeFieldContainer[DeviceInfo]
     total_count: int
-    def __init__(self, devices: _Optional[_Iterable[_Union[DeviceInfo, _Mapping]]] = ..., total_count: _Optional[int] = ...) -> None: ...
+    version: int
+    not_modified: bool
+    next_page_token: str
+    def __init__(self, devices: _Optional[_Iterable[_Union[DeviceInfo, _Mapping]]] = ..., total_count: _Optional[int] = ..., version: _Optional[int] = ..., not_modified: bool = ..., next_page_token: _Optional[str] = ...) -> None: ...
+
+class DeviceDeltaRequest(_message.Message):
+    __slots__ = ("speaker_id", "domains", "since_version")
+    SPEAKER_ID_FIELD_NUMBER: _ClassVar[int]
+    DOMAINS_FIELD_NUMBER: _ClassVar[int]
+    SINCE_VERSION_FIELD_NUMBER: _ClassVar[int]
+    speaker_id: str
+    domains: _containers.RepeatedScalarFieldContainer[str]
+    since_version: int
+    def __init__(self, speaker_id: _Optional[str] = ..., domains: _Optional[_Iterable[str]] = ..., since_version: _Optional[int] = ...) -> None: ...
+
+class DeviceDelta(_message.Message):
+    __slots__ = ("version", "full_sync", "added", "changed", "removed")
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    FULL_SYNC_FIELD_NUMBER: _ClassVar[int]
+    ADDED_FIELD_NUMBER: _ClassVar[int]
+    CHANGED_FIELD_NUMBER: _ClassVar[int]
+    REMOVED_FIELD_NUMBER: _ClassVar[int]
+    version: int
+    full_sync: bool
+    added: _containers.RepeatedCompositeFieldContainer[DeviceInfo]
+    changed: _containers.RepeatedCompositeFieldContainer[DeviceInfo]
+    removed: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, version: _Optional[int] = ..., full_sync: bool = ..., added: _Optional[_Iterable[_Union[DeviceInfo, _Mapping]]] = ..., changed: _Optional[_Iterable[_Union[DeviceInfo, _Mapping]]] = ..., removed: _Optional[_Iterable[str]] = ...) -> None: ...
 
 class DeviceInfo(_message.Message):
     __slots__ = ("entity_id", "friendly_name", "domain", "current_state", "supported_commands")
@@ -223,6 +317,36 @@ class DeviceInfo(_message.Message):
     supported_commands: _containers.RepeatedScalarFieldContainer[str]
     def __init__(self, entity_id: _Optional[str] = ..., friendly_name: _Optional[str] = ..., domain: _Optional[str] = ..., current_state: _Optional[str] = ..., supported_commands: _Optional[_Iterable[str]] = ...) -> None: ...
 
+class EntityResolveRequest(_message.Message):
+    __slots__ = ("speaker_id", "utterance", "limit", "domains")
+    SPEAKER_ID_FIELD_NUMBER: _ClassVar[int]
+    UTTERANCE_FIELD_NUMBER: _ClassVar[int]
+    LIMIT_FIELD_NUMBER: _ClassVar[int]
+    DOMAINS_FIELD_NUMBER: _ClassVar[int]
+    speaker_id: str
+    utterance: str
+    limit: int
+    domains: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, speaker_id: _Optional[str] = ..., utterance: _Optional[str] = ..., limit: _Optional[int] = ..., domains: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class EntityCandidate(_message.Message):
+    __slots__ = ("entity_id", "name", "area", "score")
+    ENTITY_ID_FIELD_NUMBER: _ClassVar[int]
+    NAME_FIELD_NUMBER: _ClassVar[int]
+    AREA_FIELD_NUMBER: _ClassVar[int]
+    SCORE_FIELD_NUMBER: _ClassVar[int]
+    entity_id: str
+    name: str
+    area: str
+    score: float
+    def __init__(self, entity_id: _Optional[str] = ..., name: _Optional[str] = ..., area: _Optional[str] = ..., score: _Optional[float] = ...) -> None: ...
+
+class EntityResolveResponse(_message.Message):
+    __slots__ = ("candidates",)
+    CANDIDATES_FIELD_NUMBER: _ClassVar[int]
+    candidates: _containers.RepeatedCompositeFieldContainer[EntityCandidate]
+    def __init__(self, candidates: _Optional[_Iterable[_Union[EntityCandidate, _Mapping]]] = ...) -> None: ...
+
 class PingRequest(_message.Message):
     __slots__ = ("speaker_id",)
     SPEAKER_ID_FIELD_NUMBER: _ClassVar[int]
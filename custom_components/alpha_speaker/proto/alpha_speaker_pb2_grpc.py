@@ -64,6 +64,16 @@ class AlphaSpeakerServiceStub(object):
                 request_serializer=alpha__speaker__pb2.AlphaCommand.SerializeToString,
                 response_deserializer=alpha__speaker__pb2.CommandResponse.FromString,
                 _registered_method=True)
+        self.SendAlphaCommands = channel.unary_unary(
+                '/alpha_speaker.AlphaSpeakerService/SendAlphaCommands',
+                request_serializer=alpha__speaker__pb2.AlphaCommandBatch.SerializeToString,
+                response_deserializer=alpha__speaker__pb2.CommandBatchResponse.FromString,
+                _registered_method=True)
+        self.StreamCommandResults = channel.unary_stream(
+                '/alpha_speaker.AlphaSpeakerService/StreamCommandResults',
+                request_serializer=alpha__speaker__pb2.StateStreamRequest.SerializeToString,
+                response_deserializer=alpha__speaker__pb2.CommandResponse.FromString,
+                _registered_method=True)
         self.KeepAlive = channel.unary_unary(
                 '/alpha_speaker.AlphaSpeakerService/KeepAlive',
                 request_serializer=alpha__speaker__pb2.PingRequest.SerializeToString,
@@ -74,6 +84,21 @@ class AlphaSpeakerServiceStub(object):
                 request_serializer=alpha__speaker__pb2.DeviceListRequest.SerializeToString,
                 response_deserializer=alpha__speaker__pb2.DeviceList.FromString,
                 _registered_method=True)
+        self.StreamAvailableDevices = channel.unary_stream(
+                '/alpha_speaker.AlphaSpeakerService/StreamAvailableDevices',
+                request_serializer=alpha__speaker__pb2.DeviceListRequest.SerializeToString,
+                response_deserializer=alpha__speaker__pb2.DeviceList.FromString,
+                _registered_method=True)
+        self.GetAvailableDevicesSince = channel.unary_unary(
+                '/alpha_speaker.AlphaSpeakerService/GetAvailableDevicesSince',
+                request_serializer=alpha__speaker__pb2.DeviceDeltaRequest.SerializeToString,
+                response_deserializer=alpha__speaker__pb2.DeviceDelta.FromString,
+                _registered_method=True)
+        self.ResolveEntities = channel.unary_unary(
+                '/alpha_speaker.AlphaSpeakerService/ResolveEntities',
+                request_serializer=alpha__speaker__pb2.EntityResolveRequest.SerializeToString,
+                response_deserializer=alpha__speaker__pb2.EntityResolveResponse.FromString,
+                _registered_method=True)
 
 
 class AlphaSpeakerServiceServicer(object):
@@ -121,6 +146,20 @@ class AlphaSpeakerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SendAlphaCommands(self, request, context):
+        """Пакетная отправка команд: независимые команды выполняются параллельно
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamCommandResults(self, request, context):
+        """Результаты команд, отправленных с non_blocking - НАПРАВЛЕНИЕ: HA → Колонка
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def KeepAlive(self, request, context):
         """Проверка связи
         """
@@ -135,6 +174,27 @@ class AlphaSpeakerServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamAvailableDevices(self, request, context):
+        """Список устройств частями по page_size - первые устройства приходят сразу
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetAvailableDevicesSince(self, request, context):
+        """Изменения списка устройств с версии, которая уже есть у колонки
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ResolveEntities(self, request, context):
+        """Поиск устройств по фразе пользователя (имена, псевдонимы, зоны)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_AlphaSpeakerServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -168,6 +228,16 @@ def add_AlphaSpeakerServiceServicer_to_server(servicer, server):
                     request_deserializer=alpha__speaker__pb2.AlphaCommand.FromString,
                     response_serializer=alpha__speaker__pb2.CommandResponse.SerializeToString,
             ),
+            'SendAlphaCommands': grpc.unary_unary_rpc_method_handler(
+                    servicer.SendAlphaCommands,
+                    request_deserializer=alpha__speaker__pb2.AlphaCommandBatch.FromString,
+                    response_serializer=alpha__speaker__pb2.CommandBatchResponse.SerializeToString,
+            ),
+            'StreamCommandResults': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamCommandResults,
+                    request_deserializer=alpha__speaker__pb2.StateStreamRequest.FromString,
+                    response_serializer=alpha__speaker__pb2.CommandResponse.SerializeToString,
+            ),
             'KeepAlive': grpc.unary_unary_rpc_method_handler(
                     servicer.KeepAlive,
                     request_deserializer=alpha__speaker__pb2.PingRequest.FromString,
@@ -178,6 +248,21 @@ def add_AlphaSpeakerServiceServicer_to_server(servicer, server):
                     request_deserializer=alpha__speaker__pb2.DeviceListRequest.FromString,
                     response_serializer=alpha__speaker__pb2.DeviceList.SerializeToString,
             ),
+            'StreamAvailableDevices': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamAvailableDevices,
+                    request_deserializer=alpha__speaker__pb2.DeviceListRequest.FromString,
+                    response_serializer=alpha__speaker__pb2.DeviceList.SerializeToString,
+            ),
+            'GetAvailableDevicesSince': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetAvailableDevicesSince,
+                    request_deserializer=alpha__speaker__pb2.DeviceDeltaRequest.FromString,
+                    response_serializer=alpha__speaker__pb2.DeviceDelta.SerializeToString,
+            ),
+            'ResolveEntities': grpc.unary_unary_rpc_method_handler(
+                    servicer.ResolveEntities,
+                    request_deserializer=alpha__speaker__pb2.EntityResolveRequest.FromString,
+                    response_serializer=alpha__speaker__pb2.EntityResolveResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'alpha_speaker.AlphaSpeakerService', rpc_method_handlers)
@@ -351,6 +436,60 @@ class AlphaSpeakerService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SendAlphaCommands(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/alpha_speaker.AlphaSpeakerService/SendAlphaCommands',
+            alpha__speaker__pb2.AlphaCommandBatch.SerializeToString,
+            alpha__speaker__pb2.CommandBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamCommandResults(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/alpha_speaker.AlphaSpeakerService/StreamCommandResults',
+            alpha__speaker__pb2.StateStreamRequest.SerializeToString,
+            alpha__speaker__pb2.CommandResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def KeepAlive(request,
             target,
@@ -404,3 +543,84 @@ class AlphaSpeakerService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamAvailableDevices(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/alpha_speaker.AlphaSpeakerService/StreamAvailableDevices',
+            alpha__speaker__pb2.DeviceListRequest.SerializeToString,
+            alpha__speaker__pb2.DeviceList.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetAvailableDevicesSince(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/alpha_speaker.AlphaSpeakerService/GetAvailableDevicesSince',
+            alpha__speaker__pb2.DeviceDeltaRequest.SerializeToString,
+            alpha__speaker__pb2.DeviceDelta.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ResolveEntities(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/alpha_speaker.AlphaSpeakerService/ResolveEntities',
+            alpha__speaker__pb2.EntityResolveRequest.SerializeToString,
+            alpha__speaker__pb2.EntityResolveResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
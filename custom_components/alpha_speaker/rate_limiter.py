@@ -0,0 +1,159 @@
+"""
+Per-speaker rate limiting and fair scheduling for Alpha Private Speaker
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Set, Tuple
+
+from .const import DEFAULT_RATE_BURST, DEFAULT_RATE_LIMIT, DEFAULT_SERVICE_CONCURRENCY
+
+
+class TokenBucket:
+    """Token bucket: rate tokens per second, up to capacity stored"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def try_acquire(self, cost: float = 1.0) -> float:
+        """Take tokens; return 0 on success or seconds until enough tokens accumulate.
+
+        A request costing more than the capacity can never pass: math.inf.
+        """
+        if cost > self.capacity:
+            return math.inf
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class SpeakerRateLimiter:
+    """One token bucket per speaker"""
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT, burst: float = DEFAULT_RATE_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def try_acquire(self, speaker_id: str, cost: float = 1.0) -> float:
+        """Return 0 if the call is allowed, otherwise the retry-after delay in seconds.
+
+        The caller only passes registered speakers, so the number of
+        buckets is bounded by the online sessions.
+        """
+        bucket = self.buckets.get(speaker_id)
+        if bucket is None:
+            bucket = self.buckets[speaker_id] = TokenBucket(self.rate, self.burst)
+        return bucket.try_acquire(cost)
+
+    def remove(self, speaker_id: str):
+        """Forget the bucket of an evicted speaker"""
+        self.buckets.pop(speaker_id, None)
+
+
+class FairScheduler:
+    """Weighted round-robin across speakers with a global concurrency limit.
+
+    Each speaker has its own FIFO queue; when a slot frees up the next
+    speaker in the ring gets to start up to `weight` jobs before the turn
+    passes on, so one busy speaker cannot starve the others.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_SERVICE_CONCURRENCY, default_weight: int = 1):
+        self.max_concurrency = max_concurrency
+        self.default_weight = default_weight
+        self.weights: Dict[str, int] = {}
+        self.active = 0
+        self._queues: Dict[str, Deque[Tuple[Callable[[], Awaitable[Any]], asyncio.Future]]] = {}
+        self._ring: Deque[str] = deque()
+        self._credit = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+    def set_weight(self, speaker_id: str, weight: int):
+        """Give a speaker more (or fewer) consecutive slots per round"""
+        self.weights[speaker_id] = max(1, weight)
+
+    def queued(self, speaker_id: str) -> int:
+        """Number of jobs waiting for a slot"""
+        return len(self._queues.get(speaker_id, ()))
+
+    async def submit(self, speaker_id: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Queue a job for the speaker and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.get(speaker_id)
+        if queue is None:
+            queue = self._queues[speaker_id] = deque()
+            self._ring.append(speaker_id)
+        queue.append((factory, future))
+
+        self._pump()
+        return await future
+
+    def _pump(self):
+        """Start queued jobs while there are free slots"""
+        while self.active < self.max_concurrency and self._ring:
+            speaker_id = self._ring[0]
+            queue = self._queues[speaker_id]
+            factory, future = queue.popleft()
+
+            if not queue:
+                # Очередь колонки пуста - убираем ее из круга
+                del self._queues[speaker_id]
+                self._ring.popleft()
+                self._credit = 0
+            else:
+                self._credit += 1
+                if self._credit >= self.weights.get(speaker_id, self.default_weight):
+                    self._ring.rotate(-1)
+                    self._credit = 0
+
+            if future.done():
+                # Вызывающий уже ушел (отмена RPC)
+                continue
+
+            self.active += 1
+            # Держим ссылку на задачу, иначе ее может собрать сборщик мусора
+            task = asyncio.ensure_future(self._run(factory, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def stop(self):
+        """Cancel running jobs and fail the queued ones"""
+        for task in list(self._tasks):
+            task.cancel()
+        for queue in self._queues.values():
+            for _, future in queue:
+                if not future.done():
+                    future.cancel()
+        self._queues.clear()
+        self._ring.clear()
+        self._credit = 0
+
+    async def _run(self, factory: Callable[[], Awaitable[Any]], future: asyncio.Future):
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            # Ожидающий RPC не должен зависнуть
+            if not future.done():
+                future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+        finally:
+            self.active -= 1
+            self._pump()
@@ -0,0 +1,240 @@
+"""
+In-memory index over entity, device and area registries for Alpha Private Speaker
+"""
+import logging
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar, device_registry as dr, entity_registry as er
+
+try:
+    from homeassistant.helpers import floor_registry as fr, label_registry as lr
+except ImportError:  # Этажи и метки появились в HA 2024.4
+    fr = None
+    lr = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize an area/floor/label name for lookup"""
+    return " ".join(name.lower().replace("ё", "е").split())
+
+
+class RegistryIndex:
+    """Area, floor, label and device class -> entity_id index updated on registry events"""
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        # entity_id -> (area_id, device_id, labels, device_class)
+        self.entity_meta: Dict[str, Tuple[Optional[str], Optional[str], FrozenSet[str], Optional[str]]] = {}
+        self.area_entities: Dict[str, Set[str]] = {}
+        self.label_entities: Dict[str, Set[str]] = {}
+        self.device_class_entities: Dict[str, Set[str]] = {}
+        self.device_entities: Dict[str, Set[str]] = {}
+        self.area_floor: Dict[str, Optional[str]] = {}
+        self.area_names: Dict[str, str] = {}
+        self.floor_names: Dict[str, str] = {}
+        self.label_names: Dict[str, str] = {}
+        self._listeners: List[Callable[[], None]] = []
+
+    @callback
+    def start(self):
+        """Build the index and follow registry changes"""
+        self._rebuild_areas()
+        self._rebuild_floors()
+        self._rebuild_labels()
+
+        entity_registry = er.async_get(self.hass)
+        for entry in list(entity_registry.entities.values()):
+            self._index_entity(entry.entity_id)
+
+        self._listeners = [
+            self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_entity_registry_updated),
+            self.hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._handle_device_registry_updated),
+            self.hass.bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, self._handle_area_registry_updated),
+        ]
+        if fr is not None:
+            self._listeners.append(
+                self.hass.bus.async_listen(fr.EVENT_FLOOR_REGISTRY_UPDATED, self._handle_floor_registry_updated)
+            )
+        if lr is not None:
+            self._listeners.append(
+                self.hass.bus.async_listen(lr.EVENT_LABEL_REGISTRY_UPDATED, self._handle_label_registry_updated)
+            )
+
+        _LOGGER.debug(f"Registry index built: {len(self.entity_meta)} entities, {len(self.area_names)} areas")
+
+    @callback
+    def stop(self):
+        """Stop following registry changes"""
+        for remove_listener in self._listeners:
+            remove_listener()
+        self._listeners = []
+
+    def get_entity_area(self, entity_id: str) -> Optional[str]:
+        """Effective area of an entity (own area or its device's area)"""
+        meta = self.entity_meta.get(entity_id)
+        return meta[0] if meta else None
+
+    def resolve_areas(self, values: Iterable[str]) -> Set[str]:
+        """Area IDs by ID or name"""
+        return self._resolve(values, self.area_floor, self.area_names)
+
+    def resolve_floors(self, values: Iterable[str]) -> Set[str]:
+        """Floor IDs by ID or name"""
+        return self._resolve(values, set(self.floor_names.values()), self.floor_names)
+
+    def resolve_labels(self, values: Iterable[str]) -> Set[str]:
+        """Label IDs by ID or name"""
+        return self._resolve(values, set(self.label_names.values()), self.label_names)
+
+    def expand(self, areas: Iterable[str] = (), floors: Iterable[str] = (), labels: Iterable[str] = (),
+               device_classes: Iterable[str] = (), domains: Iterable[str] = ()) -> Set[str]:
+        """Expand a group target into entity IDs.
+
+        Values of one kind are combined (bedroom OR kitchen), different kinds
+        narrow each other (bedroom AND label "night"). Areas and floors are a
+        single location criterion. Without any criterion nothing is returned.
+        """
+        areas, floors, labels, device_classes = list(areas), list(floors), list(labels), list(device_classes)
+        criteria: List[Set[str]] = []
+
+        if areas or floors:
+            area_ids = self.resolve_areas(areas)
+            for floor_id in self.resolve_floors(floors):
+                area_ids.update(area_id for area_id, floor in self.area_floor.items() if floor == floor_id)
+            criteria.append(set().union(*(self.area_entities.get(area_id, ()) for area_id in area_ids)))
+
+        if labels:
+            criteria.append(set().union(*(self.label_entities.get(label_id, ()) for label_id in self.resolve_labels(labels))))
+
+        if device_classes:
+            criteria.append(set().union(*(self.device_class_entities.get(device_class, ()) for device_class in device_classes)))
+
+        if not criteria:
+            return set()
+
+        criteria.sort(key=len)
+        result = set(criteria[0]).intersection(*criteria[1:])
+
+        domains = set(domains)
+        if domains:
+            result = {entity_id for entity_id in result if entity_id.split('.')[0] in domains}
+        return result
+
+    @staticmethod
+    def _resolve(values: Iterable[str], known_ids, names: Dict[str, str]) -> Set[str]:
+        result = set()
+        for value in values:
+            if value in known_ids:
+                result.add(value)
+            else:
+                resolved = names.get(normalize_name(value))
+                if resolved:
+                    result.add(resolved)
+        return result
+
+    def _index_entity(self, entity_id: str):
+        """(Re)index one entity from the entity and device registries"""
+        self._unindex_entity(entity_id)
+
+        entry = er.async_get(self.hass).async_get(entity_id)
+        # Как и HA при раскрытии целей, пропускаем отключенные, скрытые и служебные сущности
+        if entry is None or entry.disabled_by or entry.hidden_by or entry.entity_category:
+            return
+
+        area_id = entry.area_id
+        if area_id is None and entry.device_id:
+            device = dr.async_get(self.hass).async_get(entry.device_id)
+            area_id = device.area_id if device else None
+
+        labels = frozenset(getattr(entry, "labels", None) or ())
+        device_class = entry.device_class or entry.original_device_class
+
+        self.entity_meta[entity_id] = (area_id, entry.device_id, labels, device_class)
+        if area_id:
+            self.area_entities.setdefault(area_id, set()).add(entity_id)
+        if entry.device_id:
+            self.device_entities.setdefault(entry.device_id, set()).add(entity_id)
+        for label_id in labels:
+            self.label_entities.setdefault(label_id, set()).add(entity_id)
+        if device_class:
+            self.device_class_entities.setdefault(device_class, set()).add(entity_id)
+
+    def _unindex_entity(self, entity_id: str):
+        """Remove one entity from all buckets"""
+        meta = self.entity_meta.pop(entity_id, None)
+        if meta is None:
+            return
+        area_id, device_id, labels, device_class = meta
+        self._discard(self.area_entities, area_id, entity_id)
+        self._discard(self.device_entities, device_id, entity_id)
+        for label_id in labels:
+            self._discard(self.label_entities, label_id, entity_id)
+        self._discard(self.device_class_entities, device_class, entity_id)
+
+    @staticmethod
+    def _discard(buckets: Dict[str, Set[str]], key: Optional[str], entity_id: str):
+        if key is None or key not in buckets:
+            return
+        buckets[key].discard(entity_id)
+        if not buckets[key]:
+            del buckets[key]
+
+    def _rebuild_areas(self):
+        self.area_floor = {}
+        self.area_names = {}
+        for area in ar.async_get(self.hass).async_list_areas():
+            self.area_floor[area.id] = getattr(area, "floor_id", None)
+            self.area_names[normalize_name(area.name)] = area.id
+
+    def _rebuild_floors(self):
+        self.floor_names = {}
+        if fr is None:
+            return
+        for floor in fr.async_get(self.hass).async_list_floors():
+            self.floor_names[normalize_name(floor.name)] = floor.floor_id
+
+    def _rebuild_labels(self):
+        self.label_names = {}
+        if lr is None:
+            return
+        for label in lr.async_get(self.hass).async_list_labels():
+            self.label_names[normalize_name(label.name)] = label.label_id
+
+    @callback
+    def _handle_entity_registry_updated(self, event: Event):
+        entity_id = event.data["entity_id"]
+        if event.data["action"] == "remove":
+            self._unindex_entity(entity_id)
+            return
+        if event.data.get("old_entity_id"):
+            self._unindex_entity(event.data["old_entity_id"])
+        self._index_entity(entity_id)
+
+    @callback
+    def _handle_device_registry_updated(self, event: Event):
+        # Сущности без своей зоны наследуют зону устройства
+        if event.data["action"] != "update":
+            return
+        for entity_id in list(self.device_entities.get(event.data["device_id"], ())):
+            self._index_entity(entity_id)
+
+    @callback
+    def _handle_area_registry_updated(self, event: Event):
+        self._rebuild_areas()
+        if event.data["action"] == "remove":
+            area_id = event.data["area_id"]
+            for entity_id in list(self.area_entities.get(area_id, ())):
+                self._index_entity(entity_id)
+
+    @callback
+    def _handle_floor_registry_updated(self, event: Event):
+        self._rebuild_floors()
+        if event.data["action"] == "remove":
+            self._rebuild_areas()
+
+    @callback
+    def _handle_label_registry_updated(self, event: Event):
+        self._rebuild_labels()
@@ -2,12 +2,13 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.util import dt as dt_util
@@ -16,11 +17,16 @@ from .const import (
     DOMAIN,
     NAME,
     ICON_SPEAKER_MULTIPLE,
-    SENSOR_STATS
+    SENSOR_STATS,
+    ENTITY_REFRESH_INTERVAL
 )
+from .speaker_manager import speaker_signal
 
 _LOGGER = logging.getLogger(__name__)
 
+# Переходы сессий приходят сигналами, опрос только освежает среднее время работы
+SCAN_INTERVAL = timedelta(seconds=ENTITY_REFRESH_INTERVAL)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -87,6 +93,17 @@ class AlphaSpeakerStatsSensor(SensorEntity):
             "last_update": None
         }
     
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to session transitions of all speakers."""
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, speaker_signal(self.entry.entry_id), self._handle_fleet_update)
+        )
+    
+    @callback
+    def _handle_fleet_update(self) -> None:
+        """Recount after any speaker connects, goes idle or disconnects."""
+        self.async_schedule_update_ha_state(True)
+    
     async def async_update(self) -> None:
         """Update sensor state."""
         try:
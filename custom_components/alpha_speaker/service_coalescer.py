@@ -0,0 +1,110 @@
+"""
+Micro-batching of Home Assistant service calls for Alpha Private Speaker
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DEFAULT_COALESCE_WINDOW_MS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _PendingCall:
+    """Calls with the same domain, service and parameters collected in one window"""
+
+    __slots__ = ("domain", "service", "data", "entity_ids", "future", "timer")
+
+    def __init__(self, domain: str, service: str, data: Dict[str, Any], future: asyncio.Future):
+        self.domain = domain
+        self.service = service
+        self.data = data
+        self.entity_ids: List[str] = []
+        self.future = future
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class ServiceCallCoalescer:
+    """Merge compatible service calls arriving within a short window.
+
+    With a 20 ms window, `light.turn_on` for three lamps from three speakers
+    becomes one call with a list of entity_ids, so integrations like ZHA or
+    Z-Wave can group the radio commands. A zero window (the default)
+    disables merging. A second call for an entity already in the window is
+    never folded into it - two toggles must stay two toggles.
+    """
+
+    def __init__(self, hass: HomeAssistant, window_ms: int = DEFAULT_COALESCE_WINDOW_MS):
+        self.hass = hass
+        self.window = max(0, window_ms) / 1000
+        self._pending: Dict[Tuple[str, str, str], _PendingCall] = {}
+
+    async def async_call(self, domain: str, service: str, data: Dict[str, Any]):
+        """Blocking service call, possibly merged with other calls of the window"""
+        entity_ids = data.get("entity_id")
+        if not self.window or not entity_ids:
+            await self.hass.services.async_call(domain, service, data, blocking=True)
+            return
+
+        params = {key: value for key, value in data.items() if key != "entity_id"}
+        try:
+            key = (domain, service, json.dumps(params, sort_keys=True))
+        except (TypeError, ValueError):
+            # Параметры нельзя сравнить - вызываем без объединения
+            await self.hass.services.async_call(domain, service, data, blocking=True)
+            return
+
+        entity_ids = [entity_ids] if isinstance(entity_ids, str) else list(entity_ids)
+        pending = self._pending.get(key)
+        if pending is not None and any(entity_id in pending.entity_ids for entity_id in entity_ids):
+            # Сущность уже ждет в этом окне - отправляем его сейчас и открываем новое
+            self._flush(key)
+            pending = None
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = self._pending[key] = _PendingCall(domain, service, params, loop.create_future())
+            # Ошибку забираем сами: все вызывающие могли быть уже отменены
+            pending.future.add_done_callback(self._retrieve_exception)
+            pending.timer = loop.call_later(self.window, self._flush, key)
+
+        for entity_id in entity_ids:
+            if entity_id not in pending.entity_ids:
+                pending.entity_ids.append(entity_id)
+
+        # Отмена одного вызывающего не должна отменять общий вызов
+        await asyncio.shield(pending.future)
+
+    def _flush(self, key: Tuple[str, str, str]):
+        """Window closed - issue the merged call"""
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            if pending.timer is not None:
+                pending.timer.cancel()
+            self.hass.async_create_task(self._execute(pending))
+
+    async def _execute(self, pending: _PendingCall):
+        entity_ids = pending.entity_ids
+        if len(entity_ids) > 1:
+            _LOGGER.debug(f"Coalesced {pending.domain}.{pending.service} for {len(entity_ids)} entities")
+        try:
+            await self.hass.services.async_call(
+                pending.domain,
+                pending.service,
+                {**pending.data, "entity_id": entity_ids if len(entity_ids) > 1 else entity_ids[0]},
+                blocking=True
+            )
+        except Exception as e:
+            # Один раз на объединенный вызов, а не на каждого ожидающего
+            _LOGGER.warning(f"Coalesced {pending.domain}.{pending.service} for {entity_ids} failed: {e}")
+            pending.future.set_exception(e)
+        else:
+            pending.future.set_result(None)
+
+    @staticmethod
+    def _retrieve_exception(future: asyncio.Future):
+        """Mark the merged call's error as retrieved (it is already logged by _execute)"""
+        if not future.cancelled():
+            future.exception()
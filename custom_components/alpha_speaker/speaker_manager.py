@@ -1,22 +1,69 @@
 """
 Speaker manager for Alpha Private Speaker - адаптирован для интеграции HA
 """
-import asyncio
+import hashlib
+import hmac
+import json
 import logging
+import secrets
 import time
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict, field
+import weakref
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.storage import Store
 
+from .const import (
+    DEFAULT_INACTIVE_TIMEOUT,
+    SIGNAL_SPEAKER_UPDATE,
+    SPEAKER_ACTIVITY_SAVE_DELAY,
+    SPEAKER_SAVE_DELAY,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
+def speaker_signal(entry_id: str, speaker_id: str = "") -> str:
+    """Dispatcher signal of one speaker, or of the whole fleet without speaker_id"""
+    if speaker_id:
+        return f"{SIGNAL_SPEAKER_UPDATE}_{entry_id}_{speaker_id}"
+    return f"{SIGNAL_SPEAKER_UPDATE}_{entry_id}"
+
+
+def peer_host(address: str) -> str:
+    """Host part of a gRPC peer ("ipv4:10.0.0.5:53412" -> "ipv4:10.0.0.5")"""
+    return address.rsplit(':', 1)[0] if address.count(':') > 1 else address
+
+
+def metadata_fingerprint(name: str, speaker_type: str, version: str, capabilities: List[str],
+                         settings: Dict[str, Any], address: str) -> str:
+    """Digest of the registration metadata; the client port is left out"""
+    payload = json.dumps(
+        [name, speaker_type, version, sorted(capabilities), settings, peer_host(address)],
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _context_ref(context) -> Callable[[], Any]:
+    """Weak reference to a stream context.
+
+    grpc.aio contexts do not support weak references, so for them the
+    reference is a plain closure; it is dropped when the stream closes.
+    """
+    try:
+        return weakref.ref(context)
+    except TypeError:
+        return lambda: context
+
+
+@dataclass(slots=True)
 class ConnectedSpeaker:
-    """Connected speaker information"""
+    """Speaker session record: persisted metadata plus live session state"""
     speaker_id: str
     name: str
     speaker_type: str
@@ -27,18 +74,54 @@ class ConnectedSpeaker:
     last_seen: float
     address: str
     settings: Dict[str, Any] = field(default_factory=dict)
+    resume_token: str = ""
+    # Состояние сессии - не сохраняется
+    online: bool = field(default=False, init=False, compare=False, repr=False)
+    idle: bool = field(default=False, init=False, compare=False, repr=False)
+    # Момент открытия текущей сессии (monotonic) и потоки: id -> (ссылка на контекст, сессия потока)
+    attached_at: float = field(default=0.0, init=False, compare=False, repr=False)
+    streams: Dict[str, Tuple[Callable[[], Any], float]] = field(
+        default_factory=dict, init=False, compare=False, repr=False
+    )
+
+    def fingerprint(self) -> str:
+        """Fingerprint of the stored registration metadata"""
+        return metadata_fingerprint(
+            self.name, self.speaker_type, self.version, self.capabilities, self.settings, self.address
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Persisted fields of the record"""
+        return {name: getattr(self, name) for name in PERSISTED_FIELDS}
+
+
+PERSISTED_FIELDS = (
+    "speaker_id", "name", "speaker_type", "version", "capabilities", "session_id",
+    "connected_at", "last_seen", "address", "settings", "resume_token",
+)
 
 
 class SpeakerManager:
     """Manager for connected Alpha speakers - адаптирован для HA"""
     
-    def __init__(self, hass: HomeAssistant, entry_id: str, store: Optional[Store] = None):
+    def __init__(self, hass: HomeAssistant, entry_id: str, store: Optional[Store] = None,
+                 activity_store: Optional[Store] = None, inactive_timeout: float = DEFAULT_INACTIVE_TIMEOUT):
         self.hass = hass
         self.entry_id = entry_id
+        # Холодные метаданные колонок и горячая таблица last_seen хранятся раздельно
         self.store = store
+        self.activity_store = activity_store
+        self.inactive_timeout = inactive_timeout
         self.speakers: Dict[str, ConnectedSpeaker] = {}
+        self._online: Set[str] = set()
         self.running = False
-        self.cleanup_task: Optional[asyncio.Task] = None
+        self._activity_save_pending = False
+        # Счетчики статистики обновляются при изменениях, а не пересчитываются при чтении
+        self._type_counts: Counter = Counter()
+        self._capability_counts: Counter = Counter()
+        # Активные колонки в порядке last_seen: истекшие снимаются с головы
+        self._active: "OrderedDict[str, float]" = OrderedDict()
+        self._active_connected_sum = 0.0
         
     async def start(self):
         """Start speaker manager"""
@@ -47,22 +130,12 @@ class SpeakerManager:
         # Load saved speakers
         await self.load()
         
-        # Start cleanup task
-        self.cleanup_task = asyncio.create_task(self._cleanup_inactive_speakers())
-        
         _LOGGER.info(f"Speaker manager started with {len(self.speakers)} saved speakers")
     
     async def stop(self):
         """Stop speaker manager"""
         self.running = False
         
-        if self.cleanup_task:
-            self.cleanup_task.cancel()
-            try:
-                await self.cleanup_task
-            except asyncio.CancelledError:
-                pass
-        
         # Save speakers
         await self.save()
         
@@ -70,9 +143,31 @@ class SpeakerManager:
     
     async def register_speaker(self, speaker_id: str, name: str, speaker_type: str, 
                               version: str, capabilities: List[str], address: str, 
-                              settings: Dict[str, Any]) -> str:
-        """Register a new speaker"""
-        session_id = f"{speaker_id}_{int(time.time())}"
+                              settings: Dict[str, Any]) -> Tuple[str, bool]:
+        """Register a speaker and open its session.
+
+        Returns the new session_id and whether the metadata changed. With
+        unchanged metadata the stored record is reused and only the
+        session fields are checkpointed with the activity table.
+        """
+        now = time.time()
+        session_id = f"{speaker_id}_{int(now)}"
+        
+        old_speaker = self.speakers.get(speaker_id)
+        if old_speaker is not None and old_speaker.fingerprint() == metadata_fingerprint(
+                name, speaker_type, version, capabilities, settings, address):
+            self._unindex_speaker(old_speaker)
+            old_speaker.session_id = session_id
+            old_speaker.connected_at = now
+            old_speaker.address = address
+            old_speaker.online = True
+            old_speaker.attached_at = time.monotonic()
+            self._online.add(speaker_id)
+            self._index_speaker(old_speaker)
+            self.touch(speaker_id)
+            _LOGGER.info(f"Speaker re-registered with unchanged metadata: {name} ({speaker_id})")
+            self._notify(speaker_id)
+            return session_id, False
         
         speaker = ConnectedSpeaker(
             speaker_id=speaker_id,
@@ -81,36 +176,161 @@ class SpeakerManager:
             version=version,
             capabilities=capabilities,
             session_id=session_id,
-            connected_at=time.time(),
-            last_seen=time.time(),
+            connected_at=now,
+            last_seen=now,
             address=address,
-            settings=settings
+            settings=settings,
+            resume_token=secrets.token_urlsafe(16)
         )
+        speaker.online = True
+        speaker.attached_at = time.monotonic()
+        self._online.add(speaker_id)
         
+        if old_speaker is not None:
+            self._unindex_speaker(old_speaker)
+            # Открытые потоки переживают повторную регистрацию
+            speaker.streams = old_speaker.streams
         self.speakers[speaker_id] = speaker
+        self._index_speaker(speaker)
         _LOGGER.info(f"Speaker registered: {name} ({speaker_id})")
+        self._notify(speaker_id)
         
         # Save to storage
-        await self.save()
+        self._async_schedule_save()
         
-        return session_id
+        return session_id, True
+    
+    async def resume_speaker(self, speaker_id: str, session_id: str, resume_token: str, name: str,
+                             speaker_type: str, version: str, capabilities: List[str], address: str,
+                             settings: Dict[str, Any]) -> Optional[Tuple[ConnectedSpeaker, bool]]:
+        """Reopen a stored session by its session_id or resume token.
+
+        Returns the record and whether its metadata changed, or None if
+        there is nothing to resume. The session keeps its session_id,
+        connected_at and open streams; storage is only written if the
+        metadata changed.
+        """
+        speaker = self.speakers.get(speaker_id)
+        if speaker is None or not (session_id or resume_token):
+            return None
+        # Токен сравниваем за постоянное время
+        if resume_token:
+            if not speaker.resume_token or not hmac.compare_digest(resume_token.encode(), speaker.resume_token.encode()):
+                return None
+        elif session_id != speaker.session_id:
+            return None
+        
+        changed = speaker.fingerprint() != metadata_fingerprint(
+            name, speaker_type, version, capabilities, settings, address)
+        if changed:
+            self._unindex_speaker(speaker)
+            speaker.name = name
+            speaker.speaker_type = speaker_type
+            speaker.version = version
+            speaker.capabilities = capabilities
+            speaker.settings = settings
+            self._index_speaker(speaker)
+        # Порт клиента меняется с каждым подключением и в отпечаток не входит
+        speaker.address = address
+        speaker.online = True
+        speaker.attached_at = time.monotonic()
+        self._online.add(speaker_id)
+        self.touch(speaker_id)
+        
+        if changed:
+            self._async_schedule_save()
+        _LOGGER.info(f"Speaker session resumed: {name} ({speaker_id}), metadata changed: {changed}")
+        self._notify(speaker_id)
+        return speaker, changed
     
     async def update_speaker_activity(self, speaker_id: str):
         """Update speaker last seen timestamp"""
-        if speaker_id in self.speakers:
-            self.speakers[speaker_id].last_seen = time.time()
-            
-            # Periodically save
-            if int(time.time()) % 30 == 0:  # Save every 30 seconds
-                await self.save()
+        self.touch(speaker_id)
+    
+    def touch(self, speaker_id: str, online_only: bool = False) -> Optional[ConnectedSpeaker]:
+        """Record activity of a speaker and return its record"""
+        speaker = self.speakers.get(speaker_id)
+        if speaker is None or (online_only and not speaker.online):
+            return None
+        speaker.last_seen = time.time()
+        self._mark_active(speaker)
+        
+        # Не переносим уже запланированную запись, иначе при постоянной активности она не наступит
+        if not self._activity_save_pending:
+            self._async_schedule_activity_save()
+        if speaker.idle:
+            # Колонка снова активна - единственный переход, который видит горячий путь
+            speaker.idle = False
+            self._notify(speaker_id)
+        return speaker
+    
+    def mark_idle(self, speaker_id: str):
+        """Flag an online speaker as idle (silent past the inactivity timeout)"""
+        speaker = self.speakers.get(speaker_id)
+        if speaker is not None and speaker.online and not speaker.idle:
+            speaker.idle = True
+            self._notify(speaker_id)
+    
+    def is_online(self, speaker_id: str) -> bool:
+        """Whether the speaker has an open session"""
+        speaker = self.speakers.get(speaker_id)
+        return speaker is not None and speaker.online
+    
+    def get_online_ids(self) -> List[str]:
+        """IDs of speakers with an open session"""
+        return list(self._online)
+    
+    def online_count(self) -> int:
+        """Number of open sessions"""
+        return len(self._online)
+    
+    def open_stream(self, speaker_id: str, stream_id: str, context):
+        """Attach a stream context to the speaker session"""
+        speaker = self.speakers.get(speaker_id)
+        if speaker is not None:
+            speaker.streams[stream_id] = (_context_ref(context), speaker.attached_at)
+    
+    def close_stream(self, speaker_id: str, stream_id: str, context=None) -> bool:
+        """Detach a stream context (only the same context if given).
+
+        Returns True when this was the last stream opened in the current
+        session, i.e. the speaker has gone away and its session can end.
+        Streams left over from before a re-registration never end the new
+        session, so a reconnecting speaker is not cut off by its old streams.
+        """
+        speaker = self.speakers.get(speaker_id)
+        if speaker is None:
+            return False
+        entry = speaker.streams.get(stream_id)
+        if entry is None or (context is not None and entry[0]() is not context):
+            return False
+        del speaker.streams[stream_id]
+        if not speaker.online or entry[1] != speaker.attached_at:
+            return False
+        return not any(opened == speaker.attached_at for _, opened in speaker.streams.values())
+    
+    def end_session(self, speaker_id: str) -> Optional[ConnectedSpeaker]:
+        """Close the speaker session; the record itself stays stored"""
+        speaker = self.speakers.get(speaker_id)
+        if speaker is None or not speaker.online:
+            return None
+        speaker.online = False
+        speaker.idle = False
+        speaker.streams.clear()
+        self._online.discard(speaker_id)
+        self._notify(speaker_id)
+        return speaker
     
     async def remove_speaker(self, speaker_id: str):
         """Remove a speaker"""
         if speaker_id in self.speakers:
-            speaker_name = self.speakers[speaker_id].name
-            del self.speakers[speaker_id]
+            speaker = self.speakers.pop(speaker_id)
+            self._online.discard(speaker_id)
+            speaker_name = speaker.name
+            self._unindex_speaker(speaker)
             _LOGGER.info(f"Speaker removed: {speaker_name} ({speaker_id})")
-            await self.save()
+            self._async_schedule_save()
+            self._notify(speaker_id)
     
     async def get_speaker(self, speaker_id: str) -> Optional[ConnectedSpeaker]:
         """Get speaker by ID"""
@@ -131,38 +351,61 @@ class SpeakerManager:
         
         return active
     
-    async def _cleanup_inactive_speakers(self):
-        """Cleanup inactive speakers"""
-        while self.running:
-            await asyncio.sleep(60)  # Check every minute
-            
-            current_time = time.time()
-            to_remove = []
-            
-            for speaker_id, speaker in self.speakers.items():
-                # Remove speakers inactive for more than 1 hour
-                if current_time - speaker.last_seen > 3600:
-                    to_remove.append(speaker_id)
-            
-            for speaker_id in to_remove:
-                await self.remove_speaker(speaker_id)
-                
-            if to_remove:
-                _LOGGER.info(f"Cleaned up {len(to_remove)} inactive speakers")
+    def notify_speaker(self, speaker_id: str):
+        """Push an attribute change (not a session transition) to the speaker's entities"""
+        async_dispatcher_send(self.hass, speaker_signal(self.entry_id, speaker_id))
+    
+    def _notify(self, speaker_id: str):
+        """Push a session transition to the speaker's entities and the fleet sensors"""
+        async_dispatcher_send(self.hass, speaker_signal(self.entry_id, speaker_id))
+        async_dispatcher_send(self.hass, speaker_signal(self.entry_id))
+    
+    def _async_schedule_save(self):
+        """Write speaker metadata behind after a short delay"""
+        if self.store:
+            self.store.async_delay_save(self._data_to_save, SPEAKER_SAVE_DELAY)
+    
+    def _async_schedule_activity_save(self):
+        """Checkpoint the activity table at a low rate"""
+        if not self.activity_store:
+            return
+        self._activity_save_pending = True
+        self.activity_store.async_delay_save(self._activity_to_save, SPEAKER_ACTIVITY_SAVE_DELAY)
+    
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Speaker metadata persisted in the store"""
+        return {
+            'speakers': [speaker.as_dict() for speaker in self.speakers.values()],
+            'updated_at': time.time(),
+            'entry_id': self.entry_id
+        }
+    
+    def _activity_to_save(self) -> Dict[str, Any]:
+        """Compact activity table (called by the store at write time)"""
+        self._activity_save_pending = False
+        return {
+            'last_seen': {speaker_id: round(speaker.last_seen, 1) for speaker_id, speaker in self.speakers.items()},
+            # Поля сессии: при неизменных метаданных основное хранилище не перезаписывается
+            'sessions': {
+                speaker_id: [speaker.session_id, speaker.connected_at]
+                for speaker_id, speaker in self.speakers.items()
+            },
+            'updated_at': time.time()
+        }
     
     async def save(self):
-        """Save speakers to storage"""
+        """Save speakers and activity immediately (flushes pending delayed writes)"""
+        if self.activity_store:
+            try:
+                await self.activity_store.async_save(self._activity_to_save())
+            except Exception as e:
+                _LOGGER.error(f"Error saving speaker activity: {e}")
+        
         if not self.store:
             return
             
         try:
-            data = {
-                'speakers': [asdict(speaker) for speaker in self.speakers.values()],
-                'updated_at': time.time(),
-                'entry_id': self.entry_id
-            }
-            
-            await self.store.async_save(data)
+            await self.store.async_save(self._data_to_save())
             
             _LOGGER.debug(f"Saved {len(self.speakers)} speakers to storage")
         except Exception as e:
@@ -183,8 +426,10 @@ class SpeakerManager:
                         if 'speaker_id' not in speaker_data:
                             continue
                             
-                        # Create speaker object
-                        speaker = ConnectedSpeaker(**speaker_data)
+                        # Create speaker object (unknown keys of older versions are skipped)
+                        speaker = ConnectedSpeaker(**{
+                            key: value for key, value in speaker_data.items() if key in PERSISTED_FIELDS
+                        })
                         self.speakers[speaker.speaker_id] = speaker
                     except Exception as e:
                         _LOGGER.error(f"Error loading speaker data: {e}")
@@ -192,18 +437,39 @@ class SpeakerManager:
                 _LOGGER.info(f"Loaded {len(self.speakers)} speakers from storage")
         except Exception as e:
             _LOGGER.error(f"Error loading speakers: {e}")
+        
+        await self._load_activity()
+        self._rebuild_counters()
+    
+    async def _load_activity(self):
+        """Apply the newer last_seen and session values from the activity store"""
+        if not self.activity_store:
+            return
+            
+        try:
+            data = await self.activity_store.async_load()
+            if not data:
+                return
+            for speaker_id, last_seen in data.get('last_seen', {}).items():
+                speaker = self.speakers.get(speaker_id)
+                if speaker and last_seen > speaker.last_seen:
+                    speaker.last_seen = last_seen
+            for speaker_id, (session_id, connected_at) in data.get('sessions', {}).items():
+                speaker = self.speakers.get(speaker_id)
+                if speaker and connected_at > speaker.connected_at:
+                    speaker.session_id = session_id
+                    speaker.connected_at = connected_at
+        except Exception as e:
+            _LOGGER.error(f"Error loading speaker activity: {e}")
     
     async def get_speaker_stats(self) -> Dict[str, Any]:
         """Get speaker statistics"""
         current_time = time.time()
+        self._expire_active(current_time)
         
-        active_speakers = 0
-        total_uptime = 0
-        
-        for speaker in self.speakers.values():
-            if current_time - speaker.last_seen <= 300:  # 5 minutes
-                active_speakers += 1
-                total_uptime += (current_time - speaker.connected_at)
+        active_speakers = len(self._active)
+        # Сумма (now - connected_at) по активным колонкам без обхода
+        total_uptime = active_speakers * current_time - self._active_connected_sum
         
         average_uptime = total_uptime / len(self.speakers) if self.speakers else 0
         
@@ -217,21 +483,66 @@ class SpeakerManager:
     
     def _count_by_type(self) -> Dict[str, int]:
         """Count speakers by type"""
-        counts = {}
-        for speaker in self.speakers.values():
-            counts[speaker.speaker_type] = counts.get(speaker.speaker_type, 0) + 1
-        return counts
+        return dict(self._type_counts)
     
     def _count_by_capability(self) -> Dict[str, int]:
         """Count speakers by capability"""
-        counts = {}
-        for speaker in self.speakers.values():
-            for capability in speaker.capabilities:
-                counts[capability] = counts.get(capability, 0) + 1
-        return counts
+        return dict(self._capability_counts)
+    
+    def _rebuild_counters(self):
+        """Recount all speakers once after loading"""
+        self._type_counts.clear()
+        self._capability_counts.clear()
+        self._active.clear()
+        self._active_connected_sum = 0.0
+        for speaker in sorted(self.speakers.values(), key=lambda speaker: speaker.last_seen):
+            self._index_speaker(speaker)
+    
+    def _index_speaker(self, speaker: ConnectedSpeaker):
+        """Add a speaker to the counters"""
+        self._type_counts[speaker.speaker_type] += 1
+        self._capability_counts.update(speaker.capabilities)
+        if time.time() - speaker.last_seen <= self.inactive_timeout:
+            self._mark_active(speaker)
+    
+    def _unindex_speaker(self, speaker: ConnectedSpeaker):
+        """Remove a speaker from the counters"""
+        self._type_counts[speaker.speaker_type] -= 1
+        self._capability_counts.subtract(speaker.capabilities)
+        # Убираем нулевые значения, чтобы они не попадали в статистику
+        self._type_counts += Counter()
+        self._capability_counts += Counter()
+        if self._active.pop(speaker.speaker_id, None) is not None:
+            self._active_connected_sum -= speaker.connected_at
+    
+    def _mark_active(self, speaker: ConnectedSpeaker):
+        """Move a speaker to the tail of the active list"""
+        if speaker.speaker_id in self._active:
+            self._active.move_to_end(speaker.speaker_id)
+        else:
+            self._active_connected_sum += speaker.connected_at
+        self._active[speaker.speaker_id] = speaker.last_seen
+    
+    def _expire_active(self, now: float):
+        """Move speakers silent for too long from the active to the inactive bucket"""
+        while self._active:
+            speaker_id, last_seen = next(iter(self._active.items()))
+            if now - last_seen <= self.inactive_timeout:
+                break
+            self._active.popitem(last=False)
+            self._active_connected_sum -= self.speakers[speaker_id].connected_at
     
     async def clear(self):
         """Clear all speakers"""
+        speaker_ids = list(self.speakers)
         self.speakers.clear()
-        await self.save()
+        self._online.clear()
+        self._type_counts.clear()
+        self._capability_counts.clear()
+        self._active.clear()
+        self._active_connected_sum = 0.0
+        self._async_schedule_save()
+        for speaker_id in speaker_ids:
+            async_dispatcher_send(self.hass, speaker_signal(self.entry_id, speaker_id))
+        async_dispatcher_send(self.hass, speaker_signal(self.entry_id))
         _LOGGER.info("All speakers cleared")
\ No newline at end of file
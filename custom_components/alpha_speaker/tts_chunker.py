@@ -0,0 +1,88 @@
+"""
+Sentence/clause segmentation of long TTS texts for Alpha Private Speaker
+"""
+import re
+from typing import List
+
+from .const import DEFAULT_TTS_CHUNK_MAX_CHARS
+
+# Конец предложения: точка, !, ?, многоточие перед пробелом или концом текста,
+# либо перевод строки. Точка внутри числа (23.5) или сокращения (т.е.) не подходит
+_SENTENCE_RE = re.compile(r'.+?(?:[.!?…]+(?=\s|$)|\n+|$)')
+
+# Сокращения, после которых точка не заканчивает предложение
+_ABBREVIATIONS = frozenset({
+    "г.", "гг.", "ул.", "д.", "им.", "см.", "стр.", "тыс.", "млн.", "млрд.", "руб.", "коп.",
+    "т.е.", "т.к.", "напр.", "e.g.", "i.e.", "mr.", "mrs.", "dr.",
+})
+
+# Граница придаточного/перечисления внутри длинного предложения
+_CLAUSE_RE = re.compile(r'[^,;:—–]+(?:[,;:—–]+|$)')
+
+
+def _split_by(pattern: re.Pattern, text: str) -> List[str]:
+    """Split text into pieces keeping the delimiters attached"""
+    return [piece for piece in pattern.findall(text) if piece.strip()]
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split text into sentences, gluing back splits after abbreviations"""
+    sentences: List[str] = []
+    for piece in _split_by(_SENTENCE_RE, text):
+        piece = piece.strip()
+        if sentences and sentences[-1].endswith('.') and (
+                sentences[-1].split()[-1].lower() in _ABBREVIATIONS or piece[:1].islower()):
+            # "ул. Ленина", "5 мин. назад" - это одно предложение
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def _split_words(text: str, max_chars: int) -> List[str]:
+    """Hard split by whitespace when a clause alone is too long"""
+    chunks = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if len(candidate) > max_chars and current:
+            chunks.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_tts_text(text: str, max_chars: int = DEFAULT_TTS_CHUNK_MAX_CHARS) -> List[str]:
+    """Split text into ordered chunks of at most max_chars characters.
+
+    Sentences are kept whole where possible, long sentences are split on
+    clause boundaries and only then on whitespace. Short neighbouring
+    sentences are merged into one chunk, except the first one, which is
+    sent alone so the speaker can start talking as early as possible.
+    """
+    text = text.strip()
+    if not text or len(text) <= max_chars:
+        return [text] if text else []
+
+    pieces: List[str] = []
+    for sentence in _split_sentences(text):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in _split_by(_CLAUSE_RE, sentence):
+            clause = clause.strip()
+            if len(clause) <= max_chars:
+                pieces.append(clause)
+            else:
+                pieces.extend(_split_words(clause, max_chars))
+
+    chunks: List[str] = []
+    for piece in pieces:
+        if len(chunks) > 1 and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {piece}"
+        else:
+            chunks.append(piece)
+    return chunks
@@ -0,0 +1,263 @@
+"""
+Scheduled and deferred TTS for Alpha Private Speaker
+"""
+import asyncio
+import heapq
+import logging
+import time
+import uuid
+from datetime import datetime, time as dt_time, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import SCHEDULED_TTS_MAX_LATENESS, SCHEDULED_TTS_RETRY_INTERVAL, SCHEDULED_TTS_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_time(value: str) -> dt_time:
+    """Parse HH:MM[:SS] stored in quiet hours"""
+    return dt_time.fromisoformat(value)
+
+
+class TTSScheduler:
+    """Single heap-based scheduler releasing TTS messages into speaker queues on time"""
+
+    def __init__(self, hass: HomeAssistant, store: Optional[Store],
+                 send_callback: Callable[[Dict[str, Any]], Awaitable[bool]],
+                 is_ready: Callable[[str], bool]):
+        self.hass = hass
+        self.store = store
+        self.send_callback = send_callback
+        self.is_ready = is_ready
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.quiet_hours: Dict[str, Dict[str, str]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self.running = False
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Load persisted jobs and start the scheduler task"""
+        await self.load()
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+        _LOGGER.info(f"TTS scheduler started with {len(self.jobs)} pending messages")
+
+    async def stop(self):
+        """Stop the scheduler task and flush pending jobs"""
+        self.running = False
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        await self.save()
+
+    def schedule(self, speaker_id: str, text: str, due: float, language: str = "ru",
+                 voice: str = "default", volume: int = 80, priority: bool = False) -> str:
+        """Schedule a message, shifting it out of the speaker's quiet hours"""
+        job_id = f"sched_{uuid.uuid4().hex[:12]}"
+        job = {
+            "job_id": job_id,
+            "speaker_id": speaker_id,
+            "text": text,
+            "language": language,
+            "voice": voice,
+            "volume": volume,
+            "priority": priority,
+            "requested_due": due,
+            "due": self.apply_quiet_hours(speaker_id, due, priority),
+            "created_at": time.time(),
+        }
+        self._add(job)
+        self._async_schedule_save()
+
+        _LOGGER.info(f"TTS for {speaker_id} scheduled at {dt_util.utc_from_timestamp(job['due']).isoformat()} ({job_id})")
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a scheduled message (heap entry is dropped lazily)"""
+        if self.jobs.pop(job_id, None) is None:
+            return False
+        self._async_schedule_save()
+        return True
+
+    def get_jobs(self, speaker_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get pending jobs ordered by due time"""
+        jobs = [job for job in self.jobs.values() if speaker_id is None or job["speaker_id"] == speaker_id]
+        return sorted(jobs, key=lambda job: job["due"])
+
+    def set_quiet_hours(self, speaker_id: str, start: Optional[dt_time], end: Optional[dt_time]):
+        """Set (or clear when start/end are None) the quiet hours of a speaker"""
+        if start is None or end is None or start == end:
+            self.quiet_hours.pop(speaker_id, None)
+        else:
+            self.quiet_hours[speaker_id] = {
+                "start": start.isoformat(timespec="minutes"),
+                "end": end.isoformat(timespec="minutes"),
+            }
+        self._async_schedule_save()
+
+    def apply_quiet_hours(self, speaker_id: str, due: float, priority: bool = False) -> float:
+        """Move due time to the end of quiet hours; priority messages are never deferred"""
+        quiet = self.quiet_hours.get(speaker_id)
+        if priority or not quiet:
+            return due
+
+        start = _parse_time(quiet["start"])
+        end = _parse_time(quiet["end"])
+        local_due = dt_util.as_local(dt_util.utc_from_timestamp(due))
+        moment = local_due.time()
+
+        if start < end:
+            in_quiet = start <= moment < end
+            end_day = local_due.date()
+        else:
+            # Интервал через полночь, например 22:00-07:00
+            in_quiet = moment >= start or moment < end
+            end_day = local_due.date() + timedelta(days=1) if moment >= start else local_due.date()
+
+        if not in_quiet:
+            return due
+
+        quiet_end = datetime.combine(end_day, end, tzinfo=local_due.tzinfo)
+        return dt_util.as_timestamp(quiet_end)
+
+    def _add(self, job: Dict[str, Any]):
+        """Put job into the heap and wake the scheduler if it is now the earliest"""
+        self.jobs[job["job_id"]] = job
+        self._seq += 1
+        heapq.heappush(self._heap, (job["due"], self._seq, job["job_id"]))
+        if self._heap[0][2] == job["job_id"]:
+            self._wakeup.set()
+
+    async def _run(self):
+        """Sleep until the earliest job is due and release it"""
+        while self.running:
+            try:
+                # Пропускаем отмененные задания
+                while self._heap and self._heap[0][2] not in self.jobs:
+                    heapq.heappop(self._heap)
+
+                timeout = None
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - time.time())
+
+                if timeout is None or timeout > 0:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                _, _, job_id = heapq.heappop(self._heap)
+                job = self.jobs.get(job_id)
+                if job is not None:
+                    self._release(job)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _LOGGER.error(f"Error in TTS scheduler: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    def _release(self, job: Dict[str, Any]):
+        """Hand a due job over to the speaker queue"""
+        speaker_id = job["speaker_id"]
+        now = time.time()
+
+        # Тихие часы могли быть заданы уже после постановки задания
+        deferred = self.apply_quiet_hours(speaker_id, now, job.get("priority", False))
+        if deferred > now:
+            job["due"] = deferred
+            self._seq += 1
+            heapq.heappush(self._heap, (deferred, self._seq, job["job_id"]))
+            self._async_schedule_save()
+            _LOGGER.info(f"Scheduled TTS {job['job_id']} deferred by quiet hours to "
+                         f"{dt_util.utc_from_timestamp(deferred).isoformat()}")
+            return
+
+        if not self.is_ready(speaker_id):
+            # Колонка еще не подключила поток TTS (например, сразу после рестарта HA)
+            self._retry(job, now, "did not connect in time")
+            return
+
+        _LOGGER.info(f"Releasing scheduled TTS {job['job_id']} to {speaker_id} ({now - job['due']:.1f}s late)")
+        # Пока идет доставка, задания нет в куче, поэтому повторно оно не выпускается
+        self.hass.async_create_task(self._deliver(job))
+
+    async def _deliver(self, job: Dict[str, Any]):
+        """Send a released job and drop it only once the speaker confirmed it"""
+        job_id = job["job_id"]
+        try:
+            delivered = await self.send_callback(job)
+        except Exception as e:
+            _LOGGER.error(f"Failed to deliver scheduled TTS {job_id}: {e}")
+            delivered = False
+
+        if job_id not in self.jobs:
+            # Отменено во время доставки
+            return
+        if delivered:
+            self.jobs.pop(job_id, None)
+            self._async_schedule_save()
+            return
+        self._retry(job, time.time(), "delivery failed")
+        self._wakeup.set()
+
+    def _retry(self, job: Dict[str, Any], now: float, reason: str):
+        """Check a job again after the retry interval, or drop it once it is too late"""
+        if now - job["due"] > SCHEDULED_TTS_MAX_LATENESS:
+            _LOGGER.warning(f"Dropping scheduled TTS {job['job_id']} for {job['speaker_id']}: {reason}")
+            self.jobs.pop(job["job_id"], None)
+            self._async_schedule_save()
+            return
+        self._seq += 1
+        heapq.heappush(self._heap, (now + SCHEDULED_TTS_RETRY_INTERVAL, self._seq, job["job_id"]))
+
+    def _async_schedule_save(self):
+        """Persist jobs and quiet hours with a short debounce"""
+        if self.store:
+            self.store.async_delay_save(self._data_to_save, SCHEDULED_TTS_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Data persisted in the store"""
+        return {
+            "jobs": list(self.jobs.values()),
+            "quiet_hours": self.quiet_hours,
+            "updated_at": time.time(),
+        }
+
+    async def save(self):
+        """Save jobs to storage immediately"""
+        if not self.store:
+            return
+        try:
+            await self.store.async_save(self._data_to_save())
+        except Exception as e:
+            _LOGGER.error(f"Error saving scheduled TTS: {e}")
+
+    async def load(self):
+        """Load jobs and quiet hours from storage"""
+        if not self.store:
+            return
+        try:
+            data = await self.store.async_load()
+            if not data:
+                return
+
+            self.quiet_hours = data.get("quiet_hours", {})
+            for job in data.get("jobs", []):
+                if "job_id" in job and "due" in job:
+                    self._add(job)
+
+            _LOGGER.info(f"Loaded {len(self.jobs)} scheduled TTS messages from storage")
+        except Exception as e:
+            _LOGGER.error(f"Error loading scheduled TTS: {e}")
@@ -0,0 +1 @@
+"""Tests for the Alpha Private Speaker integration."""
@@ -0,0 +1,59 @@
+"""Tests for per-chunk TTS acknowledgements."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.alpha_speaker.grpc_server import AlphaSpeakerService
+from custom_components.alpha_speaker.latency import TTSLatencyTracker
+from custom_components.alpha_speaker.proto import alpha_speaker_pb2 as pb
+
+
+def _servicer() -> AlphaSpeakerService:
+    """Servicer with only the state SendTTSResponse uses."""
+    servicer = AlphaSpeakerService.__new__(AlphaSpeakerService)
+    servicer.hass = MagicMock()
+    servicer.speaker_manager = MagicMock()
+    servicer.event_prefix = "alpha_speaker_"
+    servicer.tts_responses = {}
+    servicer.tts_latency = TTSLatencyTracker()
+    servicer._touch_speaker = AsyncMock()
+    return servicer
+
+
+def _ack(chunk_index: int) -> pb.SpeakTextResponse:
+    return pb.SpeakTextResponse(speaker_id="kitchen", message_id="msg", chunk_index=chunk_index, success=True)
+
+
+def test_late_ack_does_not_complete_next_chunk():
+    """An ack for chunk 0 arriving while chunk 1 is awaited is ignored."""
+
+    async def scenario():
+        servicer = _servicer()
+        future = asyncio.get_running_loop().create_future()
+        servicer.tts_responses[("msg", 1)] = future
+
+        await servicer.SendTTSResponse(_ack(0), None)
+        assert not future.done()
+        assert ("msg", 1) in servicer.tts_responses
+
+        await servicer.SendTTSResponse(_ack(1), None)
+        assert future.result()["chunk_index"] == 1
+        assert not servicer.tts_responses
+        servicer.speaker_manager.notify_speaker.assert_called_once_with("kitchen")
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_ack_is_ignored():
+    """A repeated ack for an already confirmed chunk changes nothing."""
+
+    async def scenario():
+        servicer = _servicer()
+        future = asyncio.get_running_loop().create_future()
+        servicer.tts_responses[("msg", 0)] = future
+
+        await servicer.SendTTSResponse(_ack(0), None)
+        await servicer.SendTTSResponse(_ack(0), None)
+        assert future.result()["chunk_index"] == 0
+        assert not servicer.tts_responses
+
+    asyncio.run(scenario())
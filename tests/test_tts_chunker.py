@@ -0,0 +1,40 @@
+"""Tests for TTS text segmentation."""
+from custom_components.alpha_speaker.tts_chunker import split_tts_text
+
+
+def test_decimals_are_not_sentence_ends():
+    """A dot between digits never splits a number across chunks."""
+    text = (
+        "Сегодня в Москве облачно. Температура 23.5 градуса, ветер 4.2 м/с. "
+        "Вечером ожидается дождь, возьмите зонт."
+    )
+    chunks = split_tts_text(text, max_chars=50)
+
+    assert "Температура 23.5 градуса, ветер 4.2 м/с." in chunks
+    assert not any(chunk.endswith(("23.", "4.")) for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_abbreviations_are_not_sentence_ends():
+    """Known abbreviations and a lowercase continuation keep the sentence whole."""
+    text = (
+        "Первое сообщение короткое. Встреча на ул. Ленина, д. 5 в 10 ч. вечера. "
+        "Завтра дождь, т.е. возьмите зонт!"
+    )
+    chunks = split_tts_text(text, max_chars=45)
+
+    assert chunks == [
+        "Первое сообщение короткое.",
+        "Встреча на ул. Ленина, д. 5 в 10 ч. вечера.",
+        "Завтра дождь, т.е. возьмите зонт!",
+    ]
+
+
+def test_sentence_end_before_whitespace_still_splits():
+    """Punctuation followed by whitespace or the end of text ends a sentence."""
+    text = "Готово! Свет выключен. Дверь закрыта? Да…"
+    chunks = split_tts_text(text, max_chars=20)
+
+    assert chunks[0] == "Готово!"
+    assert " ".join(chunks) == text
+    assert all(len(chunk) <= 20 for chunk in chunks)